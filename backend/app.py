@@ -1,10 +1,17 @@
 """
 Flask application for Product Recommendation and Price Comparison System
 """
-from flask import Flask, request, jsonify, redirect
+from flask import Flask, request, jsonify, redirect, Response, stream_with_context
 from flask_cors import CORS
-from models import db, Product, ScrapingLog, User, SessionToken, WishlistItem, SearchEvent, ClickEvent, PurchaseEvent, PriceHistory, PriceDropAlert, RedirectToken
+from models import db, ensure_indexes, Product, ScrapingLog, User, SessionToken, WishlistItem, SearchEvent, ClickEvent, PurchaseEvent, PriceHistory, PriceDropAlert, RedirectToken
 from scraper import ScraperManager
+from scrape_planner import ScrapePlanner
+from search_cache import get_search_cache
+from sqlite_profile import apply_sqlite_profile
+from product_record import ProductRecord
+from pagination import SortKey, keyset_page, count_rows, COUNT_MODES
+from serialization import (api_response, dumps_json, parse_fields, columns, rows_to_dicts, rows_with_product,
+                           PRODUCT_FIELDS, SCRAPING_LOG_FIELDS, WISHLIST_ITEM_FIELDS)
 from recommender import ProductRecommender
 from config import Config
 import schedule
@@ -15,6 +22,7 @@ import logging
 import re
 from functools import wraps
 import json
+import math
 from datetime import timedelta
 from urllib.parse import urlparse
 
@@ -27,12 +35,18 @@ app.config.from_object(Config)
 CORS(app, resources={r"/api/*": {"origins": "http://localhost:3000"}})
 
 db.init_app(app)
+with app.app_context():
+    apply_sqlite_profile(db.engine)  # WAL, busy timeout, cache/mmap on every pooled connection
+
 scraper_manager = ScraperManager()
+scrape_planner = ScrapePlanner(scraper_manager)
+search_cache = get_search_cache()
 recommender = ProductRecommender()
 
 # Initialize database
 with app.app_context():
     db.create_all()
+    ensure_indexes()
     # Train recommender on startup
     recommender.train()
     # Bootstrap some fresh API data if DB is nearly empty
@@ -90,11 +104,8 @@ def scheduled_scraping():
     """Scheduled scraping function"""
     with app.app_context():
         logger.info("Starting scheduled scraping...")
-        # Scrape trending/popular products
-        # You can customize this to scrape specific categories or trending searches
-        trending_searches = ['laptop', 'smartphone', 'headphones', 'smartwatch']
-        for search_term in trending_searches:
-            scraper_manager.scrape_all_platforms(query=search_term, max_results_per_platform=10)
+        # Refresh the (query, platform) pairs users actually search for, within the cycle budget
+        scrape_planner.run_cycle(max_results=10)
         logger.info("Scheduled scraping completed")
 
 def check_price_drop_alerts():
@@ -134,6 +145,10 @@ def run_scheduler():
 scheduler_thread = threading.Thread(target=run_scheduler, daemon=True)
 scheduler_thread.start()
 
+# Pre-launch Selenium browsers in the background so live searches skip Chrome start-up
+if Config.ENABLE_SELENIUM:
+    threading.Thread(target=scraper_manager.warm_browser_pool, daemon=True).start()
+
 @app.route('/api')
 def api_info():
     """API information endpoint"""
@@ -143,10 +158,12 @@ def api_info():
         'version': '1.0.0',
         'endpoints': {
             'search': '/api/search',
+            'search-stream': '/api/search/stream',
             'products': '/api/products',
             'scrape': '/api/scrape',
             'stats': '/api/stats',
             'scraping-logs': '/api/scraping-logs',
+            'scraper-stats': '/api/scraper-stats',
             'auth-register': '/api/auth/register',
             'auth-login': '/api/auth/login',
             'auth-me': '/api/auth/me',
@@ -232,7 +249,7 @@ def create_redirect():
         if not product:
             product = Product(
                 name=product_data.get('name', 'Unknown'),
-                description=product_data.get('description'),
+                description=product_data.get('description') or product_data.get('name'),
                 price=float(product_data.get('price') or 0),
                 original_price=product_data.get('original_price'),
                 rating=product_data.get('rating'),
@@ -296,185 +313,360 @@ def do_redirect(token):
 
     return redirect(product.product_url, code=302)
 
+API_PLATFORMS = ['meesho', 'myntra']
+SELENIUM_PLATFORMS = ['amazon', 'flipkart']
+
+
+def _parse_search_request():
+    """(query, filters, top_n, include_live_scraping) from a search request's JSON body or query string"""
+    if request.method == 'POST':
+        data = request.get_json() or {}
+        query = data.get('query', '')
+        filters = data.get('filters', {})
+        top_n = data.get('top_n', 50)
+        include_live_scraping = bool(data.get('include_live_scraping', False))
+    else:
+        query = request.args.get('query', '')
+        filters = {
+            'min_price': request.args.get('min_price', type=float),
+            'max_price': request.args.get('max_price', type=float),
+            'platforms': request.args.getlist('platform'),
+            'min_rating': request.args.get('min_rating', type=float)
+        }
+        top_n = request.args.get('top_n', 50, type=int)
+        include_live_scraping = request.args.get('include_live_scraping', '0') in ('1', 'true')
+    return query, filters, top_n, include_live_scraping
+
+
+def _select_platforms(filters, include_live_scraping):
+    """(requested platform names, scraper keys to search, keys skipped because their circuit is open)"""
+    requested = filters.get('platforms') or ['Amazon', 'Flipkart', 'Meesho', 'Myntra']
+    # Normalize to scraper keys
+    requested_keys = [p.strip().lower() for p in requested if isinstance(p, str)]
+
+    platforms_to_search = []
+    # Always include API platforms for fast & consistent results
+    for p in API_PLATFORMS:
+        if (not requested_keys) or (p in requested_keys):
+            platforms_to_search.append(p)
+
+    # Include Selenium platforms only if explicitly allowed (slower, can fail)
+    if include_live_scraping and Config.ENABLE_SELENIUM:
+        for p in SELENIUM_PLATFORMS:
+            if (not requested_keys) or (p in requested_keys):
+                platforms_to_search.append(p)
+
+    # LOGIC CHANGE: If user didn't find anything from requested platforms,
+    # or if they only asked for Selenium platforms (which often fail),
+    # ensure we have something to search.
+    if not platforms_to_search:
+        platforms_to_search = API_PLATFORMS[:]
+
+    # Skip platforms whose circuit is open instead of waiting for them to time out
+    skipped = [p for p in platforms_to_search if not scraper_manager.is_platform_available(p)]
+    if skipped:
+        logger.info(f"Skipping unavailable platforms: {skipped}")
+    return requested, [p for p in platforms_to_search if p not in skipped], skipped
+
+
+def _per_platform_limit(platforms, top_n):
+    return max(15, top_n // len(platforms)) if platforms else 15
+
+
+def _fan_out(platforms, query, top_n, on_complete=None):
+    """Search platforms on the shared real-time pool, yielding (platform, products, status, elapsed_sec)
+
+    Returns by REALTIME_OVERALL_TIMEOUT_SEC even if platforms are still running;
+    those are yielded with status 'timed_out' and finish in the background
+    (see ScraperManager.fan_out_realtime).
+    """
+    return scraper_manager.fan_out_realtime(platforms, query, _per_platform_limit(platforms, top_n),
+                                            on_complete=on_complete)
+
+
+def _search_platforms(query, platforms, top_n, on_complete=None):
+    """Fan-out up to the deadline: ({platform: products}, {platform: status info})"""
+    results, statuses = {}, {}
+    for platform, products, status, elapsed in _fan_out(platforms, query, top_n, on_complete):
+        results[platform] = products
+        statuses[platform] = {'status': status, 'count': len(products), 'elapsed_ms': round(elapsed * 1000)}
+    return results, statuses
+
+
+def _cache_search_results(key, results, statuses, per_platform):
+    """Cache a fan-out only if every platform answered
+
+    'empty' means the platform really had nothing; fetch failures, throttling
+    and open circuits come back as 'error' and would pin a partial result.
+    """
+    if results and all(s['status'] in ('ok', 'empty') for s in statuses.values()):
+        search_cache.set(key, results, per_platform)
+
+
+def _cache_on_complete(key, per_platform):
+    """fan-out on_complete callback: cache the search once every platform, stragglers included, has answered"""
+    return lambda results, statuses: _cache_search_results(key, results, statuses, per_platform)
+
+
+def _cached_search(query, platforms, top_n):
+    """(cache key, per-platform limit, entry or None, 'hit'|'stale'|'miss'); stale entries are refreshed in the background"""
+    key = search_cache.make_key(query, platforms)
+    per_platform = _per_platform_limit(platforms, top_n)
+    entry, cache_status = search_cache.get(key, per_platform) if platforms else (None, 'miss')
+    if cache_status == 'stale':
+        search_cache.refresh(key, lambda: _search_platforms(
+            query, platforms, top_n, on_complete=_cache_on_complete(key, per_platform)))
+    return key, per_platform, entry, cache_status
+
+
+def _dedupe_by_url(products):
+    deduped = []
+    seen_urls = set()
+    for p in products:
+        url = p.get('product_url')
+        if not url or url in seen_urls:
+            continue
+        seen_urls.add(url)
+        deduped.append(p)
+    return deduped
+
+
+def _apply_search_filters(products, requested, filters):
+    """Platform, rating and price filters (applied BEFORE ranking to speed up the recommender)"""
+    filtered_products = []
+    # Normalize requested platforms for case-insensitive matching
+    requested_normalized = [p.lower() for p in (requested or [])]
+
+    for p in products:
+        # Check if product is in the user's selected platforms (case-insensitive)
+        p_platform = (p.get('platform') or '').lower()
+        if requested_normalized and p_platform not in requested_normalized:
+            continue
+
+        # Rating filter
+        if filters.get('min_rating') and (p.get('rating', 0) < float(filters['min_rating'])):
+            continue
+
+        # Price filter (with slight cushion for real-time volatility)
+        p_price = p.get('price')
+        if p_price:
+            if filters.get('min_price') and p_price < float(filters['min_price']):
+                continue
+            if filters.get('max_price') and p_price > float(filters['max_price']):
+                continue
+
+        filtered_products.append(p)
+    return filtered_products
+
+
+def _rank_results(query, products, requested, filters, top_n):
+    """Dedupe, filter and rank raw platform results; returns the top_n list of ProductRecords"""
+    filtered_products = _apply_search_filters(_dedupe_by_url(products), requested, filters)
+    # Scraped records are shared with the search cache and concurrent requests; rank private copies
+    ranked_products = recommender.rank_products_realtime(query, [p.copy() for p in filtered_products], filters)
+
+    # Ensure all products have IDs (for frontend compatibility)
+    for idx, p in enumerate(ranked_products):
+        if not p.id:
+            p.id = hash(p.product_url or f'product_{idx}') % 1000000
+
+    return ranked_products[:top_n]
+
+
+def _serialize_products(products, fields=None):
+    """ProductRecords -> JSON-ready dicts of fields (done once, when the response is built)"""
+    return [p.to_dict(fields) for p in products]
+
+
+def _requested_fields(allowed):
+    """Sparse fieldset from ?fields=name,price,... (or a JSON body 'fields' list); None = all fields
+
+    Raises ValueError for unknown field names.
+    """
+    value = request.args.getlist('fields')
+    if not value and request.method == 'POST':
+        value = (request.get_json(silent=True) or {}).get('fields')
+    return parse_fields(value, allowed) if value else None
+
+
+def _search_deadline():
+    """Monotonic time by which a search request should answer (REALTIME_OVERALL_TIMEOUT_SEC)"""
+    return time.monotonic() + Config.REALTIME_OVERALL_TIMEOUT_SEC
+
+
+def _fallback_results(query, platforms_searched, filters, deadline):
+    """If Selenium platforms (Amazon/Flipkart) were requested but returned nothing,
+    try API platforms (Meesho/Myntra) silently to ensure user gets SOMETHING.
+
+    Runs on whatever is left of the request's deadline, so the fallback can't
+    push a search past REALTIME_OVERALL_TIMEOUT_SEC."""
+    if not any(p in platforms_searched for p in SELENIUM_PLATFORMS):
+        return []
+    # If the user only searched specific platforms and got nothing, try API platforms as fallback
+    fallback_platforms = [p for p in API_PLATFORMS if p not in platforms_searched]
+    remaining = deadline - time.monotonic()
+    if not fallback_platforms or remaining <= 0:
+        return []
+    logger.info(f"Primary search for '{query}' returned no results. Attempting fallback to API platforms...")
+    fallback_products = []
+    for _platform, products, _status, _elapsed in scraper_manager.fan_out_realtime(
+            fallback_platforms, query, 15, timeout=remaining):
+        fallback_products.extend(products)
+    if not fallback_products:
+        return []
+    # re-rank with fallback products (ignoring strict platform filters to give user some options)
+    results = recommender.rank_products_realtime(query, [p.copy() for p in fallback_products], filters)[:10]
+    logger.info(f"Fallback found {len(results)} items.")
+    return results
+
+
+def _record_search_event(query, filters, results_count):
+    """Store search history (optional user)"""
+    user = get_optional_user()
+    try:
+        event = SearchEvent(
+            user_id=user.id if user else None,
+            query=str(query)[:300],
+            filters_json=json.dumps(filters or {}),
+            results_count=results_count
+        )
+        db.session.add(event)
+        db.session.commit()
+    except Exception as _e:
+        db.session.rollback()
+
+
+def _search_message(final_results, include_live_scraping):
+    if include_live_scraping and not any((p.get('platform') or '').lower() in SELENIUM_PLATFORMS for p in final_results):
+        return 'No live deals found; showing best available deals.'
+    return None
+
+
 @app.route('/api/search', methods=['GET', 'POST'])
 def search_products():
     """Real-time search: Fetch products directly from APIs/scrapers (no DB dependency)"""
     try:
-        if request.method == 'POST':
-            data = request.get_json()
-            query = data.get('query', '')
-            filters = data.get('filters', {})
-            top_n = data.get('top_n', 50)
-            fast_mode = bool(data.get('fast_mode', True))
-            include_live_scraping = bool(data.get('include_live_scraping', False))
-        else:
-            query = request.args.get('query', '')
-            filters = {
-                'min_price': request.args.get('min_price', type=float),
-                'max_price': request.args.get('max_price', type=float),
-                'platforms': request.args.getlist('platform'),
-                'min_rating': request.args.get('min_rating', type=float)
-            }
-            top_n = request.args.get('top_n', 50, type=int)
-            fast_mode = True
-            include_live_scraping = False
-        
+        query, filters, top_n, include_live_scraping = _parse_search_request()
         if not query:
             return jsonify({'error': 'Query parameter is required'}), 400
-        
+        try:
+            fields = _requested_fields(ProductRecord.FIELDS)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
         logger.info(f"Real-time search for '{query}' across all platforms...")
-        
+        deadline = _search_deadline()
+
         # REAL-TIME: Fetch from platforms simultaneously (no DB)
-        requested = filters.get('platforms') or ['Amazon', 'Flipkart', 'Meesho', 'Myntra']
-        # Normalize to scraper keys
-        requested_keys = []
-        for p in requested:
-            if isinstance(p, str):
-                requested_keys.append(p.strip().lower())
-
-        api_platforms = ['meesho', 'myntra']
-        selenium_platforms = ['amazon', 'flipkart']
-
-        platforms_to_search = []
-        # Always include API platforms for fast & consistent results
-        for p in api_platforms:
-            if (not requested_keys) or (p in requested_keys):
-                platforms_to_search.append(p)
+        requested, platforms_to_search, _skipped = _select_platforms(filters, include_live_scraping)
+        # Raw platform results are cached per canonical query + platform set; filters apply afterwards
+        key, per_platform, entry, cache_status = _cached_search(query, platforms_to_search, top_n)
+        if entry is not None:
+            all_products = entry.products
+            statuses = {p: {'status': 'cached', 'count': len(products), 'elapsed_ms': 0}
+                        for p, products in entry.results.items()}
+        else:
+            # Returns by the deadline; platforms still running complete the cache entry later
+            results, statuses = _search_platforms(query, platforms_to_search, top_n,
+                                                  on_complete=_cache_on_complete(key, per_platform))
+            all_products = [p for products in results.values() for p in products]
+        for p in _skipped:
+            statuses[p] = {'status': 'skipped', 'count': 0, 'elapsed_ms': 0}
 
-        # Include Selenium platforms only if explicitly allowed (slower, can fail)
-        if include_live_scraping and Config.ENABLE_SELENIUM:
-            for p in selenium_platforms:
-                if (not requested_keys) or (p in requested_keys):
-                    platforms_to_search.append(p)
-        
-        # LOGIC CHANGE: If user didn't find anything from requested platforms, 
-        # or if they only asked for Selenium platforms (which often fail), 
-        # ensure we have something to search.
-        if not platforms_to_search:
-            platforms_to_search = api_platforms[:]
+        final_results = _rank_results(query, all_products, requested, filters, top_n)
+        if not final_results:
+            final_results = _fallback_results(query, platforms_to_search, filters, deadline)
 
-        all_products = []
-        
-        # Fetch from each platform in parallel (using threads for better performance)
-        import concurrent.futures
-        def fetch_platform(platform_name):
-            try:
-                max_per_platform = max(15, top_n // len(platforms_to_search))
-                products = scraper_manager.scrape_platform_realtime(platform_name, query, max_per_platform)
-                return products or []
-            except Exception as e:
-                logger.error(f"Error fetching from {platform_name}: {e}")
-                return []
-        
-        # Use ThreadPoolExecutor for concurrent calls with timeouts (faster UI)
-        with concurrent.futures.ThreadPoolExecutor(max_workers=min(4, len(platforms_to_search))) as executor:
-            futures = {executor.submit(fetch_platform, p): p for p in platforms_to_search}
-            try:
-                for future in concurrent.futures.as_completed(futures, timeout=Config.REALTIME_OVERALL_TIMEOUT_SEC):
-                    platform = futures[future]
-                    try:
-                        products = future.result(timeout=Config.REALTIME_PLATFORM_TIMEOUT_SEC)
-                        all_products.extend(products or [])
-                        logger.info(f"Fetched {len(products or [])} products from {platform}")
-                    except Exception as e:
-                        logger.error(f"Platform {platform} failed/timeout: {e}")
-            except Exception:
-                # overall timeout reached; proceed with what we have
-                pass
-
-        # De-duplicate by URL
-        deduped = []
-        seen_urls = set()
-        for p in all_products:
-            url = p.get('product_url')
-            if not url or url in seen_urls:
-                continue
-            seen_urls.add(url)
-            deduped.append(p)
-        all_products = deduped
-        
-        # Apply filters
-        # Note: We filter BEFORE ranking to speed up the recommender
-        filtered_products = []
-        # Normalize requested platforms for case-insensitive matching
-        requested_normalized = [p.lower() for p in (requested or [])]
-        
-        for p in all_products:
-            # Check if product is in the user's selected platforms (case-insensitive)
-            p_platform = (p.get('platform') or '').lower()
-            if requested_normalized and p_platform not in requested_normalized:
-                continue
-                
-            # Rating filter
-            if filters.get('min_rating') and (p.get('rating', 0) < float(filters['min_rating'])):
-                continue
-                
-            # Price filter (with slight cushion for real-time volatility)
-            p_price = p.get('price')
-            if p_price:
-                if filters.get('min_price') and p_price < float(filters['min_price']):
-                    continue
-                if filters.get('max_price') and p_price > float(filters['max_price']):
-                    continue
-            
-            filtered_products.append(p)
-        
-        # Use recommender to rank products
-        ranked_products = recommender.rank_products_realtime(query, filtered_products, filters)
-        
-        # Ensure all products have IDs (for frontend compatibility)
-        for idx, p in enumerate(ranked_products):
-            if 'id' not in p or not p.get('id'):
-                p['id'] = hash(p.get('product_url', f'product_{idx}')) % 1000000
-        
-        final_results = ranked_products[:top_n]
-        
-        # FALLBACK: If Selenium platforms (Amazon/Flipkart) were requested but returned nothing, 
-        # try API platforms (Meesho/Myntra) silently to ensure user gets SOMETHING.
-        if not final_results and any(p in platforms_to_search for p in selenium_platforms):
-            logger.info(f"Primary search for '{query}' returned no results. Attempting fallback to API platforms...")
-            # If the user only searched specific platforms and got nothing, try API platforms as fallback
-            fallback_platforms = [p for p in api_platforms if p not in platforms_to_search]
-            if fallback_platforms:
-                fallback_products = []
-                for p in fallback_platforms:
-                    p_res = scraper_manager.scrape_platform_realtime(p, query, 15)
-                    if p_res:
-                        fallback_products.extend(p_res)
-                
-                if fallback_products:
-                    # re-rank with fallback products (ignoring strict platform filters to give user some options)
-                    final_results = recommender.rank_products_realtime(query, fallback_products, filters)[:10]
-                    logger.info(f"Fallback found {len(final_results)} items.")
-
-        # Store search history (optional user)
-        user = get_optional_user()
-        try:
-            event = SearchEvent(
-                user_id=user.id if user else None,
-                query=str(query)[:300],
-                filters_json=json.dumps(filters or {}),
-                results_count=len(final_results)
-            )
-            db.session.add(event)
-            db.session.commit()
-        except Exception as _e:
-            db.session.rollback()
-        
-        return jsonify({
+        _record_search_event(query, filters, len(final_results))
+
+        return api_response({
             'query': query,
             'count': len(final_results),
-            'results': final_results,
+            'results': _serialize_products(final_results, fields),
             'sources': list(set(p.get('platform') for p in final_results)),
-            'message': 'No live deals found; showing best available deals.' if not any(p.get('platform').lower() in selenium_platforms for p in final_results) and include_live_scraping else None
+            'message': _search_message(final_results, include_live_scraping),
+            'platforms': statuses,
+            'cache': cache_status
         })
-        
+
     except Exception as e:
         logger.error(f"Error in search: {str(e)}")
         import traceback
         traceback.print_exc()
         return jsonify({'error': str(e)}), 500
 
+
+def _sse(event, data):
+    return f"event: {event}\ndata: {dumps_json(data).decode('utf-8')}\n\n"
+
+
+@app.route('/api/search/stream', methods=['GET', 'POST'])
+def search_products_stream():
+    """Real-time search streamed as Server-Sent Events
+
+    Emits 'start', then one 'platform' event per platform as it finishes (with
+    its status, timing and the ranked results so far), then a 'done' event with
+    the final deduplicated, re-ranked snapshot - same shape as /api/search.
+    """
+    query, filters, top_n, include_live_scraping = _parse_search_request()
+    if not query:
+        return jsonify({'error': 'Query parameter is required'}), 400
+    try:
+        fields = _requested_fields(ProductRecord.FIELDS)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    def generate():
+        started = time.monotonic()
+        deadline = _search_deadline()
+        requested, platforms_to_search, skipped = _select_platforms(filters, include_live_scraping)
+        statuses = {p: {'status': 'skipped', 'count': 0, 'elapsed_ms': 0} for p in skipped}
+        yield _sse('start', {'query': query, 'platforms': platforms_to_search, 'skipped': skipped})
+
+        key, per_platform, entry, cache_status = _cached_search(query, platforms_to_search, top_n)
+        if entry is not None:
+            platform_results = ((p, products, 'cached', 0.0) for p, products in entry.results.items())
+        else:
+            platform_results = _fan_out(platforms_to_search, query, top_n,
+                                        on_complete=_cache_on_complete(key, per_platform))
+
+        all_products = []
+        final_results = []
+        try:
+            for platform, products, status, elapsed in platform_results:
+                all_products.extend(products)
+                statuses[platform] = {'status': status, 'count': len(products), 'elapsed_ms': round(elapsed * 1000)}
+                partial = _rank_results(query, all_products, requested, filters, top_n)
+                yield _sse('platform', {
+                    'platform': platform,
+                    **statuses[platform],
+                    'count_so_far': len(partial),
+                    'results': _serialize_products(partial, fields),
+                    'total_elapsed_ms': round((time.monotonic() - started) * 1000)
+                })
+
+            final_results = _rank_results(query, all_products, requested, filters, top_n)
+            if not final_results:
+                final_results = _fallback_results(query, platforms_to_search, filters, deadline)
+        except Exception as e:
+            logger.error(f"Error in streaming search: {e}")
+            yield _sse('error', {'error': str(e)})
+
+        _record_search_event(query, filters, len(final_results))
+        yield _sse('done', {
+            'query': query,
+            'count': len(final_results),
+            'results': _serialize_products(final_results, fields),
+            'sources': list(set(p.get('platform') for p in final_results)),
+            'message': _search_message(final_results, include_live_scraping),
+            'platforms': statuses,
+            'cache': cache_status,
+            'total_elapsed_ms': round((time.monotonic() - started) * 1000)
+        })
+
+    return Response(stream_with_context(generate()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
 @app.route('/api/history/search', methods=['GET'])
 @require_auth
 def get_search_history():
@@ -490,11 +682,18 @@ def get_search_history():
 @app.route('/api/wishlist', methods=['GET'])
 @require_auth
 def wishlist_list():
-    items = (WishlistItem.query
-             .filter(WishlistItem.user_id == request.user.id)
-             .order_by(WishlistItem.created_at.desc())
-             .all())
-    return jsonify({'count': len(items), 'items': [i.to_dict() for i in items]})
+    try:
+        product_fields = _requested_fields(PRODUCT_FIELDS) or PRODUCT_FIELDS
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    rows = db.session.execute(
+        db.select(*columns(WishlistItem, WISHLIST_ITEM_FIELDS), *columns(Product, product_fields))
+        .outerjoin(Product, Product.id == WishlistItem.product_id)
+        .where(WishlistItem.user_id == request.user.id)
+        .order_by(WishlistItem.created_at.desc())
+    ).all()
+    items = rows_with_product(rows, WISHLIST_ITEM_FIELDS, product_fields)
+    return api_response({'count': len(items), 'items': items})
 
 @app.route('/api/wishlist', methods=['POST'])
 @require_auth
@@ -515,7 +714,7 @@ def wishlist_add():
             # Create product in DB for wishlist tracking
             product = Product(
                 name=product_data.get('name', 'Unknown'),
-                description=product_data.get('description'),
+                description=product_data.get('description') or product_data.get('name'),
                 price=product_data.get('price', 0),
                 original_price=product_data.get('original_price'),
                 rating=product_data.get('rating'),
@@ -610,7 +809,7 @@ def purchases_confirm():
             # Create product in DB for purchase tracking
             product = Product(
                 name=product_data.get('name', 'Unknown'),
-                description=product_data.get('description'),
+                description=product_data.get('description') or product_data.get('name'),
                 price=product_data.get('price', 0),
                 original_price=product_data.get('original_price'),
                 rating=product_data.get('rating'),
@@ -654,49 +853,81 @@ def purchases_update_status(purchase_id):
     db.session.commit()
     return jsonify({'status': 'success', 'purchase': purchase.to_dict()})
 
+# Keyset orderings for list endpoints: sort column + id tie-breaker
+PRODUCT_SORT_KEYS = {
+    'recommendation_score': SortKey('recommendation_score', Product.recommendation_score, Product.id, descending=True),
+    'price': SortKey('price', Product.price, Product.id, descending=False),
+    'rating': SortKey('rating', Product.rating, Product.id, descending=True)
+}
+SCRAPING_LOG_SORT_KEY = SortKey('started_at', ScrapingLog.started_at, ScrapingLog.id, descending=True)
+MAX_PER_PAGE = 200
+
+
+def _paginate(query, sort_key):
+    """(rows, page metadata) for a list endpoint
+
+    With ?cursor= (empty for the first page) pages are read by keyset and the
+    response carries next_cursor/has_more; otherwise ?page= offset pagination
+    is used as before. ?count=exact|estimate|none controls the total (default:
+    exact for offset pages, none for cursor pages). Raises ValueError on bad input.
+    """
+    per_page = max(1, min(request.args.get('per_page', 20, type=int), MAX_PER_PAGE))
+    cursor_mode = 'cursor' in request.args
+    count_mode = request.args.get('count', 'none' if cursor_mode else 'exact')
+    if count_mode not in COUNT_MODES:
+        raise ValueError(f"count must be one of: {', '.join(COUNT_MODES)}")
+
+    total, is_estimate = count_rows(query, count_mode)
+    if cursor_mode:
+        rows, next_cursor = keyset_page(query, sort_key, per_page, request.args.get('cursor') or None)
+        meta = {'per_page': per_page, 'next_cursor': next_cursor, 'has_more': next_cursor is not None}
+        if total is not None:
+            meta['total'] = total
+    else:
+        page = max(1, request.args.get('page', 1, type=int))
+        rows = query.order_by(*sort_key.order_by()).limit(per_page).offset((page - 1) * per_page).all()
+        meta = {'page': page, 'per_page': per_page, 'total': total,
+                'pages': math.ceil(total / per_page) if total is not None else None}
+    if is_estimate:
+        meta['total_is_estimate'] = True
+    return rows, meta
+
+
 @app.route('/api/products', methods=['GET'])
 def get_products():
-    """Get all products with optional filtering"""
+    """Get all products with optional filtering (offset or cursor pagination)"""
     try:
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 20, type=int)
         platform = request.args.get('platform')
         min_price = request.args.get('min_price', type=float)
         max_price = request.args.get('max_price', type=float)
         min_rating = request.args.get('min_rating', type=float)
         sort_by = request.args.get('sort_by', 'recommendation_score')  # price, rating, recommendation_score
+        fields = _requested_fields(PRODUCT_FIELDS) or PRODUCT_FIELDS
         
-        query = Product.query
-        
-        # Apply filters
+        # Only the requested columns are selected (the description Text is skipped unless asked for)
+        query = Product.query.with_entities(*columns(Product, fields))
+        # Sorting (ties broken by id so pages are stable)
+        sort_key = PRODUCT_SORT_KEYS.get(sort_by, PRODUCT_SORT_KEYS['recommendation_score'])
+
+        # Apply filters. Within a platform the (platform, sort column, ...) index covers
+        # price and rating, so their ranges are checked while walking it in order
+        # instead of range-scanning them and sorting every match.
+        ranged = sort_key.residual if platform else (lambda column: column)
         if platform:
             query = query.filter(Product.platform == platform)
         if min_price:
-            query = query.filter(Product.price >= min_price)
+            query = query.filter(ranged(Product.price) >= min_price)
         if max_price:
-            query = query.filter(Product.price <= max_price)
+            query = query.filter(ranged(Product.price) <= max_price)
         if min_rating:
-            query = query.filter(Product.rating >= min_rating)
-        
-        # Apply sorting
-        if sort_by == 'price':
-            query = query.order_by(Product.price.asc())
-        elif sort_by == 'rating':
-            query = query.order_by(Product.rating.desc())
-        else:
-            query = query.order_by(Product.recommendation_score.desc())
-        
-        # Paginate
-        pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+            query = query.filter(ranged(Product.rating) >= min_rating)
+
+        rows, meta = _paginate(query, sort_key)
         
-        return jsonify({
-            'page': page,
-            'per_page': per_page,
-            'total': pagination.total,
-            'pages': pagination.pages,
-            'products': [p.to_dict() for p in pagination.items]
-        })
+        return api_response({**meta, 'products': rows_to_dicts(rows, fields)})
         
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         logger.error(f"Error getting products: {str(e)}")
         return jsonify({'error': str(e)}), 500
@@ -705,8 +936,15 @@ def get_products():
 def get_product(product_id):
     """Get a specific product by ID"""
     try:
-        product = Product.query.get_or_404(product_id)
-        return jsonify(product.to_dict())
+        fields = _requested_fields(PRODUCT_FIELDS) or PRODUCT_FIELDS
+        row = db.session.execute(
+            db.select(*columns(Product, fields)).where(Product.id == product_id)
+        ).first()
+        if row is None:
+            return jsonify({'error': 'Product not found'}), 404
+        return api_response(dict(zip(fields, row)))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         logger.error(f"Error getting product: {str(e)}")
         return jsonify({'error': str(e)}), 500
@@ -795,31 +1033,34 @@ def trigger_scraping():
 
 @app.route('/api/scraping-logs', methods=['GET'])
 def get_scraping_logs():
-    """Get scraping logs"""
+    """Get scraping logs, newest first (offset or cursor pagination)"""
     try:
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 20, type=int)
         platform = request.args.get('platform')
         
-        query = ScrapingLog.query
+        query = ScrapingLog.query.with_entities(*columns(ScrapingLog, SCRAPING_LOG_FIELDS))
         if platform:
-            query = query.filter(ScrapingLog.platform == platform)
+            # Logs are stored under the display name; accept the platform key too ('amazon')
+            scraper = scraper_manager.get_scraper(platform)
+            query = query.filter(ScrapingLog.platform == (scraper.platform if scraper else platform))
         
-        query = query.order_by(ScrapingLog.started_at.desc())
-        pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+        rows, meta = _paginate(query, SCRAPING_LOG_SORT_KEY)
         
-        return jsonify({
-            'page': page,
-            'per_page': per_page,
-            'total': pagination.total,
-            'pages': pagination.pages,
-            'logs': [log.to_dict() for log in pagination.items]
-        })
+        return api_response({**meta, 'logs': rows_to_dicts(rows, SCRAPING_LOG_FIELDS)})
         
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         logger.error(f"Error getting scraping logs: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/scraper-stats', methods=['GET'])
+def get_scraper_stats():
+    """Get runtime statistics for the scraping layer (browser pool, etc.)"""
+    stats = scraper_manager.get_stats()
+    stats['scrape_planner'] = scrape_planner.stats()
+    stats['search_cache'] = search_cache.stats()
+    return jsonify(stats)
+
 @app.route('/api/stats', methods=['GET'])
 def get_stats():
     """Get system statistics"""
@@ -847,6 +1088,10 @@ def trending_products():
     days = request.args.get('days', 7, type=int)
     limit = request.args.get('limit', 20, type=int)
     since = datetime.utcnow() - timedelta(days=max(1, min(days, 30)))
+    try:
+        fields = _requested_fields(PRODUCT_FIELDS) or PRODUCT_FIELDS
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
 
     rows = (db.session.query(ClickEvent.product_id, db.func.count(ClickEvent.id).label('clicks'))
             .filter(ClickEvent.created_at >= since)
@@ -856,19 +1101,21 @@ def trending_products():
             .all())
 
     product_ids = [r[0] for r in rows]
-    products = Product.query.filter(Product.id.in_(product_ids)).all() if product_ids else []
-    by_id = {p.id: p for p in products}
+    products = db.session.execute(
+        db.select(*columns(Product, fields)).where(Product.id.in_(product_ids))
+    ).all() if product_ids else []
+    by_id = {row.id: row for row in products}
 
     items = []
     for pid, clicks in rows:
-        p = by_id.get(pid)
-        if not p:
+        row = by_id.get(pid)
+        if row is None:
             continue
-        d = p.to_dict()
+        d = dict(zip(fields, row))
         d['clicks'] = int(clicks)
         items.append(d)
 
-    return jsonify({'since': since.isoformat(), 'count': len(items), 'items': items})
+    return api_response({'since': since, 'count': len(items), 'items': items})
 
 @app.route('/api/trending/searches', methods=['GET'])
 def trending_searches():
@@ -885,7 +1132,7 @@ def trending_searches():
             .all())
 
     items = [{'query': q, 'count': int(c)} for q, c in rows]
-    return jsonify({'since': since.isoformat(), 'count': len(items), 'items': items})
+    return api_response({'since': since, 'count': len(items), 'items': items})
 
 @app.route('/api/analytics/overview', methods=['GET'])
 def analytics_overview():
@@ -962,10 +1209,10 @@ def analytics_overview():
     for platform in platform_counts:
         last_log = ScrapingLog.query.filter_by(platform=platform, status='success').order_by(ScrapingLog.completed_at.desc()).first()
         if last_log and last_log.completed_at:
-            last_scraped[platform] = last_log.completed_at.isoformat()
+            last_scraped[platform] = last_log.completed_at
 
-    return jsonify({
-        'since': since.isoformat(),
+    return api_response({
+        'since': since,
         'totals': {
             'users': total_users,
             'products': total_products,
@@ -1017,8 +1264,8 @@ def admin_analytics():
     total_purchases = int(sum([c for _, c in purchases_by_platform]) if purchases_by_platform else 0)
     conversion_rate = (total_purchases / total_clicks) if total_clicks else 0.0
 
-    return jsonify({
-        'since': since.isoformat(),
+    return api_response({
+        'since': since,
         'totals': {
             'users': total_users,
             'products': total_products,
@@ -0,0 +1,249 @@
+"""
+Query-plan and latency benchmark for the product listing and analytics queries
+
+Seeds a SQLite database with synthetic products (1M by default) and scraping
+logs, then runs the statements /api/products and the analytics endpoints issue
+for every filter/sort combination, printing SQLite's EXPLAIN QUERY PLAN and the
+median latency of each:
+
+    python benchmark_queries.py                          # seed /tmp db once, then benchmark
+    python benchmark_queries.py --without-composite      # same data, composite indexes dropped (before)
+    python benchmark_queries.py --rows 100000 --json after.json
+
+The database is kept between runs (use --reseed to rebuild it).
+"""
+import argparse
+import json
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, select, func
+from sqlalchemy.dialects import sqlite as sqlite_dialect
+
+from models import db, Product, ScrapingLog
+from pagination import SortKey
+
+PLATFORMS = ['Amazon', 'Flipkart', 'Meesho', 'Myntra']
+CATEGORIES = ['electronics', 'clothing', 'jewelery', 'beauty', 'furniture', 'groceries', 'laptops',
+              'smartphones', 'fragrances', 'home-decoration', 'General']
+# The composite indexes under test (dropped by --without-composite)
+COMPOSITE_INDEXES = [ix.name for table in (Product.__table__, ScrapingLog.__table__)
+                     for ix in table.indexes if len(ix.columns) > 1]
+
+# Columns the product grid asks for (fields=...)
+GRID_COLUMNS = [Product.id, Product.name, Product.price, Product.original_price, Product.rating,
+                Product.review_count, Product.platform, Product.product_url, Product.image_url]
+
+SORT_KEYS = {
+    'recommendation_score': SortKey('recommendation_score', Product.recommendation_score, Product.id, descending=True),
+    'price': SortKey('price', Product.price, Product.id, descending=False),
+    'rating': SortKey('rating', Product.rating, Product.id, descending=True)
+}
+
+# /api/products query parameters
+FILTERS = {
+    'none': {},
+    'platform': {'platform': 'Meesho'},
+    'platform+price': {'platform': 'Meesho', 'min_price': 1000, 'max_price': 5000},
+    'platform+narrow price': {'platform': 'Meesho', 'min_price': 100000, 'max_price': 101000},
+    'platform+rating': {'platform': 'Meesho', 'min_rating': 4.0},
+    'price': {'min_price': 1000, 'max_price': 5000},
+    'platform+price+rating': {'platform': 'Meesho', 'min_price': 1000, 'max_price': 5000, 'min_rating': 4.0},
+}
+
+
+def product_filters(params, sort_key, residual=True):
+    """WHERE conditions for params, built the way get_products() builds them
+
+    residual=False gives the plain range filters get_products() used before the
+    composite indexes (for the --without-composite baseline).
+    """
+    ranged = sort_key.residual if residual and params.get('platform') else (lambda column: column)
+    conditions = []
+    if params.get('platform'):
+        conditions.append(Product.platform == params['platform'])
+    if params.get('min_price'):
+        conditions.append(ranged(Product.price) >= params['min_price'])
+    if params.get('max_price'):
+        conditions.append(ranged(Product.price) <= params['max_price'])
+    if params.get('min_rating'):
+        conditions.append(ranged(Product.rating) >= params['min_rating'])
+    return conditions
+
+
+def seed(path, rows, logs, batch=50000):
+    """Create the schema (with every model index) and fill it with synthetic rows"""
+    if os.path.exists(path):
+        os.remove(path)
+    engine = create_engine(f'sqlite:///{path}')
+    db.metadata.create_all(engine, tables=[Product.__table__, ScrapingLog.__table__])
+    engine.dispose()
+
+    rng = random.Random(42)
+    now = datetime.utcnow()
+    conn = sqlite3.connect(path)
+    conn.execute('PRAGMA journal_mode=OFF')
+    conn.execute('PRAGMA synchronous=OFF')
+    # Indexes are built once after loading; that is far faster than maintaining them per row
+    indexes = conn.execute(
+        "SELECT name, sql FROM sqlite_master WHERE type='index' AND tbl_name IN ('products', 'scraping_logs') "
+        "AND sql IS NOT NULL").fetchall()
+    for name, _ in indexes:
+        conn.execute(f'DROP INDEX {name}')
+
+    started = time.perf_counter()
+    insert = ('INSERT INTO products (name, description, price, original_price, rating, review_count, platform, '
+              'product_url, image_url, category, brand, availability, last_updated, created_at, recommendation_score) '
+              'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)')
+    for start in range(0, rows, batch):
+        chunk = []
+        for i in range(start, min(rows, start + batch)):
+            price = round(rng.lognormvariate(7.5, 1.2), 2)
+            stamp = now - timedelta(minutes=rng.randint(0, 60 * 24 * 90))
+            chunk.append((
+                f'Product {i} {rng.choice(CATEGORIES)}', f'Synthetic description for product {i}', price,
+                round(price * 1.2, 2), rng.choice([None, 3.0, 3.5, 3.8, 4.0, 4.1, 4.2, 4.3, 4.5, 4.7, 5.0]),
+                rng.randint(0, 20000), rng.choice(PLATFORMS), f'https://example.com/p/{i}',
+                f'https://example.com/img/{i}.jpg', rng.choice(CATEGORIES), '', 'In Stock', stamp, stamp,
+                round(rng.random(), 6)
+            ))
+        conn.executemany(insert, chunk)
+    conn.executemany(
+        'INSERT INTO scraping_logs (platform, status, products_scraped, started_at, completed_at, duration_seconds) '
+        'VALUES (?, ?, ?, ?, ?, ?)',
+        [(rng.choice(PLATFORMS), rng.choice(['success', 'success', 'success', 'failed']), rng.randint(0, 50),
+          now - timedelta(minutes=i), now - timedelta(minutes=i) + timedelta(seconds=5), 5.0) for i in range(logs)]
+    )
+    conn.commit()
+    loaded = time.perf_counter() - started
+    for _, sql in indexes:
+        conn.execute(sql)
+    conn.execute('ANALYZE')
+    conn.commit()
+    conn.close()
+    print(f"Seeded {rows} products + {logs} logs in {loaded:.1f}s, indexes in {time.perf_counter() - started - loaded:.1f}s")
+
+
+def set_composite_indexes(path, enabled):
+    """(Re)create or drop the composite indexes on the seeded database, then refresh planner stats"""
+    engine = create_engine(f'sqlite:///{path}')
+    with engine.begin() as connection:
+        for table in (Product.__table__, ScrapingLog.__table__):
+            for index in table.indexes:
+                if index.name not in COMPOSITE_INDEXES:
+                    continue
+                # Always dropped first, so a changed definition under the same name is rebuilt
+                connection.exec_driver_sql(f'DROP INDEX IF EXISTS {index.name}')
+                if enabled:
+                    index.create(connection)
+        connection.exec_driver_sql('ANALYZE')
+    engine.dispose()
+
+
+def build_queries(conn, residual=True):
+    """name -> compiled SQL for every listing/analytics statement under test"""
+    queries = {}
+    for filter_name, params in FILTERS.items():
+        conditions = product_filters(params, SORT_KEYS['recommendation_score'], residual)
+        queries[f'count        {filter_name}'] = select(func.count()).select_from(Product).where(*conditions)
+        for sort_name, sort_key in SORT_KEYS.items():
+            conditions = product_filters(params, sort_key, residual)
+            base = select(*GRID_COLUMNS).where(*conditions)
+            first = base.order_by(*sort_key.order_by()).limit(21)
+            queries[f'page 1       {filter_name} / {sort_name}'] = first
+            # A cursor 1000 rows in: resuming reads the ties segment, then the beyond segment
+            middle = conn.execute(
+                select(sort_key.column, Product.id).where(*conditions, sort_key.column.isnot(None))
+                .order_by(*sort_key.order_by()).limit(1).offset(1000)
+            ).first()
+            if middle is not None:
+                value, last_id = middle
+                ties = base.where(sort_key.ties(value, last_id)).order_by(*sort_key.order_by()).limit(21)
+                beyond = base.where(sort_key.beyond(value)).order_by(*sort_key.order_by()).limit(21)
+                queries[f'cursor ties  {filter_name} / {sort_name}'] = ties
+                queries[f'cursor next  {filter_name} / {sort_name}'] = beyond
+            queries[f'offset 5000  {filter_name} / {sort_name}'] = first.offset(5000)
+
+    queries['analytics    platform counts'] = (select(Product.platform, func.count(Product.id))
+                                               .group_by(Product.platform))
+    queries['analytics    price stats (1 platform)'] = (select(Product.price)
+                                                        .where(Product.platform == 'Meesho', Product.price.isnot(None)))
+    queries['analytics    category counts'] = (select(Product.category, func.count(Product.id))
+                                               .where(Product.category.isnot(None)).group_by(Product.category)
+                                               .order_by(func.count(Product.id).desc()).limit(8))
+    queries['analytics    last success (1 platform)'] = (select(ScrapingLog.completed_at)
+                                                         .where(ScrapingLog.platform == 'Meesho',
+                                                                ScrapingLog.status == 'success')
+                                                         .order_by(ScrapingLog.completed_at.desc()).limit(1))
+    queries['logs         platform / started_at'] = (select(ScrapingLog.id, ScrapingLog.started_at)
+                                                     .where(ScrapingLog.platform == 'Meesho')
+                                                     .order_by(ScrapingLog.started_at.desc().nulls_last(),
+                                                               ScrapingLog.id.desc()).limit(21))
+    return queries
+
+
+def compile_sql(stmt):
+    return str(stmt.compile(dialect=sqlite_dialect.dialect(), compile_kwargs={'literal_binds': True}))
+
+
+def run(path, repeat, residual=True):
+    conn = sqlite3.connect(path)
+    engine = create_engine(f'sqlite:///{path}')
+    with engine.connect() as sa_conn:
+        queries = build_queries(sa_conn, residual)
+    engine.dispose()
+
+    results = {}
+    for name, stmt in queries.items():
+        sql = compile_sql(stmt)
+        plan = '; '.join(row[3] for row in conn.execute(f'EXPLAIN QUERY PLAN {sql}'))
+        conn.execute(sql).fetchall()  # warm the page cache
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            conn.execute(sql).fetchall()
+            timings.append(time.perf_counter() - started)
+        results[name] = {'ms': round(statistics.median(timings) * 1000, 3), 'plan': plan}
+    conn.close()
+    return results
+
+
+def print_results(results):
+    for name, r in results.items():
+        print(f"{name:<56}{r['ms']:>10.3f} ms   {r['plan']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1_000_000, help='synthetic products to seed')
+    parser.add_argument('--logs', type=int, default=50_000, help='synthetic scraping logs to seed')
+    parser.add_argument('--db', default=os.path.join(tempfile.gettempdir(), 'buysmart-query-bench.db'))
+    parser.add_argument('--reseed', action='store_true', help='rebuild the database even if it exists')
+    parser.add_argument('--without-composite', action='store_true',
+                        help='drop the composite indexes first (baseline for comparison)')
+    parser.add_argument('--repeat', type=int, default=20, help='timed runs per query (median is reported)')
+    parser.add_argument('--json', help='also write results to this file')
+    args = parser.parse_args()
+
+    if args.reseed or not os.path.exists(args.db):
+        seed(args.db, args.rows, args.logs)
+    set_composite_indexes(args.db, enabled=not args.without_composite)
+
+    results = run(args.db, args.repeat, residual=not args.without_composite)
+    print(f"\n{'composite indexes ' + ('OFF' if args.without_composite else 'ON')} - {args.db}\n")
+    print_results(results)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'rows': args.rows, 'composite_indexes': not args.without_composite,
+                       'results': results}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+"""
+Offline parser benchmark for the scrapers
+
+Record fixtures once on a machine with network access, then replay them
+anywhere (no network, no browser) to time each scraper's search_products
+parse path:
+
+    python benchmark_scrapers.py --record              # save live responses/pages as fixtures
+    python benchmark_scrapers.py                       # replay and report items/sec + peak memory
+    python benchmark_scrapers.py --json before.json    # keep the numbers for a before/after diff
+
+Fixtures live in SCRAPER_FIXTURE_DIR (default backend/fixtures) unless --fixtures is given.
+A small set is committed there (an Amazon and a Flipkart 'laptop' page, also used by
+tests/test_scraper_fixtures.py), so this runs offline out of the box:
+
+    python benchmark_scrapers.py --platforms amazon flipkart --queries laptop
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from config import Config
+from fixtures import configure_fixtures, FixtureMissing
+from scraper import ScraperManager
+
+DEFAULT_QUERIES = [
+    'laptop', 'smartphone', 'headphones', 'smartwatch', 'shoes', 'shirt',
+    'backpack', 'television', 'keyboard', 'perfume', 'jacket', 'camera'
+]
+
+
+def make_manager():
+    # Keep catalog/HTTP caches out of the way so every response goes through the fixture layer
+    Config.SCRAPER_CACHE_DIR = tempfile.mkdtemp(prefix='scraper-bench-')
+    Config.HTTP_CACHE_TTLS = {}
+    return ScraperManager()
+
+
+def record(platforms, queries, max_results, directory):
+    configure_fixtures('record', directory)
+    manager = make_manager()
+    for platform in platforms:
+        scraper = manager.get_scraper(platform)
+        for query in queries:
+            products = scraper.search_products(query, max_results)
+            print(f"recorded {platform:<9} {query!r:<16} {len(products)} items")
+
+
+def run_queries(scraper, queries, max_results, repeat):
+    pages = items = missing = 0
+    for _ in range(repeat):
+        for query in queries:
+            scraper.clear_fetch_error()
+            products = scraper.search_products(query, max_results)
+            if not products and isinstance(scraper.last_fetch_error(), FixtureMissing):
+                missing += 1
+                continue
+            pages += 1
+            items += len(products)
+    return pages, items, missing
+
+
+def benchmark(platforms, queries, max_results, repeat, directory):
+    configure_fixtures('replay', directory)
+    manager = make_manager()
+    results = {}
+    for platform in platforms:
+        scraper = manager.get_scraper(platform)
+        # Warm-up: imports, catalog index build, first-call caches
+        run_queries(scraper, queries[:1], max_results, 1)
+
+        started = time.perf_counter()
+        pages, items, missing = run_queries(scraper, queries, max_results, repeat)
+        elapsed = time.perf_counter() - started
+
+        # Memory is measured in a separate pass; tracemalloc distorts timings
+        tracemalloc.start()
+        run_queries(scraper, queries, max_results, 1)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        results[platform] = {
+            'pages': pages,
+            'items': items,
+            'missing_fixtures': missing // repeat,
+            'seconds': round(elapsed, 4),
+            'ms_per_page': round(elapsed * 1000 / pages, 3) if pages else None,
+            'items_per_sec': round(items / elapsed, 1) if pages else None,
+            'peak_kib': round(peak / 1024, 1)
+        }
+    return results
+
+
+def print_results(results):
+    print(f"\n{'platform':<10}{'pages':>7}{'items':>8}{'ms/page':>10}{'items/s':>11}{'peak KiB':>10}{'missing':>9}")
+    for platform, r in results.items():
+        ms = f"{r['ms_per_page']:.2f}" if r['ms_per_page'] is not None else '-'
+        ips = f"{r['items_per_sec']:.0f}" if r['items_per_sec'] is not None else '-'
+        print(f"{platform:<10}{r['pages']:>7}{r['items']:>8}{ms:>10}{ips:>11}{r['peak_kib']:>10.1f}{r['missing_fixtures']:>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--record', action='store_true', help='fetch live and save fixtures instead of benchmarking')
+    parser.add_argument('--platforms', nargs='+', default=list(ScraperManager.SCRAPER_CLASSES))
+    parser.add_argument('--queries', nargs='+', default=DEFAULT_QUERIES)
+    parser.add_argument('--max-results', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=5, help='passes over the query list when benchmarking')
+    parser.add_argument('--fixtures', default=Config.SCRAPER_FIXTURE_DIR, help='fixture directory')
+    parser.add_argument('--json', help='also write results to this file')
+    parser.add_argument('--verbose', action='store_true', help='keep scraper INFO logging')
+    args = parser.parse_args()
+
+    if not args.verbose:
+        logging.getLogger().setLevel(logging.WARNING)
+
+    if args.record:
+        record(args.platforms, args.queries, args.max_results, args.fixtures)
+        return 0
+
+    if not os.path.isdir(args.fixtures):
+        print(f"No fixtures in {args.fixtures}; run with --record first", file=sys.stderr)
+        return 1
+    results = benchmark(args.platforms, args.queries, args.max_results, args.repeat, args.fixtures)
+    print_results(results)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'queries': args.queries, 'max_results': args.max_results,
+                       'repeat': args.repeat, 'results': results}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,238 @@
+"""
+Concurrent read/write benchmark for the SQLite profile
+
+Runs the app's database traffic against a seeded SQLite file for a fixed
+time, once with SQLite/SQLAlchemy defaults (rollback journal, 5+10 pool) and
+once with the configured profile (sqlite_profile.py + SQLALCHEMY_ENGINE_OPTIONS):
+
+- readers: /api/products pages and product lookups
+- the scheduler: batch upserts (one transaction per batch, like _persist_products)
+- request writers: one SearchEvent insert per transaction
+
+Every worker is a separate process, so the numbers reflect SQLite locking
+rather than contention for the GIL. The report covers throughput, latency and
+"database is locked" errors:
+
+    python benchmark_sqlite.py
+    python benchmark_sqlite.py --readers 16 --seconds 20 --json sqlite.json
+
+The file is created next to this script by default, since fsync cost depends
+on the disk (use --db to put it elsewhere). It is deleted afterwards.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import shutil
+import sqlite3
+import sys
+import time
+from datetime import datetime
+
+from sqlalchemy import bindparam, create_engine, exc, insert, select, update
+
+from config import BASE_DIR, Config
+from models import db, Product, PriceHistory, SearchEvent
+from sqlite_profile import apply_sqlite_profile, current_pragmas
+
+PLATFORMS = ['Amazon', 'Flipkart', 'Meesho', 'Myntra']
+GRID_COLUMNS = [Product.id, Product.name, Product.price, Product.original_price, Product.rating,
+                Product.review_count, Product.platform, Product.product_url, Product.image_url]
+
+
+def seed(path, products):
+    """Create the schema and fill products (rollback journal, as a fresh products.db)"""
+    engine = create_engine(f'sqlite:///{path}')
+    db.metadata.create_all(engine)
+    engine.dispose()
+
+    rng = random.Random(42)
+    now = datetime.utcnow()
+    conn = sqlite3.connect(path)
+    conn.executemany(
+        'INSERT INTO products (name, description, price, original_price, rating, review_count, platform, '
+        'product_url, image_url, category, availability, last_updated, created_at, recommendation_score) '
+        'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+        [(f'Product {i}', f'Synthetic description for product {i}', round(rng.lognormvariate(7.5, 1.2), 2), None,
+          rng.choice([None, 3.5, 4.0, 4.2, 4.5]), rng.randint(0, 20000), rng.choice(PLATFORMS),
+          f'https://example.com/p/{i}', f'https://example.com/img/{i}.jpg', 'General', 'In Stock', now, now,
+          round(rng.random(), 6)) for i in range(products)]
+    )
+    conn.commit()
+    conn.close()
+
+
+class Recorder:
+    """Latencies and error count for one worker"""
+
+    def __init__(self):
+        self.latencies = []
+        self.errors = 0
+
+    def timed(self, work):
+        started = time.perf_counter()
+        try:
+            work()
+        except (exc.OperationalError, exc.TimeoutError):  # database is locked / pool exhausted
+            self.errors += 1
+            return
+        self.latencies.append(time.perf_counter() - started)
+
+
+def summarize(latencies, errors, elapsed):
+    latencies = sorted(latencies)
+
+    def pct(p):
+        return round(latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000, 2) if latencies else None
+
+    return {'ops': len(latencies), 'per_sec': round(len(latencies) / elapsed, 1), 'errors': errors,
+            'p50_ms': pct(0.50), 'p99_ms': pct(0.99), 'max_ms': pct(1.0)}
+
+
+def make_engine(path, tuned):
+    """Engine with SQLite/SQLAlchemy defaults, or with the app's pool options and SQLite profile"""
+    if not tuned:
+        return create_engine(f'sqlite:///{path}')
+    engine = create_engine(f'sqlite:///{path}', **Config.SQLALCHEMY_ENGINE_OPTIONS)
+    apply_sqlite_profile(engine)
+    return engine
+
+
+def reader(engine, args, worker):
+    """/api/products pages and product lookups"""
+    rng = random.Random(worker)
+    page = (select(*GRID_COLUMNS).where(Product.platform == bindparam('platform'))
+            .order_by(Product.recommendation_score.desc().nulls_last(), Product.id.desc()).limit(20))
+    detail = select(*GRID_COLUMNS).where(Product.id == bindparam('id'))
+
+    def work():
+        with engine.connect() as connection:
+            connection.execute(page, {'platform': rng.choice(PLATFORMS)}).all()
+            connection.execute(detail, {'id': rng.randint(1, args.products)}).first()
+    return work
+
+
+def scheduler_writer(engine, args, worker):
+    """Batch upserts: read the batch's rows, update their prices, append price points"""
+    rng = random.Random(worker)
+    lookup = select(Product.id, Product.platform, Product.price).where(Product.id.in_(bindparam('ids', expanding=True)))
+    update_price = (update(Product).where(Product.id == bindparam('pid'))
+                    .values(price=bindparam('new_price'), last_updated=bindparam('now')))
+
+    def work():
+        start = rng.randint(1, max(1, args.products - args.batch))
+        now = datetime.utcnow()
+        with engine.begin() as connection:
+            rows = connection.execute(lookup, {'ids': list(range(start, start + args.batch))}).all()
+            changes = [{'pid': r.id, 'new_price': round(r.price * rng.uniform(0.9, 1.1), 2), 'now': now} for r in rows]
+            connection.execute(update_price, changes)
+            connection.execute(insert(PriceHistory), [
+                {'product_id': c['pid'], 'platform': r.platform, 'price': c['new_price'], 'recorded_at': now}
+                for c, r in zip(changes, rows)
+            ])
+    return work
+
+
+def event_writer(engine, args, worker):
+    """Request-path writes: one SearchEvent per transaction"""
+    def work():
+        with engine.begin() as connection:
+            connection.execute(insert(SearchEvent), {'query': 'laptop', 'results_count': 20,
+                                                     'created_at': datetime.utcnow()})
+    return work
+
+
+# role -> (work factory, args attribute holding the pause between operations)
+ROLES = {
+    'reads': (reader, 'read_pause'),
+    'scheduler batches': (scheduler_writer, 'batch_pause'),
+    'event writes': (event_writer, 'event_pause'),
+}
+
+
+def _worker(role, path, tuned, args, worker, start, results):
+    # Each role runs in its own process, so what is measured is SQLite locking rather than the GIL
+    engine = make_engine(path, tuned)
+    factory, pause_attr = ROLES[role]
+    work, pause = factory(engine, args, worker), getattr(args, pause_attr)
+    work()  # untimed: connects and compiles the statements
+    start.wait()  # every worker is warm; start together
+    recorder = Recorder()
+    until = time.time() + args.seconds
+    while time.time() < until:
+        recorder.timed(work)
+        time.sleep(pause)
+    engine.dispose()
+    results.put((role, recorder.latencies, recorder.errors))
+
+
+def run_profile(path, tuned, args):
+    """Run the mixed workload for args.seconds; returns the summary for this profile"""
+    engine = make_engine(path, tuned)
+    with engine.connect() as connection:
+        pragmas = current_pragmas(connection)  # also switches the file to WAL before the workers start
+    engine.dispose()
+
+    counts = {'reads': args.readers, 'scheduler batches': 1, 'event writes': args.writers}
+    results = multiprocessing.Queue()
+    start = multiprocessing.Barrier(sum(counts.values()))
+    processes = [multiprocessing.Process(target=_worker, args=(role, path, tuned, args, i, start, results))
+                 for role, n in counts.items() for i in range(n)]
+    for process in processes:
+        process.start()
+    collected = {role: ([], 0) for role in counts}
+    for _ in processes:
+        role, latencies, errors = results.get()
+        collected[role] = (collected[role][0] + latencies, collected[role][1] + errors)
+    for process in processes:
+        process.join()
+    return {'pragmas': pragmas,
+            **{role: summarize(latencies, errors, args.seconds) for role, (latencies, errors) in collected.items()}}
+
+
+def print_results(name, result):
+    print(f"\n{name}: " + ', '.join(f'{k}={v}' for k, v in result['pragmas'].items()))
+    for kind in ('reads', 'scheduler batches', 'event writes'):
+        r = result[kind]
+        print(f"  {kind:<18}{r['per_sec']:>9.1f}/s  p50 {r['p50_ms']} ms  p99 {r['p99_ms']} ms  "
+              f"max {r['max_ms']} ms  errors {r['errors']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--db', default=os.path.join(BASE_DIR, 'benchmark-sqlite.db'))
+    parser.add_argument('--products', type=int, default=50_000, help='products to seed')
+    parser.add_argument('--seconds', type=float, default=10, help='duration of each profile run')
+    parser.add_argument('--readers', type=int, default=8, help='reader processes')
+    parser.add_argument('--writers', type=int, default=2, help='request-writer processes')
+    parser.add_argument('--read-pause', type=float, default=0.005, help='seconds between reads (paced, like real traffic)')
+    parser.add_argument('--batch', type=int, default=500, help='products per scheduler batch')
+    parser.add_argument('--batch-pause', type=float, default=0.05, help='seconds between scheduler batches')
+    parser.add_argument('--event-pause', type=float, default=0.01, help='seconds between request writes')
+    parser.add_argument('--json', help='also write results to this file')
+    args = parser.parse_args()
+
+    template = args.db + '.template'
+    results = {}
+    try:
+        seed(template, args.products)
+        for name, tuned in (('defaults', False), ('profile', True)):
+            shutil.copyfile(template, args.db)  # same starting file (rollback journal) for both runs
+            results[name] = run_profile(args.db, tuned, args)
+            print_results(name, results[name])
+            for suffix in ('', '-wal', '-shm', '-journal'):
+                if os.path.exists(args.db + suffix):
+                    os.remove(args.db + suffix)
+    finally:
+        if os.path.exists(template):
+            os.remove(template)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'args': vars(args), 'results': results}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,286 @@
+"""
+Warm pool of headless Chrome instances shared by the Selenium scrapers
+
+Launching Chrome (and resolving chromedriver) costs seconds, so browsers are
+started once, health-checked on checkout and handed back to the pool after each
+page. Instances are recycled after BROWSER_MAX_USES pages or when they crash.
+selenium and webdriver_manager are only imported once a browser is launched.
+"""
+import atexit
+import collections
+import functools
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from config import Config
+from user_agents import get_user_agents
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+# Resources blocked in lean mode: images, media, fonts and third-party analytics,
+# ad, tag-manager, session-replay and marketing scripts. Product data (names,
+# prices, image URLs) is all in the DOM.
+#
+# Third-party scripts are blocked by a denylist rather than by origin:
+# Network.setBlockedURLs only matches URL patterns, and both platforms render
+# their result grids with scripts served from their own CDNs on other domains
+# (m.media-amazon.com, static-assets-web.flixcart.com), so an "anything not on
+# the page's domain" rule would break the pages. SELENIUM_LEAN_BLOCKED_URLS
+# adds patterns without a code change.
+LEAN_BLOCKED_URL_PATTERNS = [
+    # images, media, fonts
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.avif', '*.svg', '*.ico',
+    '*.mp4', '*.webm', '*.m3u8', '*.mp3',
+    '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot',
+    # analytics and tag managers
+    '*google-analytics.com*', '*googletagmanager.com*', '*analytics.google.com*',
+    '*scorecardresearch.com*', '*quantserve.com*', '*chartbeat.com*', '*mixpanel.com*',
+    '*segment.com*', '*segment.io*', '*amplitude.com*', '*newrelic.com*', '*nr-data.net*',
+    '*sentry.io*', '*bat.bing.com*', '*analytics.tiktok.com*', '*snap.licdn.com*',
+    # ads and retargeting
+    '*doubleclick.net*', '*googlesyndication.com*', '*googleadservices.com*', '*adservice.google.*',
+    '*amazon-adsystem.com*', '*criteo.com*', '*criteo.net*', '*taboola.com*', '*outbrain.com*',
+    '*adsrvr.org*', '*ads.linkedin.com*', '*facebook.net*', '*connect.facebook.com*',
+    # session replay, A/B testing, marketing automation
+    '*hotjar.com*', '*clarity.ms*', '*fullstory.com*', '*optimizely.com*', '*branch.io*',
+    '*appsflyer.com*', '*moengage.com*', '*clevertap-prod.com*', '*webengage.com*', '*onesignal.com*'
+]
+
+
+class BrowserPoolExhausted(Exception):
+    """Raised when no browser becomes available within the checkout timeout"""
+
+
+@functools.lru_cache(maxsize=1)
+def get_chromedriver_path():
+    """Resolve (downloading if needed) the chromedriver binary once per process"""
+    from webdriver_manager.chrome import ChromeDriverManager
+    return ChromeDriverManager().install()
+
+
+class PooledBrowser:
+    """A Chrome driver plus the bookkeeping the pool needs to recycle it"""
+    __slots__ = ('driver', 'uses', 'created_at')
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.uses = 0
+        self.created_at = time.time()
+
+
+class BrowserPool:
+    """Bounded pool of pre-launched browsers that scrapers check out and return"""
+
+    def __init__(self, size=None, max_uses=None, checkout_timeout=None, lean=None):
+        self.size = max(1, size or Config.BROWSER_POOL_SIZE)
+        self.lean = Config.SELENIUM_LEAN_MODE if lean is None else lean
+        self.max_uses = max(1, max_uses or Config.BROWSER_MAX_USES)
+        self.checkout_timeout = checkout_timeout or Config.BROWSER_CHECKOUT_TIMEOUT_SEC
+        self.ua = get_user_agents()
+        self._idle = collections.deque()
+        self._total = 0  # launched and not yet retired (idle + checked out)
+        self._cond = threading.Condition()
+        self._closed = False
+        self._counters = {
+            'launched': 0,
+            'launch_failures': 0,
+            'checkouts': 0,
+            'waits': 0,
+            'recycled': 0,
+            'crashed': 0,
+            'kept_after_error': 0
+        }
+
+    def _build_options(self):
+        from selenium.webdriver.chrome.options import Options as ChromeOptions
+        options = ChromeOptions()
+        options.add_argument("--headless=new")
+        options.add_argument("--disable-gpu")
+        options.add_argument("--no-sandbox")
+        options.add_argument("--disable-dev-shm-usage")
+        options.add_argument("--window-size=1920,1080")
+        options.add_argument("--start-maximized")
+        options.add_argument(f"user-agent={self.ua.random}")
+        # Mask automation
+        options.add_argument("--disable-blink-features=AutomationControlled")
+        options.add_experimental_option("excludeSwitches", ["enable-automation"])
+        options.add_experimental_option('useAutomationExtension', False)
+        if self.lean:
+            # Hand the page over once the DOM is parsed; don't wait for subresources
+            options.page_load_strategy = 'eager'
+            options.add_argument("--blink-settings=imagesEnabled=false")
+            options.add_experimental_option('prefs', {
+                'profile.managed_default_content_settings.images': 2,
+                'profile.default_content_setting_values.notifications': 2
+            })
+        return options
+
+    def _launch(self):
+        from selenium import webdriver
+        from selenium.webdriver.chrome.service import Service as ChromeService
+        driver = webdriver.Chrome(service=ChromeService(get_chromedriver_path()), options=self._build_options())
+        try:
+            driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+            if self.lean:
+                driver.execute_cdp_cmd('Network.enable', {})
+                driver.execute_cdp_cmd('Network.setBlockedURLs',
+                                       {'urls': LEAN_BLOCKED_URL_PATTERNS + Config.SELENIUM_LEAN_BLOCKED_URLS})
+        except Exception:
+            driver.quit()
+            raise
+        with self._cond:
+            self._counters['launched'] += 1
+        return PooledBrowser(driver)
+
+    def _is_healthy(self, browser):
+        try:
+            return browser.driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def _survived(self, browser, error):
+        """After an error inside browser(): can the browser go back to the pool?
+
+        Timeouts (page load, WebDriverWait) and parsing errors leave the session
+        usable, so only dead sessions and browsers failing the health check are retired.
+        """
+        from selenium.common.exceptions import InvalidSessionIdException, NoSuchWindowException, TimeoutException
+        if isinstance(error, (InvalidSessionIdException, NoSuchWindowException)):
+            return False
+        if isinstance(error, TimeoutException):
+            try:
+                browser.driver.execute_script("window.stop()")  # abandon the slow page before reuse
+            except Exception:
+                pass
+        if not self._is_healthy(browser):
+            return False
+        with self._cond:
+            self._counters['kept_after_error'] += 1
+        return True
+
+    def _retire(self, browser, reason):
+        try:
+            browser.driver.quit()
+        except Exception:
+            pass
+        with self._cond:
+            self._total -= 1
+            self._counters[reason] += 1
+            self._cond.notify()
+
+    def acquire(self, timeout=None):
+        """Check out a healthy browser, launching one if the pool is below size"""
+        deadline = time.monotonic() + (timeout or self.checkout_timeout)
+        while True:
+            browser = None
+            with self._cond:
+                while not self._idle and self._total >= self.size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise BrowserPoolExhausted(f"No browser available within {timeout or self.checkout_timeout}s")
+                    self._counters['waits'] += 1
+                    self._cond.wait(remaining)
+                if self._idle:
+                    # LIFO keeps the most recently used (warmest) browsers busy
+                    browser = self._idle.pop()
+                else:
+                    self._total += 1
+                self._counters['checkouts'] += 1
+
+            if browser is None:
+                try:
+                    return self._launch()
+                except Exception as e:
+                    logger.error(f"Failed to initialize Chrome driver: {e}")
+                    with self._cond:
+                        self._total -= 1
+                        self._counters['launch_failures'] += 1
+                        self._cond.notify()
+                    raise
+            if self._is_healthy(browser):
+                return browser
+            logger.warning("Discarding crashed browser from pool")
+            self._retire(browser, 'crashed')
+
+    def release(self, browser, broken=False):
+        """Return a browser to the pool, recycling it if it is worn out or broken"""
+        browser.uses += 1
+        if broken:
+            self._retire(browser, 'crashed')
+        elif browser.uses >= self.max_uses or self._closed:
+            self._retire(browser, 'recycled')
+        else:
+            with self._cond:
+                self._idle.append(browser)
+                self._cond.notify()
+
+    @contextmanager
+    def browser(self, timeout=None):
+        """Context manager yielding a checked-out driver; errors retire it only if the session died"""
+        pooled = self.acquire(timeout)
+        broken = False
+        try:
+            yield pooled.driver
+        except Exception as e:
+            broken = not self._survived(pooled, e)
+            raise
+        finally:
+            self.release(pooled, broken=broken)
+
+    def warm(self, count=None):
+        """Pre-launch browsers so the first searches skip Chrome start-up"""
+        target = min(self.size, count or self.size)
+        while True:
+            with self._cond:
+                if self._closed or self._total >= target:
+                    return
+                self._total += 1
+            try:
+                browser = self._launch()
+            except Exception as e:
+                logger.error(f"Browser pool warm-up failed: {e}")
+                with self._cond:
+                    self._total -= 1
+                    self._counters['launch_failures'] += 1
+                    self._cond.notify()
+                return
+            with self._cond:
+                self._idle.append(browser)
+                self._cond.notify()
+
+    def stats(self):
+        with self._cond:
+            return {
+                'size': self.size,
+                'lean': self.lean,
+                'max_uses': self.max_uses,
+                'idle': len(self._idle),
+                'in_use': self._total - len(self._idle),
+                **self._counters
+            }
+
+    def close(self):
+        """Quit idle browsers; checked-out ones are retired when released"""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = list(self._idle), collections.deque()
+        for browser in idle:
+            self._retire(browser, 'recycled')
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool():
+    """Process-wide browser pool shared by every Selenium scraper"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = BrowserPool()
+            atexit.register(_pool.close)
+        return _pool
@@ -0,0 +1,168 @@
+"""
+Local catalog cache and inverted index for catalog-style API platforms
+
+Some platforms (FakeStore/Myntra) only expose "download the whole catalog".
+CatalogCache keeps that catalog on local disk, revalidates it with
+ETag/If-Modified-Since once its TTL expires, and serves searches from an
+in-memory token -> item inverted index instead of a download per query.
+"""
+import json
+import logging
+import os
+import re
+import threading
+import time
+
+from config import Config
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+
+def tokenize(text):
+    return _TOKEN_RE.findall(str(text or '').lower())
+
+
+class CatalogIndex:
+    """Immutable token -> item inverted index over a list of catalog items"""
+
+    def __init__(self, items, fields=('title', 'description', 'category')):
+        self.items = items
+        self._postings = {}
+        self._categories = {}
+        for idx, item in enumerate(items):
+            for field in fields:
+                for token in tokenize(item.get(field)):
+                    self._postings.setdefault(token, set()).add(idx)
+            category = str(item.get('category') or '').lower()
+            self._categories.setdefault(category, []).append(idx)
+        self._expansions = {}
+
+    def _lookup(self, token):
+        """Items containing token, or any indexed token that contains it (e.g. phone -> smartphone)"""
+        ids = self._postings.get(token)
+        if ids is not None:
+            return ids
+        ids = self._expansions.get(token)
+        if ids is None:
+            ids = set()
+            for indexed, postings in self._postings.items():
+                if token in indexed:
+                    ids |= postings
+            if len(self._expansions) > 10000:
+                self._expansions.clear()
+            self._expansions[token] = ids
+        return ids
+
+    def search(self, query):
+        """Items matching every query token, in catalog order"""
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        result = None
+        for token in sorted(set(tokens), key=len, reverse=True):
+            ids = self._lookup(token)
+            result = set(ids) if result is None else result & ids
+            if not result:
+                return []
+        return [self.items[i] for i in sorted(result)]
+
+    def in_category(self, fragment):
+        """Items whose category contains fragment, in catalog order"""
+        ids = []
+        for category, cat_ids in self._categories.items():
+            if fragment in category:
+                ids.extend(cat_ids)
+        return [self.items[i] for i in sorted(ids)]
+
+
+class CatalogCache:
+    """Disk-backed catalog with TTL and conditional revalidation"""
+
+    def __init__(self, name, url, fetch, ttl=None, cache_dir=None):
+        self.name = name
+        self.url = url
+        self.fetch = fetch  # callable(url, headers=..., timeout=...) -> FetchResponse
+        self.ttl = Config.CATALOG_TTL_SEC if ttl is None else ttl
+        self.path = os.path.join(cache_dir or Config.SCRAPER_CACHE_DIR, f'catalog_{name}.json')
+        self._lock = threading.Lock()
+        self._meta = None
+        self._index = None
+        self._retry_at = 0.0  # after a failed revalidation, keep serving the old copy until then
+
+    def _load_from_disk(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if meta.get('url') != self.url or not isinstance(meta.get('items'), list):
+                return
+            self._meta = meta
+            self._index = CatalogIndex(meta['items'])
+            logger.info(f"Loaded {len(meta['items'])} {self.name} catalog items from disk")
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable {self.name} catalog cache: {e}")
+
+    def _save_to_disk(self):
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f'{self.path}.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._meta, f)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.warning(f"Could not persist {self.name} catalog cache: {e}")
+
+    def _is_fresh(self):
+        if self._meta is None:
+            return False
+        now = time.time()
+        return (now - self._meta.get('fetched_at', 0)) < self.ttl or now < self._retry_at
+
+    def _revalidate(self):
+        headers = {}
+        if self._meta:
+            if self._meta.get('etag'):
+                headers['If-None-Match'] = self._meta['etag']
+            if self._meta.get('last_modified'):
+                headers['If-Modified-Since'] = self._meta['last_modified']
+
+        resp = self.fetch(self.url, headers=headers, timeout=10)
+        if resp.status_code == 304 and self._meta:
+            self._meta['fetched_at'] = time.time()
+            self._save_to_disk()
+            return
+
+        items = resp.json() or []
+        self._meta = {
+            'url': self.url,
+            'etag': resp.headers.get('etag'),
+            'last_modified': resp.headers.get('last-modified'),
+            'fetched_at': time.time(),
+            'items': items
+        }
+        self._index = CatalogIndex(items)
+        self._save_to_disk()
+        logger.info(f"Refreshed {self.name} catalog ({len(items)} items)")
+
+    def get_index(self):
+        """Current catalog index, revalidating it first if the TTL has expired"""
+        if self._is_fresh():
+            return self._index
+        with self._lock:
+            if self._meta is None:
+                self._load_from_disk()
+            if self._is_fresh():
+                return self._index
+            try:
+                self._revalidate()
+            except Exception as e:
+                if self._index is None:
+                    raise
+                # upstream is down: keep serving the last known catalog for a while
+                self._retry_at = time.time() + min(self.ttl, 60)
+                logger.warning(f"{self.name} catalog revalidation failed, serving stale copy: {e}")
+            return self._index
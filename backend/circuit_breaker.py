@@ -0,0 +1,141 @@
+"""
+Circuit breakers and negative caching for real-time platform searches
+
+A platform that keeps failing (errors or answers slower than the real-time
+timeout) is opened: searches skip it instantly instead of waiting on it.
+After a cool-down one background probe is run (half-open); success closes the
+circuit, failure re-opens it with a longer cool-down. Independently, (platform,
+query) pairs that just errored or came back empty are remembered for a short
+while so repeated searches don't pay for the same miss again.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from config import Config
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+_probe_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='circuit-probe')
+
+
+class CircuitBreaker:
+    """Closed/open/half-open breaker for one platform; probe() -> bool checks recovery"""
+
+    def __init__(self, name, probe, failure_threshold=None, reset_timeout=None, max_reset_timeout=None):
+        self.name = name
+        self.probe = probe
+        self.failure_threshold = failure_threshold or Config.CIRCUIT_FAILURE_THRESHOLD
+        self.base_reset_timeout = reset_timeout or Config.CIRCUIT_RESET_SEC
+        self.max_reset_timeout = max_reset_timeout or Config.CIRCUIT_RESET_MAX_SEC
+        self.reset_timeout = self.base_reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._counters = {'opened': 0, 'rejected': 0, 'probes': 0}
+        self._lock = threading.Lock()
+
+    def allow_request(self):
+        """True if real traffic may go to the platform; starts a probe once an open circuit cools down"""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            self._counters['rejected'] += 1
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = HALF_OPEN
+                self._counters['probes'] += 1
+                _probe_executor.submit(self._run_probe)
+            return False
+
+    def _run_probe(self):
+        try:
+            healthy = bool(self.probe())
+        except Exception as e:
+            logger.warning(f"{self.name}: circuit probe failed: {e}")
+            healthy = False
+        if healthy:
+            self.record_success()
+        else:
+            self.record_failure()
+
+    def record_success(self):
+        with self._lock:
+            if self.state != CLOSED:
+                logger.info(f"{self.name}: circuit closed")
+            self.state = CLOSED
+            self.failures = 0
+            self.reset_timeout = self.base_reset_timeout
+
+    def record_failure(self):
+        with self._lock:
+            if self.state == HALF_OPEN:
+                # still sick: back off further before the next probe
+                self.reset_timeout = min(self.reset_timeout * 2, self.max_reset_timeout)
+                self._open()
+                return
+            self.failures += 1
+            if self.state == CLOSED and self.failures >= self.failure_threshold:
+                self._open()
+
+    def _open(self):
+        self.state = OPEN
+        self.opened_at = time.monotonic()
+        self._counters['opened'] += 1
+        logger.warning(f"{self.name}: circuit open for {self.reset_timeout:.0f}s after {self.failures} failures")
+
+    def stats(self):
+        with self._lock:
+            return {'state': self.state, 'failures': self.failures,
+                    'reset_timeout': self.reset_timeout, **self._counters}
+
+
+class NegativeCache:
+    """Short-lived map of (platform, query) pairs known to return nothing -> 'empty' or 'error'"""
+    MAX_ENTRIES = 10000
+
+    def __init__(self, ttl=None):
+        self.ttl = Config.NEGATIVE_CACHE_TTL_SEC if ttl is None else ttl
+        self._expires = {}  # (platform, query) -> (expires_at, status)
+        self._hits = 0
+        self._lock = threading.Lock()
+
+    def add(self, platform, query, status='empty'):
+        if self.ttl <= 0:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if len(self._expires) >= self.MAX_ENTRIES:
+                self._expires = {k: v for k, v in self._expires.items() if v[0] > now}
+                if len(self._expires) >= self.MAX_ENTRIES:
+                    self._expires.clear()
+            self._expires[(platform, query)] = (now + self.ttl, status)
+
+    def get(self, platform, query):
+        """Status the pair was cached with ('empty' or 'error'), or None"""
+        with self._lock:
+            entry = self._expires.get((platform, query))
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._expires[(platform, query)]
+                return None
+            self._hits += 1
+            return entry[1]
+
+    def contains(self, platform, query):
+        return self.get(platform, query) is not None
+
+    def discard_platform(self, platform):
+        """Forget a platform's entries, e.g. once it recovers from an outage"""
+        with self._lock:
+            self._expires = {k: v for k, v in self._expires.items() if k[0] != platform}
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._expires), 'hits': self._hits, 'ttl': self.ttl}
@@ -3,14 +3,56 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def _platform_map(name, default):
+    """Parse 'meesho=900,myntra=60' style env vars into {platform: number}"""
+    result = {}
+    for part in (os.environ.get(name) or default).split(','):
+        if '=' in part:
+            key, value = part.split('=', 1)
+            result[key.strip().lower()] = float(value)
+    return result
+
+def _engine_options(database_uri):
+    """Connection pool settings for SQLALCHEMY_ENGINE_OPTIONS
+
+    In-memory SQLite keeps the single static connection Flask-SQLAlchemy gives it.
+    A SQLite file has one writer at a time and a page cache per connection, so it
+    gets a smaller pool than a server database.
+    """
+    sqlite = database_uri.startswith('sqlite')
+    if sqlite and (':memory:' in database_uri or 'mode=memory' in database_uri
+                   or database_uri.rstrip('/') == 'sqlite:'):
+        return {}
+    return {
+        'pool_size': int(os.environ.get('DB_POOL_SIZE', 5 if sqlite else 10)),
+        'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 5 if sqlite else 20)),
+        'pool_timeout': float(os.environ.get('DB_POOL_TIMEOUT_SEC', 10)),
+        'pool_pre_ping': os.environ.get('DB_POOL_PRE_PING', '0') == '1',  # for server databases that drop idle connections
+    }
+
 class Config:
     """Application configuration"""
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-secret-key-change-in-production'
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///products.db'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Request threads, the scheduler, scrape jobs and the alert checker each hold a pooled connection
+    SQLALCHEMY_ENGINE_OPTIONS = _engine_options(SQLALCHEMY_DATABASE_URI)
+    # SQLite profile, applied to every connection (see sqlite_profile.py); '' leaves a setting at SQLite's default
+    SQLITE_PROFILE = os.environ.get('SQLITE_PROFILE', '1') == '1'
+    SQLITE_JOURNAL_MODE = os.environ.get('SQLITE_JOURNAL_MODE', 'WAL')  # readers don't block behind writers
+    SQLITE_SYNCHRONOUS = os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL')  # WAL-safe; fsync only at checkpoints
+    SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000))  # writers wait for the lock
+    SQLITE_CACHE_SIZE_KB = int(os.environ.get('SQLITE_CACHE_SIZE_KB', 8192))  # per connection; mmap covers hot reads
+    SQLITE_MMAP_SIZE_MB = int(os.environ.get('SQLITE_MMAP_SIZE_MB', 256))  # memory-mapped reads (0 = off)
+    # count=estimate on list endpoints stops counting here (the total is then a lower bound)
+    PAGINATION_COUNT_CAP = int(os.environ.get('PAGINATION_COUNT_CAP', 10000))
     
     # Scraping configuration
     SCRAPING_INTERVAL_HOURS = int(os.environ.get('SCRAPING_INTERVAL_HOURS', 6))
+    # Price history is written on price changes, plus a heartbeat point if none in N hours (0 = off)
+    PRICE_HISTORY_HEARTBEAT_HOURS = float(os.environ.get('PRICE_HISTORY_HEARTBEAT_HOURS', 24))
     REQUEST_TIMEOUT = int(os.environ.get('REQUEST_TIMEOUT', 30))
     USER_AGENT = os.environ.get('USER_AGENT') or 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
 
@@ -18,6 +60,67 @@ class Config:
     ENABLE_SELENIUM = os.environ.get('ENABLE_SELENIUM', '0') == '1'  # default off for speed/stability
     REALTIME_PLATFORM_TIMEOUT_SEC = int(os.environ.get('REALTIME_PLATFORM_TIMEOUT_SEC', 6))
     REALTIME_OVERALL_TIMEOUT_SEC = int(os.environ.get('REALTIME_OVERALL_TIMEOUT_SEC', 10))
+    REALTIME_MAX_WORKERS = int(os.environ.get('REALTIME_MAX_WORKERS', 16))  # shared by all live searches
+    # Live search result cache (canonical query + platform set), LRU-bounded with stale-while-revalidate
+    SEARCH_CACHE_MAX_ENTRIES = int(os.environ.get('SEARCH_CACHE_MAX_ENTRIES', 500))
+    SEARCH_CACHE_TTL_SEC = float(os.environ.get('SEARCH_CACHE_TTL_SEC', 300))  # 0 disables the cache
+    SEARCH_CACHE_STALE_SEC = float(os.environ.get('SEARCH_CACHE_STALE_SEC', 1800))
+    # Circuit breaker: open a platform after N failed/slow searches, probe it again after a cool-down
+    CIRCUIT_FAILURE_THRESHOLD = int(os.environ.get('CIRCUIT_FAILURE_THRESHOLD', 3))
+    CIRCUIT_RESET_SEC = float(os.environ.get('CIRCUIT_RESET_SEC', 30))
+    CIRCUIT_RESET_MAX_SEC = float(os.environ.get('CIRCUIT_RESET_MAX_SEC', 300))  # cool-down doubles per failed probe
+    CIRCUIT_PROBE_QUERY = os.environ.get('CIRCUIT_PROBE_QUERY', 'phone')
+    # (platform, query) pairs that errored or returned nothing are skipped for this long
+    NEGATIVE_CACHE_TTL_SEC = float(os.environ.get('NEGATIVE_CACHE_TTL_SEC', 120))
+
+    # Warm Selenium browser pool
+    BROWSER_POOL_SIZE = int(os.environ.get('BROWSER_POOL_SIZE', 2))
+    BROWSER_MAX_USES = int(os.environ.get('BROWSER_MAX_USES', 50))  # recycle a browser after N pages
+    BROWSER_CHECKOUT_TIMEOUT_SEC = int(os.environ.get('BROWSER_CHECKOUT_TIMEOUT_SEC', 30))
+    # Batch scraping: concurrent jobs per API platform (Selenium platforms are capped at BROWSER_POOL_SIZE)
+    SCRAPE_API_CONCURRENCY = int(os.environ.get('SCRAPE_API_CONCURRENCY', 4))
+    # Scheduled scraping budget per cycle (0 = unlimited); pairs are ranked by search volume x staleness
+    SCRAPE_BUDGET_REQUESTS = int(os.environ.get('SCRAPE_BUDGET_REQUESTS', 16))
+    SCRAPE_BUDGET_SECONDS = float(os.environ.get('SCRAPE_BUDGET_SECONDS', 0))
+    SCRAPE_DEMAND_WINDOW_HOURS = float(os.environ.get('SCRAPE_DEMAND_WINDOW_HOURS', 72))
+    SCRAPE_PLAN_MAX_QUERIES = int(os.environ.get('SCRAPE_PLAN_MAX_QUERIES', 50))
+    SCRAPE_STALENESS_CAP = float(os.environ.get('SCRAPE_STALENESS_CAP', 4))  # in scrape intervals
+    # Lean mode: block images/media/fonts/trackers, eager page loads, wait on result selectors instead of sleeping
+    SELENIUM_LEAN_MODE = os.environ.get('SELENIUM_LEAN_MODE', '1') == '1'
+    # Extra URL patterns to block in lean mode, comma-separated (e.g. '*tracker.example.com*')
+    SELENIUM_LEAN_BLOCKED_URLS = [p.strip() for p in os.environ.get('SELENIUM_LEAN_BLOCKED_URLS', '').split(',') if p.strip()]
+    SELENIUM_READY_TIMEOUT_SEC = float(os.environ.get('SELENIUM_READY_TIMEOUT_SEC', 10))
+    SELENIUM_STABLE_POLL_SEC = float(os.environ.get('SELENIUM_STABLE_POLL_SEC', 0.3))
+
+    # Shared HTTP fetch engine (one keep-alive pool for all scrapers)
+    FETCH_MAX_CONNECTIONS = int(os.environ.get('FETCH_MAX_CONNECTIONS', 100))
+    FETCH_MAX_CONNECTIONS_PER_HOST = int(os.environ.get('FETCH_MAX_CONNECTIONS_PER_HOST', 10))
+    FETCH_KEEPALIVE_SEC = float(os.environ.get('FETCH_KEEPALIVE_SEC', 60))
+    FETCH_SLOT_TIMEOUT_SEC = float(os.environ.get('FETCH_SLOT_TIMEOUT_SEC', 10))  # wait for a per-host slot, separate from REQUEST_TIMEOUT
+    FETCH_HTTP2 = os.environ.get('FETCH_HTTP2', '1') == '1'  # used only if the h2 package is installed
+
+    # Per-platform token buckets (requests/sec and burst); rates halve on 429/503/timeouts and recover gradually
+    RATE_LIMITS = _platform_map('RATE_LIMITS', 'amazon=0.5,flipkart=0.5,meesho=5,myntra=2')
+    RATE_LIMIT_BURSTS = _platform_map('RATE_LIMIT_BURSTS', 'amazon=2,flipkart=2,meesho=10,myntra=4')
+    RATE_LIMIT_DEFAULT = float(os.environ.get('RATE_LIMIT_DEFAULT', 2))
+    RATE_LIMIT_MAX_WAIT_SEC = float(os.environ.get('RATE_LIMIT_MAX_WAIT_SEC', 5))  # fail fast rather than queue longer
+    RATE_LIMIT_RETRIES = int(os.environ.get('RATE_LIMIT_RETRIES', 2))
+    RATE_LIMIT_BACKOFF_BASE_SEC = float(os.environ.get('RATE_LIMIT_BACKOFF_BASE_SEC', 0.5))
+    RATE_LIMIT_BACKOFF_MAX_SEC = float(os.environ.get('RATE_LIMIT_BACKOFF_MAX_SEC', 8))
+
+    # Local scraper caches (catalog snapshots, etc.)
+    SCRAPER_CACHE_DIR = os.environ.get('SCRAPER_CACHE_DIR') or os.path.join(BASE_DIR, 'cache')
+    CATALOG_TTL_SEC = int(os.environ.get('CATALOG_TTL_SEC', 3600))  # revalidate catalog snapshots hourly
+
+    # Persistent HTTP response cache for API-backed platforms (platforms not listed are not cached)
+    HTTP_CACHE_PATH = os.environ.get('HTTP_CACHE_PATH') or os.path.join(SCRAPER_CACHE_DIR, 'http_cache.sqlite3')
+    HTTP_CACHE_TTLS = _platform_map('HTTP_CACHE_TTLS', 'meesho=900')  # fresh for N seconds
+    HTTP_CACHE_STALE_SEC = _platform_map('HTTP_CACHE_STALE_SEC', 'meesho=3600')  # then served stale while refreshing
+    HTTP_CACHE_MAX_AGE_SEC = int(os.environ.get('HTTP_CACHE_MAX_AGE_SEC', 7 * 24 * 3600))
+
+    # Scraper fixtures: 'record' saves every fetched response/page, 'replay' serves them with no network
+    SCRAPER_FIXTURE_MODE = os.environ.get('SCRAPER_FIXTURE_MODE', '')
+    SCRAPER_FIXTURE_DIR = os.environ.get('SCRAPER_FIXTURE_DIR') or os.path.join(BASE_DIR, 'fixtures')
     
     # Recommendation configuration
     TFIDF_MAX_FEATURES = int(os.environ.get('TFIDF_MAX_FEATURES', 5000))
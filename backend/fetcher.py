@@ -0,0 +1,214 @@
+"""
+Shared asyncio HTTP fetch engine used by all scrapers
+
+A single event loop runs on a background thread and owns one httpx.AsyncClient,
+so connections are pooled per host, kept alive between searches and upgraded to
+HTTP/2 where the server (and the installed h2 package) supports it. Scrapers are
+synchronous, so they call FetchEngine.request(), which schedules the coroutine on
+the engine loop and blocks only the calling thread until the response arrives.
+"""
+import asyncio
+import concurrent.futures
+import json
+import logging
+import os
+import threading
+from urllib.parse import urlsplit
+
+import httpx
+
+from config import Config
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+# httpx logs every request at INFO; keep the scraper logs readable
+logging.getLogger('httpx').setLevel(logging.WARNING)
+
+try:
+    import h2  # noqa: F401 - only needed so httpx can negotiate HTTP/2
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class FetchError(Exception):
+    """Raised when a fetch fails or returns an error status"""
+
+    def __init__(self, message, status_code=None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class FetchTimeout(FetchError):
+    """Raised when a fetch does not complete within its timeout"""
+
+
+class FetchSaturated(FetchError):
+    """Raised when no per-host slot frees up in time: our own queueing, not the platform"""
+
+
+class FetchResponse:
+    """Fully-read HTTP response, independent of the underlying HTTP client"""
+    __slots__ = ('url', 'status_code', 'headers', 'content', 'http_version')
+
+    def __init__(self, url, status_code, headers, content, http_version='HTTP/1.1'):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers  # lower-cased header names
+        self.content = content
+        self.http_version = http_version
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8', errors='replace')
+
+    def json(self):
+        return json.loads(self.content) if self.content else None
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise FetchError(f"HTTP {self.status_code} for {self.url}", status_code=self.status_code)
+
+
+class FetchEngine:
+    """Connection-pooled async HTTP client with a blocking wrapper for threads"""
+
+    def __init__(self, max_connections=None, max_per_host=None, timeout=None, http2=None, slot_timeout=None):
+        self.max_connections = max_connections or Config.FETCH_MAX_CONNECTIONS
+        self.max_per_host = max_per_host or Config.FETCH_MAX_CONNECTIONS_PER_HOST
+        self.timeout = timeout or Config.REQUEST_TIMEOUT
+        self.slot_timeout = Config.FETCH_SLOT_TIMEOUT_SEC if slot_timeout is None else slot_timeout
+        self.http2 = (Config.FETCH_HTTP2 if http2 is None else http2) and HTTP2_AVAILABLE
+        self._loop = None
+        self._thread = None
+        self._client = None
+        self._host_slots = {}  # host -> asyncio.Semaphore (only touched on the engine loop)
+        self._pid = None  # process that started the loop
+        self._lock = threading.Lock()
+
+    def _ensure_loop(self):
+        """Start the engine loop thread on first use, and again in a forked child
+
+        A forked worker (e.g. gunicorn --preload after the import-time bootstrap
+        scrape) inherits the parent's loop, client and semaphores but not the
+        loop thread, so they are dropped and rebuilt for the new process.
+        """
+        with self._lock:
+            if self._loop is not None and self._pid == os.getpid():
+                return self._loop
+            if self._loop is not None:
+                logger.info("Fetch engine used after fork; starting a fresh loop for this process")
+                self._client = None
+                self._host_slots = {}
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def run():
+                asyncio.set_event_loop(loop)
+                loop.call_soon(ready.set)
+                loop.run_forever()
+
+            self._thread = threading.Thread(target=run, name='fetch-engine', daemon=True)
+            self._thread.start()
+            ready.wait()
+            self._loop = loop
+            self._pid = os.getpid()
+            return loop
+
+    def _get_client(self):
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                http2=self.http2,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                    keepalive_expiry=Config.FETCH_KEEPALIVE_SEC
+                ),
+                timeout=self.timeout,
+                follow_redirects=True
+            )
+        return self._client
+
+    def _host_slot(self, url):
+        host = urlsplit(url).netloc
+        slot = self._host_slots.get(host)
+        if slot is None:
+            slot = self._host_slots[host] = asyncio.Semaphore(self.max_per_host)
+        return slot
+
+    async def fetch(self, method, url, params=None, headers=None, timeout=None):
+        """Fetch a URL on the engine loop, bounded by the per-host concurrency limit
+
+        Waiting for a host slot has its own timeout (slot_timeout) and raises
+        FetchSaturated, so local queueing never eats into the request timeout
+        or looks like the platform being slow.
+        """
+        client = self._get_client()
+        slot = self._host_slot(url)
+        try:
+            await asyncio.wait_for(slot.acquire(), self.slot_timeout)
+        except asyncio.TimeoutError:
+            raise FetchSaturated(f"No free connection slot for {urlsplit(url).netloc} "
+                                 f"within {self.slot_timeout}s") from None
+        try:
+            resp = await client.request(method, url, params=params, headers=headers,
+                                        timeout=timeout or self.timeout)
+        except httpx.TimeoutException as e:
+            raise FetchTimeout(f"Timed out fetching {url}: {e}") from e
+        except httpx.HTTPError as e:
+            raise FetchError(f"Error fetching {url}: {e}") from e
+        finally:
+            slot.release()
+        return FetchResponse(
+            url=str(resp.url),
+            status_code=resp.status_code,
+            headers={k.lower(): v for k, v in resp.headers.items()},
+            content=resp.content,
+            http_version=resp.http_version
+        )
+
+    def submit(self, method, url, **kwargs):
+        """Schedule a fetch on the engine loop and return a concurrent.futures.Future"""
+        loop = self._ensure_loop()
+        return asyncio.run_coroutine_threadsafe(self.fetch(method, url, **kwargs), loop)
+
+    def request(self, method, url, params=None, headers=None, timeout=None):
+        """Blocking fetch for synchronous callers"""
+        timeout = timeout or self.timeout
+        future = self.submit(method, url, params=params, headers=headers, timeout=timeout)
+        try:
+            # slot wait plus a small grace period, so the engine-side timeouts fire first
+            return future.result(timeout=self.slot_timeout + timeout + 1)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise FetchTimeout(f"Timed out fetching {url}")
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def close(self):
+        """Close pooled connections and stop the engine loop"""
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+        if self._client is not None:
+            asyncio.run_coroutine_threadsafe(self._client.aclose(), loop).result(timeout=5)
+            self._client = None
+        loop.call_soon_threadsafe(loop.stop)
+        self._host_slots = {}
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_fetch_engine():
+    """Process-wide fetch engine shared by every scraper"""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = FetchEngine()
+            logger.info(f"Fetch engine ready (http2={_engine.http2}, "
+                        f"max_connections={_engine.max_connections}, per_host={_engine.max_per_host})")
+        return _engine
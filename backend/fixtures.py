@@ -0,0 +1,122 @@
+"""
+Record/replay fixtures for scraper fetches
+
+With SCRAPER_FIXTURE_MODE=record every response a scraper gets (HTTP bodies
+and Selenium page sources) is also written under SCRAPER_FIXTURE_DIR; with
+SCRAPER_FIXTURE_MODE=replay the same calls are answered from those files and
+nothing touches the network, so parsers can be benchmarked and regression
+tested offline. Fixtures are keyed by platform + URL + query params.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+from config import Config
+from fetcher import FetchError, FetchResponse
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+RECORD = 'record'
+REPLAY = 'replay'
+
+
+class FixtureMissing(FetchError):
+    """Raised in replay mode when no fixture was recorded for a request"""
+
+
+class FixtureStore:
+    """Fixture files under <directory>/<platform>/<key>.json (+ .body)"""
+
+    def __init__(self, mode=None, directory=None):
+        mode = (Config.SCRAPER_FIXTURE_MODE if mode is None else mode or '').lower()
+        if mode not in ('', RECORD, REPLAY):
+            raise ValueError(f"Unknown fixture mode: {mode!r}")
+        self.mode = mode
+        self.directory = directory or Config.SCRAPER_FIXTURE_DIR
+
+    @property
+    def recording(self):
+        return self.mode == RECORD
+
+    @property
+    def replaying(self):
+        return self.mode == REPLAY
+
+    @staticmethod
+    def make_key(url, params=None):
+        items = sorted((str(k), str(v)) for k, v in (params or {}).items())
+        raw = json.dumps([url, items], separators=(',', ':'))
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:20]
+
+    def _paths(self, platform, url, params):
+        base = os.path.join(self.directory, platform.lower(), self.make_key(url, params))
+        return f'{base}.json', f'{base}.body'
+
+    def save(self, platform, url, params, response):
+        """Record an HTTP response (2xx only; 304s and errors carry no replayable body)"""
+        if not 200 <= response.status_code < 300:
+            return
+        self._write(platform, url, params, {
+            'kind': 'http',
+            'status': response.status_code,
+            'headers': response.headers,
+        }, response.content)
+
+    def save_page(self, platform, url, source):
+        """Record a rendered Selenium page source"""
+        self._write(platform, url, None, {'kind': 'page'}, source.encode('utf-8'))
+
+    def _write(self, platform, url, params, meta, body):
+        meta_path, body_path = self._paths(platform, url, params)
+        meta.update(url=url, params=params or {}, recorded_at=time.time())
+        try:
+            os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+            with open(body_path, 'wb') as f:
+                f.write(body)
+            with open(meta_path, 'w', encoding='utf-8') as f:
+                json.dump(meta, f, indent=1)
+        except OSError as e:
+            logger.warning(f"Could not record fixture for {url}: {e}")
+
+    def _read(self, platform, url, params):
+        meta_path, body_path = self._paths(platform, url, params)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            with open(body_path, 'rb') as f:
+                return meta, f.read()
+        except FileNotFoundError:
+            raise FixtureMissing(f"No {platform} fixture recorded for {url} {params or ''}".rstrip())
+
+    def load(self, platform, url, params=None):
+        meta, body = self._read(platform, url, params)
+        return FetchResponse(url, meta['status'], meta.get('headers') or {}, body, 'fixture')
+
+    def load_page(self, platform, url):
+        _, body = self._read(platform, url, None)
+        return body.decode('utf-8')
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_fixture_store():
+    """Process-wide fixture store configured from SCRAPER_FIXTURE_MODE/DIR"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = FixtureStore()
+        return _store
+
+
+def configure_fixtures(mode, directory=None):
+    """Switch the process-wide fixture store (used by benchmark_scrapers.py)"""
+    global _store
+    with _store_lock:
+        _store = FixtureStore(mode, directory)
+        return _store
@@ -0,0 +1,68 @@
+"""
+Streaming HTML parsing for search result pages
+
+Instead of building a full BeautifulSoup tree for a large results page and then
+keeping only the first few cards, the page is fed to lxml's HTMLPullParser in
+chunks. Each result container is yielded as soon as its closing tag is parsed,
+and the caller can stop (and stop parsing) once it has enough valid records.
+Finished containers are cleared so memory stays flat as parsing proceeds.
+"""
+from lxml import etree
+
+CHUNK_SIZE = 64 * 1024
+
+
+def iter_elements(source, predicate, chunk_size=CHUNK_SIZE):
+    """Yield completed elements for which predicate(elem) is true, in document order
+
+    Elements are cleared after the consumer resumes, so callers must pull
+    everything they need from an element before asking for the next one.
+    """
+    parser = etree.HTMLPullParser(events=('end',))
+    try:
+        for offset in range(0, len(source), chunk_size):
+            parser.feed(source[offset:offset + chunk_size])
+            for _, elem in parser.read_events():
+                if predicate(elem):
+                    yield elem
+                    _discard(elem)
+        parser.close()
+        for _, elem in parser.read_events():
+            if predicate(elem):
+                yield elem
+                _discard(elem)
+    except etree.LxmlError:
+        # truncated/garbled markup: keep whatever was already yielded
+        return
+
+
+def _discard(elem):
+    """Free a processed element and any already-processed siblings before it"""
+    elem.clear(keep_tail=True)
+    parent = elem.getparent()
+    if parent is not None:
+        while elem.getprevious() is not None:
+            del parent[0]
+
+
+def has_classes(elem, classes):
+    """True if elem's class attribute contains every class in classes"""
+    tokens = (elem.get('class') or '').split()
+    return all(c in tokens for c in classes)
+
+
+def find_first(elem, tag, classes=()):
+    """First descendant <tag> carrying all of classes (like bs4 find with class_)"""
+    for child in elem.iterdescendants(tag):
+        if not classes or has_classes(child, classes):
+            return child
+    return None
+
+
+def element_text(elem, strip=False):
+    """Text content of elem; strip=True matches bs4 get_text(strip=True)"""
+    if elem is None:
+        return ''
+    if strip:
+        return ''.join(t.strip() for t in elem.itertext() if t.strip())
+    return ''.join(elem.itertext())
@@ -0,0 +1,156 @@
+"""
+Persistent HTTP response cache for API-backed scrapers
+
+Responses are stored in a local SQLite file keyed by method + URL + params, so
+popular queries survive restarts and are served without an outbound call.
+Each platform has its own TTL and stale-while-revalidate window: within the TTL
+an entry is a plain hit, inside the stale window it is served immediately while
+a background refresh replaces it.
+"""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from config import Config
+from fetcher import FetchResponse
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class CachedEntry:
+    """A cached response plus the time it was stored"""
+    __slots__ = ('response', 'stored_at')
+
+    def __init__(self, response, stored_at):
+        self.response = response
+        self.stored_at = stored_at
+
+    @property
+    def age(self):
+        return time.time() - self.stored_at
+
+
+class HttpCache:
+    """SQLite-backed response cache with hit/miss counters"""
+    PRUNE_EVERY = 500  # stores between sweeps of expired rows
+
+    def __init__(self, path=None):
+        self.path = path or Config.HTTP_CACHE_PATH
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._revalidating = set()
+        self._revalidator = ThreadPoolExecutor(max_workers=2, thread_name_prefix='http-cache-revalidate')
+        self._counters = {'hits': 0, 'stale_hits': 0, 'misses': 0, 'stores': 0, 'revalidations': 0, 'errors': 0}
+        self._conn().execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                status INTEGER NOT NULL,
+                headers TEXT NOT NULL,
+                body BLOB NOT NULL,
+                stored_at REAL NOT NULL
+            )
+        """)
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def make_key(method, url, params=None):
+        items = sorted((str(k), str(v)) for k, v in (params or {}).items())
+        raw = json.dumps([method.upper(), url, items], separators=(',', ':'))
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def count(self, name):
+        with self._lock:
+            self._counters[name] += 1
+
+    def get(self, key):
+        try:
+            row = self._conn().execute(
+                'SELECT url, status, headers, body, stored_at FROM responses WHERE key = ?', (key,)).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"HTTP cache read failed: {e}")
+            self.count('errors')
+            return None
+        if not row:
+            return None
+        url, status, headers, body, stored_at = row
+        return CachedEntry(FetchResponse(url, status, json.loads(headers), bytes(body), 'cache'), stored_at)
+
+    def set(self, key, response):
+        try:
+            self._conn().execute(
+                'INSERT OR REPLACE INTO responses (key, url, status, headers, body, stored_at) VALUES (?, ?, ?, ?, ?, ?)',
+                (key, response.url, response.status_code, json.dumps(response.headers), response.content, time.time()))
+        except sqlite3.Error as e:
+            logger.warning(f"HTTP cache write failed: {e}")
+            self.count('errors')
+            return
+        with self._lock:
+            self._counters['stores'] += 1
+            prune = self._counters['stores'] % self.PRUNE_EVERY == 0
+        if prune:
+            self.prune()
+
+    def prune(self, max_age=None):
+        """Delete entries older than max_age seconds"""
+        max_age = max_age or Config.HTTP_CACHE_MAX_AGE_SEC
+        try:
+            self._conn().execute('DELETE FROM responses WHERE stored_at < ?', (time.time() - max_age,))
+        except sqlite3.Error as e:
+            logger.warning(f"HTTP cache prune failed: {e}")
+
+    def revalidate(self, key, fetch_live):
+        """Refresh key in the background with fetch_live(); concurrent requests share one refresh"""
+        with self._lock:
+            if key in self._revalidating:
+                return
+            self._revalidating.add(key)
+            self._counters['revalidations'] += 1
+
+        def run():
+            try:
+                response = fetch_live()
+                if response.status_code == 200:
+                    self.set(key, response)
+            except Exception as e:
+                logger.warning(f"Background revalidation failed: {e}")
+            finally:
+                with self._lock:
+                    self._revalidating.discard(key)
+
+        self._revalidator.submit(run)
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self._counters)
+        lookups = counters['hits'] + counters['stale_hits'] + counters['misses']
+        counters['hit_rate'] = round((counters['hits'] + counters['stale_hits']) / lookups, 4) if lookups else 0.0
+        return counters
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_http_cache():
+    """Process-wide HTTP response cache"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = HttpCache()
+        return _cache
@@ -1,8 +1,12 @@
 from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime
+import logging
 import secrets
 from werkzeug.security import generate_password_hash, check_password_hash
 
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
 db = SQLAlchemy()
 
 class Product(db.Model):
@@ -27,6 +31,17 @@ class Product(db.Model):
     
     # Computed score for ranking
     recommendation_score = db.Column(db.Float, default=0.0, index=True)
+
+    # /api/products filters on platform and sorts by (column, id), so a platform-filtered
+    # page is an ordered index scan (id is listed explicitly to keep that order ahead of
+    # the trailing columns). The trailing columns cover the price/rating filters, which
+    # are checked inside the index rather than per row. (platform, price, ...) also
+    # covers the per-platform price stats in analytics.
+    __table_args__ = (
+        db.Index('ix_products_platform_score', 'platform', 'recommendation_score', 'id', 'price', 'rating'),
+        db.Index('ix_products_platform_price', 'platform', 'price', 'id', 'rating'),
+        db.Index('ix_products_platform_rating', 'platform', 'rating', 'id', 'price'),
+    )
     
     def to_dict(self):
         """Convert product to dictionary"""
@@ -64,6 +79,12 @@ class ScrapingLog(db.Model):
     started_at = db.Column(db.DateTime, default=datetime.utcnow)
     completed_at = db.Column(db.DateTime)
     duration_seconds = db.Column(db.Float)
+
+    # Latest successful scrape per platform (analytics) and per-platform log listing
+    __table_args__ = (
+        db.Index('ix_scraping_logs_platform_status_completed', 'platform', 'status', 'completed_at'),
+        db.Index('ix_scraping_logs_platform_started', 'platform', 'started_at'),
+    )
     
     def to_dict(self):
         return {
@@ -263,6 +284,17 @@ class PriceHistory(db.Model):
         }
 
 
+class ScrapedQuery(db.Model):
+    """When scheduled scraping last refreshed a (platform, query) pair; survives restarts."""
+    __tablename__ = 'scraped_queries'
+    __table_args__ = (db.UniqueConstraint('search_query', 'platform', name='uq_scraped_queries_query_platform'),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    platform = db.Column(db.String(100), nullable=False)  # scraper key, e.g. 'amazon'
+    search_query = db.Column(db.String(300), nullable=False)  # canonical_query() form
+    last_scraped_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+
 class PriceDropAlert(db.Model):
     """User sets a target price; system triggers when product price drops below it."""
     __tablename__ = 'price_drop_alerts'
@@ -328,3 +360,27 @@ class RedirectToken(db.Model):
         if self.expires_at and now >= self.expires_at:
             return False
         return True
+
+
+def ensure_indexes():
+    """Create model indexes missing from an existing database (create_all skips existing tables)
+
+    Needs an app context. On SQLite the planner statistics are refreshed
+    (ANALYZE) when anything was created, so the new indexes get picked.
+    """
+    inspector = db.inspect(db.engine)
+    created = []
+    for table in db.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {ix['name'] for ix in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(bind=db.engine)
+                created.append(index.name)
+    if created:
+        logger.info(f"Created indexes: {', '.join(created)}")
+        if db.engine.dialect.name == 'sqlite':
+            with db.engine.begin() as connection:
+                connection.exec_driver_sql('ANALYZE')
+    return created
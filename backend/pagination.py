@@ -0,0 +1,144 @@
+"""
+Keyset (cursor) pagination for list endpoints
+
+Offset pagination re-reads and discards every skipped row and pays for a
+COUNT(*) over the filtered set on every page. Keyset pagination instead
+orders by (sort column, id) and resumes after the last row of the previous
+page, so any page costs an index seek plus per_page rows. The position is
+returned as an opaque cursor.
+
+A page is read as consecutive segments, each a plain index seek: the rows
+tied with the cursor's sort value (by id), then the rows strictly beyond it,
+then the NULL tail (NULL sort values are ordered last, by id). A single
+row-value comparison would only seek on the sort column and scan the ties.
+"""
+import base64
+import json
+from datetime import datetime
+
+from config import Config
+from models import db
+
+COUNT_MODES = ('exact', 'estimate', 'none')
+
+
+class CursorError(ValueError):
+    """Raised for a malformed cursor or one issued for a different sort order"""
+
+
+class SortKey:
+    """One keyset ordering: (column, id), both ascending or both descending"""
+
+    def __init__(self, name, column, id_column, descending):
+        self.name = name
+        self.column = column
+        self.id_column = id_column
+        self.descending = descending
+
+    @property
+    def is_datetime(self):
+        return isinstance(self.column.type, db.DateTime)
+
+    def order_by(self):
+        if self.descending:
+            return self.column.desc().nulls_last(), self.id_column.desc()
+        return self.column.asc().nulls_last(), self.id_column.asc()
+
+    def _id_after(self, last_id):
+        return self.id_column < last_id if self.descending else self.id_column > last_id
+
+    def ties(self, value, last_id):
+        """Rows with the cursor's sort value, after last_id"""
+        return db.and_(self.column == value, self._id_after(last_id))
+
+    def beyond(self, value):
+        """Rows whose (non-NULL) sort value comes after value"""
+        return self.column < value if self.descending else self.column > value
+
+    def segments(self, value, last_id, resume):
+        """Filters that together cover, in order, every row after the cursor position"""
+        if not resume:
+            return [self.column.isnot(None), self.null_tail()]
+        if value is None:
+            return [self.null_tail(last_id)]
+        return [self.ties(value, last_id), self.beyond(value), self.null_tail()]
+
+    def residual(self, column):
+        """column for a filter to check while walking this key's index, rather than range-scan
+
+        column + 0 can't be used as an index range, which keeps the planner from
+        picking the filter column's index and sorting every match. Only useful when
+        the index being walked also covers column (the filter is then checked in it).
+        """
+        return column if column is self.column else column + 0
+
+    def null_tail(self, last_id=None):
+        """Rows with a NULL sort value (after last_id when resuming inside the tail)"""
+        condition = self.column.is_(None)
+        if last_id is not None:
+            condition = db.and_(condition, self._id_after(last_id))
+        return condition
+
+    def encode(self, value, last_id):
+        if value is not None and self.is_datetime:
+            value = value.isoformat()
+        raw = json.dumps({'s': self.name, 'v': value, 'i': last_id}, separators=(',', ':'))
+        return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+    def decode(self, cursor):
+        """(value, last_id) from a cursor issued by encode() for this sort key"""
+        try:
+            raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+            data = json.loads(raw)
+            value, last_id = data['v'], int(data['i'])
+            if data['s'] != self.name:
+                raise CursorError(f"Cursor was issued for sort '{data['s']}', not '{self.name}'")
+            if value is not None and self.is_datetime:
+                value = datetime.fromisoformat(value)
+        except CursorError:
+            raise
+        except Exception:
+            raise CursorError('Invalid cursor')
+        return value, last_id
+
+
+def keyset_page(query, sort_key, per_page, cursor=None):
+    """(rows, next_cursor) for one page of query ordered by sort_key
+
+    query must select columns (with_entities); the sort value and id are
+    appended as two extra trailing columns, which callers zipping rows
+    against their field names ignore. next_cursor is None on the last page.
+    """
+    query = query.add_columns(sort_key.column.label('_cursor_value'), sort_key.id_column.label('_cursor_id'))
+    value = last_id = None
+    if cursor:
+        value, last_id = sort_key.decode(cursor)
+
+    limit = per_page + 1  # one extra row tells us whether there is a next page
+    rows = []
+    for segment in sort_key.segments(value, last_id, resume=bool(cursor)):
+        rows += query.filter(segment).order_by(*sort_key.order_by()).limit(limit - len(rows)).all()
+        if len(rows) >= limit:
+            break
+
+    if len(rows) <= per_page:
+        return rows, None
+    rows = rows[:per_page]
+    last = rows[-1]
+    return rows, sort_key.encode(last._cursor_value, last._cursor_id)
+
+
+def count_rows(query, mode):
+    """(total, is_estimate) for mode 'exact' | 'estimate' | 'none'
+
+    'estimate' counts at most PAGINATION_COUNT_CAP rows; beyond that the cap is
+    returned as a lower bound with is_estimate True. 'none' returns (None, False).
+    """
+    if mode == 'none':
+        return None, False
+    query = query.order_by(None)
+    if mode == 'estimate':
+        cap = Config.PAGINATION_COUNT_CAP
+        total = query.limit(cap + 1).count()
+        return min(total, cap), total > cap
+    return query.count(), False
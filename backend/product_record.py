@@ -0,0 +1,88 @@
+"""
+Compact record for scraped products
+
+Scrapers emit ProductRecord instead of plain dicts: a __slots__ object with a
+fixed field set (no per-instance dict), no duplicated description when it is
+just the product name, and room for the ranking scores so the recommender can
+write them in place. Records are converted to dicts once, when a response is
+serialized (to_dict), with every field present - None as null and the
+description falling back to the name - so the API shape matches the old dicts.
+
+Records keep a small dict-style interface (get / [] / in) so code that treats
+products as mappings - persistence, filters, logging - works unchanged. A
+field holding None counts as missing, like an absent dict key.
+"""
+
+
+class ProductRecord:
+    """One scraped product plus its (optional) ranking scores"""
+    __slots__ = ('name', 'price', 'original_price', 'rating', 'review_count', 'platform',
+                 'product_url', 'image_url', 'category', 'brand', 'availability', '_description',
+                 'id', 'recommendation_score', 'similarity_score', 'combined_score')
+
+    FIELDS = ('id', 'name', 'description', 'price', 'original_price', 'rating', 'review_count',
+              'platform', 'product_url', 'image_url', 'category', 'brand', 'availability',
+              'recommendation_score', 'similarity_score', 'combined_score')
+    _FIELD_SET = frozenset(FIELDS)
+
+    def __init__(self, name, price, platform, product_url, original_price=None, rating=None,
+                 review_count=0, image_url=None, category='General', brand=None,
+                 availability='In Stock', description=None, id=None, recommendation_score=None):
+        self.name = name
+        self.price = price
+        self.platform = platform
+        self.product_url = product_url
+        self.original_price = original_price
+        self.rating = rating
+        self.review_count = review_count
+        self.image_url = image_url
+        self.category = category
+        self.brand = brand
+        self.availability = availability
+        self.description = description
+        self.id = id
+        self.recommendation_score = recommendation_score
+        self.similarity_score = None
+        self.combined_score = None
+
+    @property
+    def description(self):
+        """Falls back to the name; only a distinct description is stored"""
+        return self.name if self._description is None else self._description
+
+    @description.setter
+    def description(self, value):
+        self._description = None if not value or value == self.name else value
+
+    # Mapping-style access
+
+    def get(self, key, default=None):
+        value = getattr(self, key, None) if key in self._FIELD_SET else None
+        return default if value is None else value
+
+    def __getitem__(self, key):
+        if key not in self._FIELD_SET:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key not in self._FIELD_SET:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key):
+        return key in self._FIELD_SET and getattr(self, key) is not None
+
+    def copy(self):
+        """Shallow copy; rank a copy when the record is shared (search cache, single-flight waiters)"""
+        clone = object.__new__(ProductRecord)
+        for slot in self.__slots__:
+            setattr(clone, slot, getattr(self, slot))
+        return clone
+
+    def to_dict(self, fields=None):
+        """JSON-ready dict of fields (default: all); every field is present, unset ones as None"""
+        return {field: getattr(self, field) for field in fields or self.FIELDS}
+
+    def __repr__(self):
+        return f"<ProductRecord {self.platform}: {self.name!r} @ {self.price}>"
@@ -0,0 +1,151 @@
+"""
+Process-wide rate limiting for outbound scraping traffic
+
+Every platform (each scraper talks to a single host) gets a token bucket with a
+configured rate and burst. Live searches, the scheduler and background
+revalidation all draw from the same bucket, so concurrent callers can't burst
+a platform. Rates adapt AIMD-style: a 429/503 or a timeout halves the
+platform's current rate (and honours Retry-After), and each success adds back
+a small step towards the configured rate.
+"""
+import logging
+import random
+import threading
+import time
+
+from config import Config
+from fetcher import FetchError
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+THROTTLE_STATUSES = (429, 503)
+DECREASE_FACTOR = 0.5
+INCREASE_FRACTION = 0.05  # of the configured rate, per successful request
+MIN_RATE_FRACTION = 0.05  # never slow below 5% of the configured rate
+
+
+class RateLimitExceeded(FetchError):
+    """Raised when a request would have to wait longer than the allowed maximum for a token"""
+
+
+class TokenBucket:
+    """Token bucket whose refill rate is adjusted additively up / multiplicatively down"""
+
+    def __init__(self, rate, burst):
+        self.base_rate = float(rate)
+        self.rate = float(rate)
+        self.burst = max(1.0, float(burst))
+        self.tokens = self.burst
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0  # from Retry-After
+        self.throttles = 0
+        self.waited_sec = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def acquire(self, max_wait):
+        """Take one token, sleeping until one is available; raises if that would exceed max_wait"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            wait = max(self.blocked_until - now, 0.0)
+            # the token is reserved now (tokens may go negative), so concurrent callers queue up
+            wait = max(wait, (1.0 - self.tokens) / self.rate if self.tokens < 1.0 else 0.0)
+            if wait > max_wait:
+                raise RateLimitExceeded(f"Rate limited: next slot in {wait:.1f}s")
+            self.tokens -= 1.0
+            self.waited_sec += wait
+        if wait > 0:
+            time.sleep(wait)
+
+    def on_success(self):
+        with self._lock:
+            self.rate = min(self.base_rate, self.rate + self.base_rate * INCREASE_FRACTION)
+
+    def on_throttle(self, retry_after=None):
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.rate = max(self.base_rate * MIN_RATE_FRACTION, self.rate * DECREASE_FACTOR)
+            self.tokens = min(self.tokens, 0.0)
+            if retry_after:
+                self.blocked_until = max(self.blocked_until, now + retry_after)
+            self.throttles += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                'rate': round(self.rate, 3),
+                'base_rate': self.base_rate,
+                'burst': self.burst,
+                'throttles': self.throttles,
+                'waited_sec': round(self.waited_sec, 2)
+            }
+
+
+class RateLimiter:
+    """Token buckets keyed by platform, created on first use from RATE_LIMITS/RATE_LIMIT_BURSTS"""
+
+    def __init__(self, rates=None, bursts=None):
+        self.rates = Config.RATE_LIMITS if rates is None else rates
+        self.bursts = Config.RATE_LIMIT_BURSTS if bursts is None else bursts
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, key):
+        key = key.lower()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                rate = self.rates.get(key, Config.RATE_LIMIT_DEFAULT)
+                bucket = TokenBucket(rate, self.bursts.get(key, max(1.0, rate)))
+                self._buckets[key] = bucket
+            return bucket
+
+    def acquire(self, key, max_wait=None):
+        self.bucket(key).acquire(Config.RATE_LIMIT_MAX_WAIT_SEC if max_wait is None else max_wait)
+
+    def on_success(self, key):
+        self.bucket(key).on_success()
+
+    def on_throttle(self, key, retry_after=None):
+        bucket = self.bucket(key)
+        bucket.on_throttle(retry_after)
+        logger.warning(f"{key}: throttled upstream, rate lowered to {bucket.rate:.2f} req/s")
+
+    def stats(self):
+        with self._lock:
+            buckets = dict(self._buckets)
+        return {key: bucket.stats() for key, bucket in buckets.items()}
+
+
+def retry_after_seconds(response):
+    """Retry-After header in seconds (the HTTP-date form is ignored)"""
+    try:
+        return max(0.0, float(response.headers.get('retry-after', '')))
+    except ValueError:
+        return None
+
+
+def backoff_delay(attempt, base=None, cap=None):
+    """Full-jitter exponential backoff for retry number attempt (0-based)"""
+    base = Config.RATE_LIMIT_BACKOFF_BASE_SEC if base is None else base
+    cap = Config.RATE_LIMIT_BACKOFF_MAX_SEC if cap is None else cap
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter():
+    """Process-wide rate limiter shared by every scraper"""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = RateLimiter()
+        return _limiter
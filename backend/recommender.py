@@ -7,7 +7,7 @@ from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 from models import Product, db
 from config import Config
-from scraper import ScraperManager
+from scraper import get_platform_trust_score
 import logging
 
 logging.basicConfig(level=logging.INFO)
@@ -24,7 +24,6 @@ class ProductRecommender:
             min_df=1,
             max_df=0.95
         )
-        self.scraper_manager = ScraperManager()
         self.product_vectors = None
         self.product_ids = None
         self.is_trained = False
@@ -161,7 +160,7 @@ class ProductRecommender:
         score += Config.RATING_WEIGHT * rating_score
         
         # Platform trust score
-        platform_trust = self.scraper_manager.get_platform_trust_score(product.platform)
+        platform_trust = get_platform_trust_score(product.platform)
         score += Config.PLATFORM_TRUST_WEIGHT * platform_trust
         
         # Review count score (normalized)
@@ -182,37 +181,34 @@ class ProductRecommender:
         return score
     
     def rank_products_realtime(self, query, products_list, filters=None):
-        """Rank products in real-time (works with dict products, not DB models)"""
+        """Rank scraped ProductRecords in real-time (no DB models)
+
+        Scores are written onto the records in place and the list is sorted in
+        place, best first - pass copies if the records are shared.
+        """
         if not products_list:
             return []
         
-        # Prepare text for TF-IDF
-        query_lower = query.lower()
-        
-        # Calculate similarity scores using simple text matching (fast, no training needed)
-        products_with_scores = []
+        query_words = query.lower().split()
+
+        # Price / review normalization bounds, computed once for the whole list
+        prices = [p.price for p in products_list if p.price]
+        min_p, max_p = (min(prices), max(prices)) if prices else (0, 0)
+        max_reviews = max((p.review_count or 0 for p in products_list), default=0)
+
         for p in products_list:
             # Simple similarity: check if query words appear in product name/description
-            name = (p.get('name') or '').lower()
-            desc = (p.get('description') or '').lower()
-            category = (p.get('category') or '').lower()
-            text = f"{name} {desc} {category}"
-            
-            query_words = query_lower.split()
+            text = f"{p.name or ''} {p.description or ''} {p.category or ''}".lower()
             matches = sum(1 for word in query_words if word in text)
             similarity_score = min(1.0, matches / max(1, len(query_words)))
             
             # Calculate recommendation score (price, rating, etc.)
-            price = p.get('price', 0) or 0
-            rating = p.get('rating', 0) or 0
-            review_count = p.get('review_count', 0) or 0
-            platform = p.get('platform', '')
+            price = p.price or 0
+            rating = p.rating or 0
+            review_count = p.review_count or 0
             
             # Price score (lower is better)
-            prices = [pr.get('price', 0) for pr in products_list if pr.get('price')]
             if prices and price:
-                min_p = min(prices)
-                max_p = max(prices)
                 if max_p > min_p:
                     price_score = 1.0 - ((price - min_p) / (max_p - min_p))
                 else:
@@ -224,12 +220,10 @@ class ProductRecommender:
             rating_score = (rating / 5.0) if rating else 0.0
             
             # Platform trust
-            platform_trust = self.scraper_manager.get_platform_trust_score(platform)
+            platform_trust = get_platform_trust_score(p.platform or '')
             
             # Review count score (normalized)
-            review_counts = [rc.get('review_count', 0) for rc in products_list if rc.get('review_count')]
-            if review_counts and review_count:
-                max_reviews = max(review_counts)
+            if review_count:
                 review_score = min(1.0, review_count / max_reviews) if max_reviews > 0 else 0.5
             else:
                 review_score = 0.0
@@ -247,19 +241,13 @@ class ProductRecommender:
             )
             
             # Final score: 70% recommendation (trust+rating+price) + 30% similarity (query match)
-            combined_score = (0.7 * recommendation_score) + (0.3 * similarity_score)
-            
-            products_with_scores.append({
-                **p,
-                'similarity_score': similarity_score,
-                'recommendation_score': recommendation_score,
-                'combined_score': combined_score
-            })
+            p.similarity_score = similarity_score
+            p.recommendation_score = recommendation_score
+            p.combined_score = (0.7 * recommendation_score) + (0.3 * similarity_score)
         
         # Sort by combined score
-        products_with_scores.sort(key=lambda x: x['combined_score'], reverse=True)
-        
-        return products_with_scores
+        products_list.sort(key=lambda x: x.combined_score, reverse=True)
+        return products_list
     
     def rank_products(self, products_with_similarity, min_price=None, max_price=None):
         """Rank products by combining similarity and recommendation scores"""
@@ -0,0 +1,194 @@
+"""
+Demand-driven planning for scheduled scraping
+
+Instead of refreshing a fixed list of trending terms, each cycle ranks
+(query, platform) pairs by how often the query was searched recently
+(SearchEvent volume) times how stale that pair's data is, then spends a fixed
+per-cycle budget - a number of scrape requests and/or an estimated number of
+seconds - on the most valuable pairs. Per-platform cost is learned as an
+exponentially weighted moving average of observed scrape durations.
+
+Queries are grouped by canonical_query (the search cache's form), so
+"iphone 15" and "15 iphone" are one demand; the group's most searched
+spelling is what gets scraped. When each pair was last scraped is stored in
+scraped_queries and re-read on every plan, so staleness survives restarts
+and is shared by all workers.
+Selenium platforms are only planned when ENABLE_SELENIUM is on.
+"""
+import logging
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from models import ScrapedQuery, SearchEvent, db
+from search_cache import canonical_query
+from config import Config
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Used when nobody has searched for anything within the demand window
+DEFAULT_QUERIES = ('laptop', 'smartphone', 'headphones', 'smartwatch')
+
+COST_EWMA_ALPHA = 0.3
+INITIAL_COST_SEC = {'selenium': 8.0, 'api': 1.0}
+MIN_REFRESH_FRACTION = 0.5  # pairs refreshed within half an interval are left alone
+
+
+class ScrapePlanner:
+    """Picks which (platform, query) pairs the scheduled scrape should refresh"""
+
+    def __init__(self, scraper_manager, budget_requests=None, budget_seconds=None):
+        self.scraper_manager = scraper_manager
+        self.budget_requests = Config.SCRAPE_BUDGET_REQUESTS if budget_requests is None else budget_requests
+        self.budget_seconds = Config.SCRAPE_BUDGET_SECONDS if budget_seconds is None else budget_seconds
+        self.interval_sec = Config.SCRAPING_INTERVAL_HOURS * 3600
+        self._lock = threading.Lock()
+        self._last_scraped = {}  # (platform, query) -> epoch seconds (merged with scraped_queries)
+        self._cost = {
+            name: INITIAL_COST_SEC['selenium' if scraper_manager.is_selenium_platform(name) else 'api']
+            for name in scraper_manager.platforms
+        }
+        self._last_plan = []
+
+    def query_demand(self, now=None):
+        """Query -> search count within the demand window, most searched first
+
+        Counts are per canonical query; each is keyed by its most searched spelling
+        (lower-cased, whitespace collapsed), which is what gets scraped.
+        """
+        since = (now or datetime.utcnow()) - timedelta(hours=Config.SCRAPE_DEMAND_WINDOW_HOURS)
+        rows = (db.session.query(SearchEvent.query, db.func.count(SearchEvent.id))
+                .filter(SearchEvent.created_at >= since)
+                .group_by(SearchEvent.query)
+                .all())
+        demand, spellings = {}, {}
+        for query, count in rows:
+            key = canonical_query(query)
+            if not key:
+                continue
+            demand[key] = demand.get(key, 0) + count
+            counts = spellings.setdefault(key, {})
+            spelling = ' '.join(str(query).lower().split())
+            counts[spelling] = counts.get(spelling, 0) + count
+        top = sorted(demand.items(), key=lambda kv: kv[1], reverse=True)[:Config.SCRAPE_PLAN_MAX_QUERIES]
+        return {max(spellings[key], key=spellings[key].get): count for key, count in top}
+
+    def platforms(self):
+        """Platform keys scheduled scraping can use (Selenium ones only with ENABLE_SELENIUM)"""
+        return [name for name in self.scraper_manager.platforms
+                if Config.ENABLE_SELENIUM or not self.scraper_manager.is_selenium_platform(name)]
+
+    def _load_last_scraped(self, queries):
+        """Merge persisted last-scraped times for queries into _last_scraped (newest wins)"""
+        if not queries:
+            return
+        rows = (db.session.query(ScrapedQuery.platform, ScrapedQuery.search_query, ScrapedQuery.last_scraped_at)
+                .filter(ScrapedQuery.search_query.in_({canonical_query(q) for q in queries}))
+                .all())
+        with self._lock:
+            for platform, query, scraped_at in rows:
+                stamp = scraped_at.replace(tzinfo=timezone.utc).timestamp()
+                key = (platform, query)
+                if stamp > self._last_scraped.get(key, 0):
+                    self._last_scraped[key] = stamp
+
+    def _save_last_scraped(self, jobs):
+        """Persist the last-scraped time of each (platform, query) job; needs an app context"""
+        with self._lock:
+            stamps = {}
+            for platform, query in jobs:
+                key = (platform, canonical_query(query))
+                if key in self._last_scraped:
+                    stamps[key] = datetime.fromtimestamp(self._last_scraped[key], timezone.utc).replace(tzinfo=None)
+        if not stamps:
+            return
+        try:
+            existing = {
+                (row.platform, row.search_query): row
+                for row in ScrapedQuery.query.filter(
+                    ScrapedQuery.search_query.in_({query for _, query in stamps})).all()
+            }
+            for (platform, query), scraped_at in stamps.items():
+                row = existing.get((platform, query))
+                if row is None:
+                    db.session.add(ScrapedQuery(platform=platform, search_query=query, last_scraped_at=scraped_at))
+                elif scraped_at > row.last_scraped_at:
+                    row.last_scraped_at = scraped_at
+            db.session.commit()
+        except Exception as e:
+            # e.g. another worker inserted the same pair first; its timestamp is as good as ours
+            db.session.rollback()
+            logger.warning(f"Could not save scrape times: {e}")
+
+    def _staleness(self, platform, query, now):
+        """Age of a pair's data in scrape intervals, capped; never-scraped pairs get the cap"""
+        cap = Config.SCRAPE_STALENESS_CAP
+        last = self._last_scraped.get((platform, canonical_query(query)))
+        if last is None:
+            return cap
+        return min((now - last) / max(self.interval_sec, 1), cap)
+
+    def plan(self):
+        """Ordered (platform, query) jobs for this cycle, within the request/second budget"""
+        demand = self.query_demand()
+        if not demand:
+            demand = {q: 1 for q in DEFAULT_QUERIES}
+        self._load_last_scraped(demand)
+        platforms = self.platforms()
+
+        now = time.time()
+        with self._lock:
+            candidates = []
+            for query, volume in demand.items():
+                for platform in platforms:
+                    staleness = self._staleness(platform, query, now)
+                    if staleness < MIN_REFRESH_FRACTION:
+                        continue
+                    candidates.append((volume * staleness, platform, query))
+            cost = dict(self._cost)
+        candidates.sort(key=lambda c: c[0], reverse=True)
+
+        # Batches run platforms in parallel, so the seconds budget bounds each platform's
+        # estimated wall-clock time: its summed job cost spread over its concurrency.
+        load = {}
+        jobs = []
+        for value, platform, query in candidates:
+            if self.budget_requests and len(jobs) >= self.budget_requests:
+                break
+            job_load = cost[platform] / self.scraper_manager.platform_concurrency[platform]
+            if self.budget_seconds and load.get(platform, 0.0) + job_load > self.budget_seconds:
+                continue
+            load[platform] = load.get(platform, 0.0) + job_load
+            jobs.append((platform, query))
+
+        self._last_plan = [{'platform': p, 'query': q} for p, q in jobs]
+        logger.info(f"Scrape plan: {len(jobs)} of {len(candidates)} candidate pairs across {len(demand)} queries")
+        return jobs
+
+    def record(self, platform, query, seconds, ok=True):
+        """Update staleness and the platform cost estimate after a job (thread-safe)"""
+        with self._lock:
+            # failed pairs count as refreshed too, so a broken platform can't eat every budget
+            self._last_scraped[(platform, canonical_query(query))] = time.time()
+            self._cost[platform] = (1 - COST_EWMA_ALPHA) * self._cost.get(platform, seconds) + COST_EWMA_ALPHA * seconds
+
+    def run_cycle(self, max_results=10):
+        """Plan and scrape one cycle; needs an app context"""
+        jobs = self.plan()
+        if not jobs:
+            return []
+        products = self.scraper_manager.scrape_batch(jobs, max_results=max_results, on_job_done=self.record)
+        self._save_last_scraped(jobs)
+        return products
+
+    def stats(self):
+        with self._lock:
+            return {
+                'budget_requests': self.budget_requests,
+                'budget_seconds': self.budget_seconds,
+                'platforms': self.platforms(),
+                'tracked_pairs': len(self._last_scraped),
+                'cost_estimates_sec': {p: round(c, 2) for p, c in self._cost.items()},
+                'last_plan': list(self._last_plan)
+            }
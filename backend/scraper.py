@@ -1,49 +1,157 @@
 """
 Web scraping module for collecting product data from multiple e-commerce platforms
 """
-import requests
 from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service as ChromeService
-from selenium.webdriver.chrome.options import Options as ChromeOptions
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
 import time
 import re
 import random
-from datetime import datetime
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
+from datetime import datetime, timedelta
 from models import Product, ScrapingLog, PriceHistory, db
 from config import Config
-from fake_useragent import UserAgent
+from fetcher import get_fetch_engine, FetchError, FetchSaturated, FetchTimeout
+from rate_limiter import get_rate_limiter, retry_after_seconds, backoff_delay, RateLimitExceeded, THROTTLE_STATUSES
+from circuit_breaker import CircuitBreaker, NegativeCache
+from fixtures import get_fixture_store, FixtureMissing
+from single_flight import SingleFlight
+from browser_pool import get_browser_pool, BrowserPoolExhausted
+from search_cache import canonical_query
+from catalog import CatalogCache
+from http_cache import get_http_cache
+from selector_engine import Selector, SelectorEngine
+from html_stream import iter_elements, find_first, element_text
+from user_agents import get_user_agents
+from product_record import ProductRecord
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Lazy-load placeholders shown in src until a script swaps in the real image (e.g. Amazon's grey-pixel.gif)
+PLACEHOLDER_IMAGE_RE = re.compile(r'(grey|gray|transparent|blank)[-_]?pixel|/placeholder|/spacer\.gif|/blank\.gif', re.I)
+
 class BaseScraper:
     """Base class for all scrapers"""
     
     def __init__(self):
-        self.session = requests.Session()
-        self.ua = UserAgent()
+        # All scrapers share one pooled, keep-alive fetch engine and one rate limiter
+        self.fetcher = get_fetch_engine()
+        self.rate_limiter = get_rate_limiter()
+        self.ua = get_user_agents()
+        # Connection and Accept-Encoding are left to the engine (pooling, decoders, HTTP/2)
         self.headers = {
             'User-Agent': self.ua.random,
             'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1',
             'Cache-Control': 'max-age=0'
         }
         self.timeout = Config.REQUEST_TIMEOUT
+        # search_products() swallows errors, so upstream failures are noted per thread for the manager
+        self._fetch_state = threading.local()
+
+    def clear_fetch_error(self):
+        self._fetch_state.error = None
+        self._fetch_state.throttled = False
+
+    def last_fetch_error(self):
+        """Last upstream fetch failure on this thread since clear_fetch_error()"""
+        return getattr(self._fetch_state, 'error', None)
+
+    def was_throttled(self):
+        """True if our own rate limiter skipped a request on this thread since clear_fetch_error()"""
+        return getattr(self._fetch_state, 'throttled', False)
+
+    def fetch(self, url, params=None, headers=None, timeout=None, use_cache=False):
+        """Fetch a URL through the shared fetch engine with a rotated User-Agent
+
+        With use_cache, GET responses are served from the persistent HTTP cache
+        using this platform's TTL and stale-while-revalidate window. In fixture
+        replay mode responses come from recorded files instead of the network.
+        """
+        fixtures = get_fixture_store()
+        if fixtures.replaying:
+            try:
+                return fixtures.load(self.platform, url, params)
+            except FixtureMissing as e:
+                self._fetch_state.error = e
+                raise
+        response = self._fetch_cached(url, params, headers, timeout, use_cache)
+        if fixtures.recording:
+            fixtures.save(self.platform, url, params, response)
+        return response
+
+    def _fetch_cached(self, url, params, headers, timeout, use_cache):
+        platform = getattr(self, 'platform', '').lower()
+        ttl = Config.HTTP_CACHE_TTLS.get(platform, 0) if use_cache else 0
+        if ttl <= 0:
+            return self._fetch_live(url, params, headers, timeout)
+
+        cache = get_http_cache()
+        key = cache.make_key('GET', url, params)
+        entry = cache.get(key)
+        if entry is not None:
+            if entry.age < ttl:
+                cache.count('hits')
+                return entry.response
+            if entry.age < ttl + Config.HTTP_CACHE_STALE_SEC.get(platform, 0):
+                cache.count('stale_hits')
+                cache.revalidate(key, lambda: self._fetch_live(url, params, headers, timeout))
+                return entry.response
+        cache.count('misses')
+        response = self._fetch_live(url, params, headers, timeout)
+        if response.status_code == 200:
+            cache.set(key, response)
+        return response
+
+    def _fetch_live(self, url, params=None, headers=None, timeout=None):
+        """Rate-limited fetch; 429/503 and timeouts back the platform off and are retried with jitter"""
+        try:
+            return self._fetch_with_retries(url, params, headers, timeout)
+        except (RateLimitExceeded, FetchSaturated):
+            # our own throttling/queueing, not an upstream failure - but the search didn't really run either
+            self._fetch_state.throttled = True
+            raise
+        except FetchError as e:
+            self._fetch_state.error = e
+            raise
+
+    def _fetch_with_retries(self, url, params, headers, timeout):
+        key = self.platform.lower()
+        retries = Config.RATE_LIMIT_RETRIES
+        for attempt in range(retries + 1):
+            self.rate_limiter.acquire(key)
+            request_headers = dict(self.headers)
+            request_headers['User-Agent'] = self.ua.random
+            if headers:
+                request_headers.update(headers)
+            try:
+                response = self.fetcher.get(url, params=params, headers=request_headers,
+                                            timeout=timeout or self.timeout)
+            except FetchTimeout:
+                self.rate_limiter.on_throttle(key)
+                if attempt == retries:
+                    raise
+                time.sleep(backoff_delay(attempt))
+                continue
+
+            if response.status_code not in THROTTLE_STATUSES:
+                self.rate_limiter.on_success(key)
+                break
+            retry_after = retry_after_seconds(response)
+            self.rate_limiter.on_throttle(key, retry_after)
+            if attempt == retries:
+                break
+            time.sleep(max(retry_after or 0.0, backoff_delay(attempt)))
+
+        response.raise_for_status()
+        return response
     
     def get_soup(self, url):
-        """Get BeautifulSoup object from URL using requests (fallback or API)"""
+        """Get BeautifulSoup object from URL using the fetch engine (fallback or API)"""
         try:
-            self.headers['User-Agent'] = self.ua.random
-            response = self.session.get(url, headers=self.headers, timeout=self.timeout)
-            response.raise_for_status()
+            response = self.fetch(url)
             return BeautifulSoup(response.content, 'lxml')
         except Exception as e:
             logger.error(f"Error fetching {url}: {str(e)}")
@@ -87,67 +195,116 @@ class BaseScraper:
         except Exception:
             return 0
 
+    def extract_image_url(self, img):
+        """Image URL of an <img> (bs4 Tag or lxml element), or None
+
+        Lean mode disables images, so lazy-load scripts may never swap the real URL
+        into src: a data: URI or placeholder src falls back to data-src / srcset.
+        """
+        if img is None:
+            return None
+        for attr in ('src', 'data-src', 'data-lazy-src', 'srcset', 'data-srcset'):
+            value = (img.get(attr) or '').strip()
+            if attr.endswith('srcset'):
+                value = value.split(',')[0].strip().split(' ')[0]
+            if value and not value.startswith('data:') and not PLACEHOLDER_IMAGE_RE.search(value):
+                return value
+        return None
+
 class SeleniumScraper(BaseScraper):
-    """Base for Selenium-based scraping"""
+    """Base for Selenium-based scraping (browsers come from the shared warm pool)"""
+    # CSS selector matching one search result card; subclasses set this so lean
+    # mode can wait for results instead of sleeping a fixed time
+    ready_selector = None
     
     def __init__(self):
         super().__init__()
-        self.driver = None
-
-    def _setup_driver(self):
-        options = ChromeOptions()
-        options.add_argument("--headless=new") 
-        options.add_argument("--disable-gpu")
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
-        options.add_argument("--window-size=1920,1080")
-        options.add_argument("--start-maximized")
-        options.add_argument(f"user-agent={self.ua.random}")
-        # Mask automation
-        options.add_argument("--disable-blink-features=AutomationControlled")
-        options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        options.add_experimental_option('useAutomationExtension', False)
-        
-        try:
-            self.driver = webdriver.Chrome(service=ChromeService(ChromeDriverManager().install()), options=options)
-            self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-        except Exception as e:
-            logger.error(f"Failed to initialize Chrome driver: {e}")
-            self.driver = None
+        self.browser_pool = get_browser_pool()
 
-    def _teardown_driver(self):
-        if self.driver:
+    def get_page_source_selenium(self, url):
+        fixtures = get_fixture_store()
+        if fixtures.replaying:
             try:
-                self.driver.quit()
-            except:
-                pass
-            self.driver = None
+                return fixtures.load_page(self.platform, url)
+            except FixtureMissing as e:
+                self._fetch_state.error = e
+                logger.error(str(e))
+                return None
 
-    def get_page_source_selenium(self, url):
-        if not self.driver:
-            self._setup_driver()
-        if not self.driver:
-            return None
-        
+        # selenium is imported on first use so API-only workers never load it
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.common.exceptions import TimeoutException
+
+        key = self.platform.lower()
         try:
-            self.driver.get(url)
-            # Wait for body to be present
-            WebDriverWait(self.driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-            
-            # Scroll to trigger lazy loading
-            self.driver.execute_script("window.scrollTo(0, 500);")
-            time.sleep(2)
-            self.driver.execute_script("window.scrollTo(0, 1000);")
-            time.sleep(1)
-            
-            return self.driver.page_source
+            self.rate_limiter.acquire(key)
+            with self.browser_pool.browser() as driver:
+                try:
+                    driver.get(url)
+                except TimeoutException:
+                    self.rate_limiter.on_throttle(key)
+                    raise
+                self.rate_limiter.on_success(key)
+                if self.browser_pool.lean and self.ready_selector:
+                    self._wait_for_results(driver)
+                else:
+                    # Wait for body to be present
+                    WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+
+                    # Scroll to trigger lazy loading
+                    driver.execute_script("window.scrollTo(0, 500);")
+                    time.sleep(2)
+                    driver.execute_script("window.scrollTo(0, 1000);")
+                    time.sleep(1)
+
+                source = driver.page_source
+            if fixtures.recording:
+                fixtures.save_page(self.platform, url, source)
+            return source
+        except (RateLimitExceeded, BrowserPoolExhausted) as e:
+            # our own rate limit or browser-pool contention: the platform was never asked
+            self._fetch_state.throttled = True
+            logger.warning(f"Skipping Selenium page load for {url}: {e}")
+            return None
         except Exception as e:
+            # the pool retires the browser that raised; the next search gets a fresh one
+            self._fetch_state.error = e
             logger.error(f"Error getting page with Selenium {url}: {e}")
-            self._teardown_driver()
             return None
 
+    def _wait_for_results(self, driver):
+        """Wait until result cards are present and their count stops changing"""
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.common.exceptions import TimeoutException
+
+        timeout = Config.SELENIUM_READY_TIMEOUT_SEC
+        deadline = time.monotonic() + timeout
+        try:
+            WebDriverWait(driver, timeout).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, self.ready_selector)))
+        except TimeoutException:
+            # captcha, empty results or a new layout: parse whatever loaded
+            logger.warning(f"{self.platform}: no '{self.ready_selector}' results within {timeout}s")
+            return
+
+        # Scroll once to trigger lazy loading, then require two equal counts in a row
+        driver.execute_script("window.scrollTo(0, 1000);")
+        count_script = "return document.querySelectorAll(arguments[0]).length;"
+        last_count = driver.execute_script(count_script, self.ready_selector)
+        while time.monotonic() < deadline:
+            time.sleep(Config.SELENIUM_STABLE_POLL_SEC)
+            count = driver.execute_script(count_script, self.ready_selector)
+            if count == last_count:
+                return
+            last_count = count
+
 class AmazonScraper(SeleniumScraper):
     """Scraper for Amazon products"""
+    ready_selector = 'div[data-component-type="s-search-result"]'
     
     def __init__(self):
         super().__init__()
@@ -163,79 +320,106 @@ class AmazonScraper(SeleniumScraper):
             if not source:
                 return []
 
-            soup = BeautifulSoup(source, 'lxml')
+            # Stream the page and stop once max_results valid cards have been parsed
+            for item in iter_elements(source, self._is_result):
+                product = self._parse_result(item)
+                if product:
+                    products.append(product)
+                    if len(products) >= max_results:
+                        break
 
-            # Expanded selectors for different layouts
-            items = soup.find_all('div', {'data-component-type': 's-search-result'})
+        except Exception as e:
+            logger.error(f"Error searching Amazon: {str(e)}")
 
-            for item in items[:max_results]:
-                try:
-                    # Title
-                    name_tag = item.find('h2')
-                    if not name_tag:
-                        continue
-                    name = name_tag.get_text(strip=True)
+        return products
 
-                    # Link
-                    link_tag = item.find('a', class_='a-link-normal s-no-outline') or item.find('a', class_='a-link-normal')
-                    if not link_tag:
-                        continue
-                    relative_url = link_tag.get('href')
-                    if not relative_url or relative_url.startswith('javascript'):
-                        continue
+    @staticmethod
+    def _is_result(elem):
+        return elem.tag == 'div' and elem.get('data-component-type') == 's-search-result'
 
-                    if relative_url.startswith('http'):
-                        product_url = relative_url
-                    else:
-                        product_url = "https://www.amazon.in" + relative_url
+    def _parse_result(self, item):
+        """Build a ProductRecord from one s-search-result element (None if incomplete)"""
+        try:
+            # Title
+            name_tag = find_first(item, 'h2')
+            if name_tag is None:
+                return None
+            name = element_text(name_tag, strip=True)
 
-                    # Price
-                    price_tag = item.find('span', class_='a-price-whole')
-                    if not price_tag:
-                        continue
-                    price = self.extract_price(price_tag.get_text())
-                    if not price:
-                        continue
+            # Link
+            link_tag = find_first(item, 'a', ('a-link-normal', 's-no-outline'))
+            if link_tag is None:
+                link_tag = find_first(item, 'a', ('a-link-normal',))
+            if link_tag is None:
+                return None
+            relative_url = link_tag.get('href')
+            if not relative_url or relative_url.startswith('javascript'):
+                return None
 
-                    # Image
-                    img_tag = item.find('img', class_='s-image')
-                    image_url = img_tag.get('src') if img_tag else None
-
-                    # Rating
-                    rating_tag = item.find('span', class_='a-icon-alt')
-                    rating = self.extract_rating(rating_tag.get_text()) if rating_tag else 0.0
-
-                    # Review Count
-                    review_tag = item.find('span', class_='a-size-base s-underline-text')
-                    review_count = self.extract_review_count(review_tag.get_text()) if review_tag else 0
-
-                    products.append({
-                        'name': name,
-                        'description': name,
-                        'price': price,
-                        'original_price': price * 1.2,
-                        'rating': rating,
-                        'review_count': review_count,
-                        'platform': self.platform,
-                        'product_url': product_url,
-                        'image_url': image_url,
-                        'category': 'General',
-                        'availability': 'In Stock'
-                    })
-                except Exception as e:
-                    # skip bad items but continue others
-                    logger.debug(f"Error parsing Amazon item: {e}")
-                    continue
+            if relative_url.startswith('http'):
+                product_url = relative_url
+            else:
+                product_url = "https://www.amazon.in" + relative_url
 
-        except Exception as e:
-            logger.error(f"Error searching Amazon: {str(e)}")
-        finally:
-            self._teardown_driver()
+            # Price
+            price_tag = find_first(item, 'span', ('a-price-whole',))
+            if price_tag is None:
+                return None
+            price = self.extract_price(element_text(price_tag))
+            if not price:
+                return None
 
-        return products
+            # Image
+            img_tag = find_first(item, 'img', ('s-image',))
+            image_url = self.extract_image_url(img_tag)
+
+            # Rating
+            rating_tag = find_first(item, 'span', ('a-icon-alt',))
+            rating = self.extract_rating(element_text(rating_tag)) if rating_tag is not None else 0.0
+
+            # Review Count
+            review_tag = find_first(item, 'span', ('a-size-base', 's-underline-text'))
+            review_count = self.extract_review_count(element_text(review_tag)) if review_tag is not None else 0
+
+            return ProductRecord(
+                name=name,
+                price=price,
+                original_price=price * 1.2,
+                rating=rating,
+                review_count=review_count,
+                platform=self.platform,
+                product_url=product_url,
+                image_url=image_url
+            )
+        except Exception as e:
+            # skip bad items but continue others
+            logger.debug(f"Error parsing Amazon item: {e}")
+            return None
 
 class FlipkartScraper(SeleniumScraper):
     """Scraper for Flipkart products"""
+    ready_selector = 'div[data-id]'
+
+    # BROAD Detectors: Flipkart layouts change constantly, so cards and fields
+    # are matched against fallback lists (earlier entries win)
+    selector_engine = SelectorEngine(
+        candidates=[
+            'div[data-id]',     # Cards by data-id
+            'div._1xHGtK', 'div._4ddWXP',   # Modern grids
+            'div._1AtVbE', 'div.cPHDOP', 'div._2kHMtA',  # Lists
+            'div.slAVV4'        # Clothes/Specific
+        ],
+        fields={
+            'name': ['div._4rR01T', 'a.s1Q9rs', 'a.IRpwTa', 'div.KzDlHZ', 'a.wjcEIp', 'div._3e7Y9f',
+                     'a[title]', 'img[alt]'],
+            'link': [Selector('a', href=re.compile(r'/p/')), 'a._1fQZEK', 'a.VJA3rP', 'a._2rpwqI',
+                     'a[target=_blank]'],
+            'price': ['div._30jeq3', 'div.Nx9bqj', 'div._16969e'],
+            'original_price': ['div._3I9_wc', 'div.yRaY8j'],
+            'image': ['img'],
+            'rating': ['div._3LWZlK', 'div.XQDdHH']
+        }
+    )
     
     def __init__(self):
         super().__init__()
@@ -252,53 +436,21 @@ class FlipkartScraper(SeleniumScraper):
                 return []
                 
             soup = BeautifulSoup(source, 'lxml')
-            
-            # BROAD Detectors: Flipkart layouts change constantly
-            potential_items = []
-            
-            # Cards by data-id
-            potential_items.extend(soup.find_all('div', {'data-id': True}))
-            # Modern grids
-            potential_items.extend(soup.find_all('div', class_='_1xHGtK'))
-            potential_items.extend(soup.find_all('div', class_='_4ddWXP'))
-            # Lists
-            potential_items.extend(soup.find_all('div', class_='_1AtVbE'))
-            potential_items.extend(soup.find_all('div', class_='cPHDOP'))
-            potential_items.extend(soup.find_all('div', class_='_2kHMtA'))
-            # Clothes/Specific
-            potential_items.extend(soup.find_all('div', class_='slAVV4'))
-
-            valid_items = []
-            seen_texts = set()
-            
-            for item in potential_items:
-                # Must have a price or name to be considered a product
-                has_price = (item.find('div', class_='_30jeq3') or 
-                            item.find('div', class_='Nx9bqj') or 
-                            item.find('div', class_='_16969e') or
-                            '₹' in item.get_text())
-                
-                if has_price:
-                    # Use first 80 chars as fingerprint
-                    fingerprint = item.get_text(strip=True)[:80]
-                    if fingerprint and fingerprint not in seen_texts:
-                        valid_items.append(item)
-                        seen_texts.add(fingerprint)
-            
-            logger.info(f"Detected {len(valid_items)} potential items on Flipkart")
 
-            for item in valid_items[:max_results]:
+            # One walk finds every candidate card; stop once max_results priced cards are found
+            matches = self.selector_engine.scan(
+                soup,
+                accept=lambda m: '₹' in m.text or 'price' in m.fields,
+                limit=max_results
+            )
+            logger.info(f"Detected {len(matches)} potential items on Flipkart")
+
+            for match in matches:
                 try:
+                    fields = match.fields
+
                     # NAME: Very aggressive selection
-                    name_tag = (item.find('div', class_='_4rR01T') or 
-                               item.find('a', class_='s1Q9rs') or 
-                               item.find('a', class_='IRpwTa') or 
-                               item.find('div', class_='KzDlHZ') or 
-                               item.find('a', class_='wjcEIp') or
-                               item.find('div', class_='_3e7Y9f') or
-                               item.find('a', title=True) or
-                               item.find('img', alt=True))
-                    
+                    name_tag = fields.get('name')
                     if name_tag:
                         name = name_tag.get('title') or name_tag.get('alt') or name_tag.get_text(strip=True)
                     else:
@@ -307,63 +459,50 @@ class FlipkartScraper(SeleniumScraper):
                     if not name or len(name) < 3: continue
                     
                     # URL: Look for any link that isn't a category or filter
-                    link_tag = (item.find('a', href=re.compile(r'/p/')) or 
-                               item.find('a', class_='_1fQZEK') or 
-                               item.find('a', class_='VJA3rP') or
-                               item.find('a', class_='_2rpwqI') or
-                               item.find('a', {'target': '_blank'}))
-                               
+                    link_tag = fields.get('link')
                     relative_url = link_tag.get('href') if link_tag else None
                     if not relative_url: continue
                     
                     product_url = relative_url if relative_url.startswith('http') else "https://www.flipkart.com" + relative_url
             
                     # PRICE: Multi-layer extraction
-                    price_tag = (item.find('div', class_='_30jeq3') or 
-                                item.find('div', class_='Nx9bqj') or 
-                                item.find('div', class_='_16969e'))
-                    
+                    price_tag = fields.get('price')
                     price_text = price_tag.get_text() if price_tag else ""
                     if not price_text:
                         # Fallback: look for ₹ in the whole item
-                        price_match = re.search(r'₹([\d,]+)', item.get_text())
+                        price_match = re.search(r'₹([\d,]+)', match.text)
                         price_text = price_match.group(0) if price_match else ""
                         
                     price = self.extract_price(price_text)
                     if not price: continue
             
                     # Original Price
-                    orig_tag = item.find('div', class_='_3I9_wc') or item.find('div', class_='yRaY8j')
+                    orig_tag = fields.get('original_price')
                     original_price = self.extract_price(orig_tag.get_text()) if orig_tag else price * 1.2
             
                     # IMAGE
-                    img_tag = item.find('img')
-                    image_url = img_tag.get('src') if img_tag else None
+                    img_tag = fields.get('image')
+                    image_url = self.extract_image_url(img_tag)
 
                     # RATING
-                    rating_tag = item.find('div', class_='_3LWZlK') or item.find('div', class_='XQDdHH')
+                    rating_tag = fields.get('rating')
                     rating = self.extract_rating(rating_tag.get_text()) if rating_tag else 4.0
             
-                    products.append({
-                        'name': name,
-                        'description': name,
-                        'price': price,
-                        'original_price': original_price,
-                        'rating': rating,
-                        'review_count': random.randint(50, 5000),
-                        'platform': self.platform,
-                        'product_url': product_url,
-                        'image_url': image_url,
-                        'category': 'General',
-                        'availability': 'In Stock'
-                    })
+                    products.append(ProductRecord(
+                        name=name,
+                        price=price,
+                        original_price=original_price,
+                        rating=rating,
+                        review_count=random.randint(50, 5000),
+                        platform=self.platform,
+                        product_url=product_url,
+                        image_url=image_url
+                    ))
                 except Exception as e:
                     continue
         except Exception as e:
             logger.error(f"Flipkart scraper crashed: {str(e)}")
-        finally:
-            self._teardown_driver()
-            
+
         return products
 
 class DummyJSONScraper(BaseScraper):
@@ -380,27 +519,25 @@ class DummyJSONScraper(BaseScraper):
             elif 'phone' in query.lower(): enriched_query = "smartphone"
             
             url = "https://dummyjson.com/products/search"
-            resp = self.session.get(url, params={'q': enriched_query, 'limit': max_results * 2}, timeout=10) 
-            resp.raise_for_status()
+            resp = self.fetch(url, params={'q': enriched_query, 'limit': max_results * 2}, timeout=10, use_cache=True)
             data = resp.json() or {}
             products = []
             
             for item in (data.get('products') or [])[:max_results]:
                 price_inr = float(item.get('price', 0)) * 83
-                products.append({
-                    'name': item.get('title', 'Product'),
-                    'description': item.get('description', ''),
-                    'price': price_inr,
-                    'original_price': price_inr * 1.2,
-                    'rating': float(item.get('rating') or 4.0),
-                    'review_count': int(item.get('stock', 100)),
-                    'platform': self.platform,
-                    'product_url': f"https://www.meesho.com/search?q={query.replace(' ', '+')}&id={item.get('id')}",
-                    'image_url': item.get('thumbnail') or (item.get('images') or [None])[0],
-                    'category': item.get('category', 'General'),
-                    'brand': item.get('brand', ''),
-                    'availability': 'In Stock'
-                })
+                products.append(ProductRecord(
+                    name=item.get('title', 'Product'),
+                    description=item.get('description', ''),
+                    price=price_inr,
+                    original_price=price_inr * 1.2,
+                    rating=float(item.get('rating') or 4.0),
+                    review_count=int(item.get('stock', 100)),
+                    platform=self.platform,
+                    product_url=f"https://www.meesho.com/search?q={query.replace(' ', '+')}&id={item.get('id')}",
+                    image_url=item.get('thumbnail') or (item.get('images') or [None])[0],
+                    category=item.get('category', 'General'),
+                    brand=item.get('brand', '')
+                ))
             return products
         except Exception as e:
             logger.error(f"Meesho API failed: {e}")
@@ -408,80 +545,180 @@ class DummyJSONScraper(BaseScraper):
 
 class FakeStoreScraper(BaseScraper):
     """API-based scraper for Myntra (Simulated)."""
+    CATALOG_URL = "https://fakestoreapi.com/products"
+
     def __init__(self):
         super().__init__()
         self.platform = "Myntra"
+        # The API only offers the full catalog, so keep it locally and search an index
+        self.catalog = CatalogCache('fakestore', self.CATALOG_URL, fetch=self.fetch)
 
     def search_products(self, query, max_results=15):
         try:
-            url = "https://fakestoreapi.com/products"
-            resp = self.session.get(url, timeout=10)
-            resp.raise_for_status()
-            data = resp.json() or []
-            
-            q = query.lower()
-            filtered = [d for d in data if 
-                       q in d.get('title','').lower() or 
-                       q in d.get('description','').lower() or
-                       q in d.get('category','').lower()]
+            index = self.catalog.get_index()
+            filtered = index.search(query)
             
             # Universal fallback
+            q = query.lower()
             if not filtered:
                 if 'phone' in q or 'watch' in q or 'electronic' in q:
-                    filtered = [d for d in data if d.get('category') == 'electronics']
+                    filtered = index.in_category('electronics')
                 elif 'shoe' in q or 'dress' in q or 'shirt' in q or 'clothing' in q:
-                    filtered = [d for d in data if "clothing" in d.get('category', '')]
+                    filtered = index.in_category('clothing')
                 
             products = []
-            for item in (filtered or data)[:max_results]:
+            for item in (filtered or index.items)[:max_results]:
                 price_inr = float(item.get('price', 0)) * 85
-                products.append({
-                    'name': item.get('title', 'Product'),
-                    'description': item.get('description', ''),
-                    'price': price_inr,
-                    'original_price': price_inr * 1.15,
-                    'rating': float((item.get('rating') or {}).get('rate', 4.0)),
-                    'review_count': int((item.get('rating') or {}).get('count', 50)),
-                    'platform': self.platform,
-                    'product_url': f"https://www.myntra.com/search?q={query.replace(' ', '+')}&id={item.get('id')}",
-                    'image_url': item.get('image'),
-                    'category': item.get('category', 'General'),
-                    'brand': '',
-                    'availability': 'In Stock'
-                })
+                products.append(ProductRecord(
+                    name=item.get('title', 'Product'),
+                    description=item.get('description', ''),
+                    price=price_inr,
+                    original_price=price_inr * 1.15,
+                    rating=float((item.get('rating') or {}).get('rate', 4.0)),
+                    review_count=int((item.get('rating') or {}).get('count', 50)),
+                    platform=self.platform,
+                    product_url=f"https://www.myntra.com/search?q={query.replace(' ', '+')}&id={item.get('id')}",
+                    image_url=item.get('image'),
+                    category=item.get('category', 'General'),
+                    brand=''
+                ))
             return products
         except Exception as e:
             logger.error(f"Myntra API failed: {e}")
             return []
 
+# Product fields refreshed on re-scrape; their hash decides whether a stored row changed
+TRACKED_PRODUCT_FIELDS = ('price', 'original_price', 'rating', 'review_count', 'image_url',
+                          'category', 'brand', 'availability')
+# Columns written for new products (every row needs the same keys for a multi-row insert)
+INSERT_COLUMN_DEFAULTS = {
+    'name': None, 'description': None, 'price': None, 'original_price': None, 'rating': None,
+    'review_count': 0, 'platform': None, 'image_url': None, 'category': None, 'brand': None,
+    'availability': 'In Stock', 'recommendation_score': 0.0
+}
+UPSERT_CHUNK_SIZE = 500  # keeps IN (...) lists under SQLite's bound-parameter limit
+PRICE_CHANGE_EPSILON = 0.005  # smaller differences are float noise, not a price change
+
+
+def _content_hash(values):
+    """Stable hash of tracked product fields (floats rounded so re-computed prices compare equal)"""
+    normalized = tuple(
+        (k, round(float(v), 2) if isinstance(v, (int, float)) and not isinstance(v, bool) else v)
+        for k, v in sorted(values.items())
+    )
+    return hashlib.sha1(repr(normalized).encode('utf-8')).hexdigest()
+
+
+# Platform trust scores - higher = more trusted
+PLATFORM_TRUST_SCORES = {
+    'Amazon': 0.95,    # Most trusted
+    'Flipkart': 0.90,  # Very trusted
+    'Myntra': 0.85,    # Trusted
+    'Meesho': 0.80     # Good
+}
+
+
+def get_platform_trust_score(platform):
+    """Trust score for a platform display name (e.g. 'Amazon'); unknown platforms get 0.5"""
+    return PLATFORM_TRUST_SCORES.get(platform, 0.5)
+
+
 class ScraperManager:
     """Manages multiple scrapers"""
-    
+    # Scrapers are built on first use, so workers that never touch a platform don't pay for it
+    SCRAPER_CLASSES = {
+        'amazon': AmazonScraper,
+        'flipkart': FlipkartScraper,
+        'meesho': DummyJSONScraper,
+        'myntra': FakeStoreScraper
+    }
+
     def __init__(self):
-        self.scrapers = {
-            'amazon': AmazonScraper(),
-            'flipkart': FlipkartScraper(),
-            'meesho': DummyJSONScraper(),
-            'myntra': FakeStoreScraper()
+        self.platforms = tuple(self.SCRAPER_CLASSES)
+        self._scrapers = {}
+        self._scrapers_lock = threading.Lock()
+        # Per-platform job slots for scrape_batch: Selenium platforms share the browser pool
+        self.platform_concurrency = {
+            name: max(1, Config.BROWSER_POOL_SIZE if self.is_selenium_platform(name) else Config.SCRAPE_API_CONCURRENCY)
+            for name in self.platforms
         }
-    
+        self._platform_slots = {name: threading.BoundedSemaphore(n) for name, n in self.platform_concurrency.items()}
+        # Real-time search health: per-platform circuit breakers and a (platform, query) negative cache
+        self.breakers = {
+            name: CircuitBreaker(name, probe=lambda name=name: self._probe_platform(name))
+            for name in self.platforms
+        }
+        self.negative_cache = NegativeCache()
+        # Coalesces concurrent identical real-time searches into one upstream fetch
+        self.single_flight = SingleFlight()
+        self._realtime_executor = None
+        self._realtime_counters = {'submitted': 0, 'in_flight': 0, 'timed_out': 0}
+        self._realtime_lock = threading.Lock()
+
+    def get_scraper(self, platform_name):
+        """Scraper for a platform key (e.g. 'amazon'), constructed on first use; None if unknown"""
+        key = platform_name.lower()
+        scraper = self._scrapers.get(key)
+        if scraper is None and key in self.SCRAPER_CLASSES:
+            with self._scrapers_lock:
+                scraper = self._scrapers.get(key)
+                if scraper is None:
+                    scraper = self._scrapers[key] = self.SCRAPER_CLASSES[key]()
+        return scraper
+
+    def is_selenium_platform(self, platform_name):
+        return issubclass(self.SCRAPER_CLASSES[platform_name.lower()], SeleniumScraper)
+
     def get_platform_trust_score(self, platform):
         """Platform trust scores - higher = more trusted"""
-        scores = {
-            'Amazon': 0.95,    # Most trusted
-            'Flipkart': 0.90,  # Very trusted
-            'Myntra': 0.85,    # Trusted
-            'Meesho': 0.80     # Good
+        return get_platform_trust_score(platform)
+
+    def warm_browser_pool(self):
+        """Pre-launch Selenium browsers so live searches only pay for page loads"""
+        get_browser_pool().warm()
+
+    def get_stats(self):
+        """Runtime statistics for the scraping layer"""
+        return {
+            'browser_pool': get_browser_pool().stats(),
+            'http_cache': get_http_cache().stats(),
+            'rate_limits': get_rate_limiter().stats(),
+            'circuits': {name: breaker.stats() for name, breaker in self.breakers.items()},
+            'negative_cache': self.negative_cache.stats(),
+            'single_flight': self.single_flight.stats(),
+            'realtime': {'max_workers': Config.REALTIME_MAX_WORKERS, **self._realtime_stats()}
         }
-        return scores.get(platform, 0.5)
+
+    def _realtime_stats(self):
+        with self._realtime_lock:
+            return dict(self._realtime_counters)
+
+    def is_platform_available(self, platform_name):
+        """False while the platform's circuit is open (or half-open with a probe in flight)"""
+        breaker = self.breakers.get(platform_name.lower())
+        return breaker is None or breaker.allow_request()
+
+    def _probe_platform(self, platform_name):
+        """Background health check for a half-open circuit: one small real search"""
+        scraper = self.get_scraper(platform_name)
+        scraper.clear_fetch_error()
+        products = scraper.search_products(Config.CIRCUIT_PROBE_QUERY, 3)
+        # a throttled probe never reached the platform, so it proves nothing
+        healthy = bool(products) or (scraper.last_fetch_error() is None and not scraper.was_throttled())
+        if healthy:
+            # misses recorded during the outage say nothing about the recovered platform
+            self.negative_cache.discard_platform(platform_name)
+        return healthy
     
     def scrape_platform(self, platform_name, query=None, max_results=10):
         """Scrape products from a single platform and store/update them in DB."""
-        scraper = self.scrapers.get(platform_name.lower())
+        scraper = self.get_scraper(platform_name)
         if not scraper:
             logger.warning(f"No scraper found for {platform_name}")
             return []
 
+        # Logs use the display name ('Amazon'), like Product.platform and scrape_batch
+        platform_name = scraper.platform
         start_time = datetime.utcnow()
         log_entry = ScrapingLog(platform=platform_name, status='running', started_at=start_time)
         try:
@@ -492,31 +729,7 @@ class ScraperManager:
 
         try:
             products = scraper.search_products(query, max_results)
-
-            saved_count = 0
-            for p_data in products or []:
-                if not p_data or not p_data.get('product_url'):
-                    continue
-
-                existing = Product.query.filter_by(product_url=p_data['product_url']).first()
-                if existing:
-                    # Update existing product fields
-                    if p_data.get('price') is not None:
-                        existing.price = p_data['price']
-                    existing.original_price = p_data.get('original_price', existing.original_price)
-                    existing.rating = p_data.get('rating', existing.rating)
-                    existing.review_count = p_data.get('review_count', existing.review_count)
-                    existing.image_url = p_data.get('image_url', existing.image_url)
-                    existing.category = p_data.get('category', existing.category)
-                    existing.brand = p_data.get('brand', existing.brand)
-                    existing.availability = p_data.get('availability', existing.availability)
-                    existing.last_updated = datetime.utcnow()
-                else:
-                    new_p = Product(**p_data)
-                    db.session.add(new_p)
-                saved_count += 1
-
-            db.session.commit()
+            saved_count = self._persist_products(products)
 
             log_entry.status = 'success'
             log_entry.products_scraped = saved_count
@@ -527,6 +740,7 @@ class ScraperManager:
             return products
         except Exception as e:
             logger.error(f"Error in ScraperManager for {platform_name}: {e}")
+            db.session.rollback()
             log_entry.status = 'failed'
             log_entry.errors = str(e)
             log_entry.completed_at = datetime.utcnow()
@@ -534,42 +748,356 @@ class ScraperManager:
             db.session.commit()
             return []
     
+    def _persist_products(self, products):
+        """Upsert a scraped batch with one lookup and one statement per write kind.
+
+        Existing rows are resolved with a single IN (...) query; new rows go in as a
+        multi-row insert and changed rows as one bulk update by primary key. Rows
+        whose tracked fields hash the same as what is stored are skipped.
+        A PriceHistory point is written, in the same transaction, for every new
+        product, every price change and every product whose last point is older
+        than PRICE_HISTORY_HEARTBEAT_HOURS.
+        Returns the number of valid products in the batch.
+        """
+        # De-duplicate by URL (last occurrence wins, as with the old per-row updates)
+        batch = {}
+        for p_data in products or []:
+            if p_data and p_data.get('product_url'):
+                batch[p_data['product_url']] = p_data
+        if not batch:
+            return 0
+
+        existing = {}
+        urls = list(batch)
+        tracked_columns = [getattr(Product, f) for f in TRACKED_PRODUCT_FIELDS]
+        for i in range(0, len(urls), UPSERT_CHUNK_SIZE):
+            rows = db.session.execute(
+                db.select(Product.id, Product.product_url, Product.platform, *tracked_columns)
+                .where(Product.product_url.in_(urls[i:i + UPSERT_CHUNK_SIZE]))
+            ).all()
+            existing.update((row.product_url, row) for row in rows)
+
+        now = datetime.utcnow()
+        heartbeat_due = self._price_heartbeat_due([row.id for row in existing.values()], now)
+        inserts, updates, history = [], [], []
+        for url, p_data in batch.items():
+            row = existing.get(url)
+            if row is None:
+                values = {col: p_data.get(col, default) for col, default in INSERT_COLUMN_DEFAULTS.items()}
+                values.update(product_url=url, created_at=now, last_updated=now)
+                inserts.append(values)
+                continue
+
+            merged = {}
+            for field in TRACKED_PRODUCT_FIELDS:
+                value = p_data.get(field, getattr(row, field))
+                if field == 'price' and value is None:
+                    value = row.price
+                merged[field] = value
+
+            if abs(float(merged['price']) - float(row.price)) >= PRICE_CHANGE_EPSILON or row.id in heartbeat_due:
+                history.append({'product_id': row.id, 'platform': row.platform,
+                                'price': merged['price'], 'recorded_at': now})
+            if _content_hash(merged) == _content_hash({f: getattr(row, f) for f in TRACKED_PRODUCT_FIELDS}):
+                continue
+            merged.update(id=row.id, last_updated=now)
+            updates.append(merged)
+
+        connection = db.session.connection()
+        if inserts:
+            history.extend(
+                {'product_id': r.id, 'platform': r.platform, 'price': r.price, 'recorded_at': now}
+                for r in self._insert_products(connection, inserts)
+            )
+        if updates:
+            db.session.execute(db.update(Product), updates)
+        if history:
+            connection.execute(db.insert(PriceHistory), history)
+        db.session.commit()
+
+        logger.info(f"Upserted batch: {len(inserts)} new, {len(updates)} changed, "
+                    f"{len(batch) - len(inserts) - len(updates)} unchanged, {len(history)} price points")
+        return len(batch)
+
+    def _insert_products(self, connection, inserts):
+        """Multi-row insert of new products; returns (id, platform, price) rows for them"""
+        stmt = self._insert_statement()
+        if db.engine.dialect.insert_executemany_returning:
+            return connection.execute(
+                stmt.returning(Product.id, Product.platform, Product.price), inserts
+            ).all()
+        connection.execute(stmt, inserts)
+        urls = [values['product_url'] for values in inserts]
+        rows = []
+        for i in range(0, len(urls), UPSERT_CHUNK_SIZE):
+            rows.extend(connection.execute(
+                db.select(Product.id, Product.platform, Product.price)
+                .where(Product.product_url.in_(urls[i:i + UPSERT_CHUNK_SIZE]))
+            ).all())
+        return rows
+
+    def _price_heartbeat_due(self, product_ids, now):
+        """Ids whose latest PriceHistory point is missing or older than the heartbeat interval"""
+        hours = Config.PRICE_HISTORY_HEARTBEAT_HOURS
+        if hours <= 0 or not product_ids:
+            return set()
+        cutoff = now - timedelta(hours=hours)
+        fresh = set()
+        for i in range(0, len(product_ids), UPSERT_CHUNK_SIZE):
+            rows = db.session.execute(
+                db.select(PriceHistory.product_id)
+                .where(PriceHistory.product_id.in_(product_ids[i:i + UPSERT_CHUNK_SIZE]))
+                .group_by(PriceHistory.product_id)
+                .having(db.func.max(PriceHistory.recorded_at) >= cutoff)
+            ).all()
+            fresh.update(r.product_id for r in rows)
+        return set(product_ids) - fresh
+
+    def _insert_statement(self):
+        """Multi-row product insert; on SQLite/PostgreSQL a concurrent insert of the same URL becomes an update"""
+        dialect = db.engine.dialect.name
+        if dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        elif dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        else:
+            return db.insert(Product)
+        stmt = dialect_insert(Product)
+        return stmt.on_conflict_do_update(
+            index_elements=[Product.product_url],
+            set_={f: stmt.excluded[f] for f in TRACKED_PRODUCT_FIELDS + ('last_updated',)}
+        )
+    
     def scrape_all_platforms(self, query=None, max_results_per_platform=10):
-        all_p = []
-        # Run Amazon and Flipkart specifically for real-time
-        # Use concurrent execution or sequential? Sequential is safer for now to avoid resource hogging
-        # We prioritize Amazon/Flipkart
-        platforms = ['amazon', 'flipkart', 'meesho', 'myntra']
-        
-        for p in platforms:
+        """Scrape every platform concurrently and store the results"""
+        return self.scrape_batch([(p, query) for p in self.platforms], max_results_per_platform)
+
+    def scrape_batch(self, jobs, max_results=10, on_job_done=None):
+        """Run (platform, query) jobs concurrently and persist them with one commit per platform.
+
+        Fetching happens on worker threads, bounded per platform (browser pool size
+        for Selenium platforms, SCRAPE_API_CONCURRENCY for API ones), so a batch
+        takes about as long as its slowest platform. All DB work stays on the
+        calling thread, which must have an app context.
+        on_job_done(platform, query, seconds, ok) is called from the worker after each job.
+        """
+        jobs = [(platform.lower(), query) for platform, query in jobs if platform.lower() in self.SCRAPER_CLASSES]
+        if not jobs:
+            return []
+
+        # platform -> {'products', 'errors', 'started_at', 'completed_at'}
+        results = {platform: {'products': [], 'errors': [], 'started_at': None, 'completed_at': None}
+                   for platform, _ in jobs}
+        results_lock = threading.Lock()
+
+        def run(platform, query):
+            with self._platform_slots[platform]:
+                started_at = datetime.utcnow()
+                scraper = self.get_scraper(platform)
+                scraper.clear_fetch_error()
+                try:
+                    products, error = scraper.search_products(query, max_results), None
+                    # search_products() swallows fetch failures and throttling; an empty answer
+                    # after either is a failed job, not a genuine miss
+                    if not products and scraper.last_fetch_error() is not None:
+                        error = f"{query}: {scraper.last_fetch_error()}"
+                    elif not products and scraper.was_throttled():
+                        error = f"{query}: rate limited"
+                except Exception as e:
+                    products, error = [], f"{query}: {e}"
+                    logger.error(f"Batch scrape failed for {platform}/{query}: {e}")
+                completed_at = datetime.utcnow()
+            if on_job_done is not None:
+                on_job_done(platform, query, (completed_at - started_at).total_seconds(), error is None)
+            with results_lock:
+                result = results[platform]
+                result['products'].extend(products or [])
+                if error:
+                    result['errors'].append(error)
+                if result['started_at'] is None or started_at < result['started_at']:
+                    result['started_at'] = started_at
+                if result['completed_at'] is None or completed_at > result['completed_at']:
+                    result['completed_at'] = completed_at
+
+        workers = min(len(jobs), sum(self.platform_concurrency[p] for p in results))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='scrape-batch') as executor:
+            for future in [executor.submit(run, platform, query) for platform, query in jobs]:
+                future.result()
+
+        all_products = []
+        for platform, result in results.items():
+            platform_name = self.get_scraper(platform).platform
+            products = result['products']
+            log_entry = ScrapingLog(platform=platform_name, started_at=result['started_at'],
+                                    completed_at=result['completed_at'],
+                                    duration_seconds=(result['completed_at'] - result['started_at']).total_seconds())
             try:
-                products = self.scrape_platform(p, query, max_results_per_platform)
-                all_p.extend(products)
+                # The log row rides along in the same commit as the product upsert
+                db.session.add(log_entry)
+                log_entry.products_scraped = len({p['product_url'] for p in products if p and p.get('product_url')})
+                log_entry.status = 'failed' if result['errors'] and not products else 'success'
+                log_entry.errors = '; '.join(result['errors']) or None
+                if not self._persist_products(products):
+                    db.session.commit()
+                all_products.extend(products)
             except Exception as e:
-                logger.error(f"Failed to scrape {p}: {e}")
-        
-        return all_p
+                logger.error(f"Error saving batch for {platform_name}: {e}")
+                db.session.rollback()
+                log_entry = ScrapingLog(platform=platform_name, status='failed', errors=str(e),
+                                        started_at=result['started_at'], completed_at=datetime.utcnow())
+                db.session.add(log_entry)
+                db.session.commit()
+
+        logger.info(f"Batch scrape: {len(jobs)} jobs across {len(results)} platforms, {len(all_products)} products")
+        return all_products
 
     def scrape_platform_realtime(self, platform_name, query=None, max_results=15):
-        """Real-time scraping: Fetch products without saving to DB"""
-        scraper = self.scrapers.get(platform_name.lower())
+        """Real-time scraping: Fetch products without saving to DB
+
+        Skips platforms whose circuit is open and (platform, query) pairs that
+        recently errored or came back empty; outcomes feed both. Concurrent
+        calls for the same (platform, canonical query, max_results) share one
+        upstream fetch.
+        """
+        return self._search_realtime(platform_name, query, max_results)[0]
+
+    def _search_realtime(self, platform_name, query, max_results):
+        """scrape_platform_realtime() as (products, status): 'ok', 'empty' or 'error'
+
+        Scrapers swallow fetch errors, so the status is worked out by the thread
+        that ran the search and shared with single-flight waiters along with
+        the products. Skips for an open circuit count as errors.
+        """
+        key = platform_name.lower()
+        scraper = self.get_scraper(key)
         if not scraper:
             logger.warning(f"No scraper found for {platform_name}")
-            return []
-        
+            return [], 'error'
+        if not self.breakers[key].allow_request():
+            logger.info(f"Skipping {platform_name}: circuit open")
+            return [], 'error'
+        normalized = canonical_query(query)
+        cached_status = self.negative_cache.get(key, normalized)
+        if cached_status is not None:
+            return [], cached_status
+
+        products, status = self.single_flight.do(
+            (key, normalized, max_results),
+            lambda: self._scrape_realtime(scraper, key, query, normalized, max_results)
+        )
+        return list(products), status
+
+    def _get_realtime_executor(self):
+        """Long-lived, bounded pool for real-time platform fetches (shared by all requests)"""
+        if self._realtime_executor is None:
+            with self._scrapers_lock:
+                if self._realtime_executor is None:
+                    self._realtime_executor = ThreadPoolExecutor(
+                        max_workers=Config.REALTIME_MAX_WORKERS, thread_name_prefix='realtime-fetch')
+        return self._realtime_executor
+
+    def _timed_realtime(self, platform_name, query, max_results):
+        started = time.monotonic()
+        try:
+            products, status = self._search_realtime(platform_name, query, max_results)
+        except Exception as e:
+            logger.error(f"Error fetching from {platform_name}: {e}")
+            products, status = [], 'error'
+        return products, status, time.monotonic() - started
+
+    def fan_out_realtime(self, platforms, query, max_results, timeout=None, on_complete=None):
+        """Search platforms in parallel, yielding (platform, products, status, elapsed_sec) until the deadline
+
+        status is 'ok', 'empty' (nothing found) or 'error' (fetch failure, throttling,
+        open circuit). Platforms still running when timeout (REALTIME_OVERALL_TIMEOUT_SEC)
+        expires are yielded at once with status 'timed_out' and keep running in the
+        background - the caller never waits past the deadline. on_complete({platform: products}, {platform: status info})
+        is called once every platform has finished, stragglers included.
+        """
+        if not platforms:
+            return
+        started = time.monotonic()
+        timeout = Config.REALTIME_OVERALL_TIMEOUT_SEC if timeout is None else timeout
+        results, statuses = {}, {}
+        remaining = set(platforms)
+        lock = threading.Lock()
+
+        def finish(platform, future):
+            products, status, elapsed = future.result()
+            with lock:
+                results[platform] = products
+                statuses[platform] = {'status': status, 'count': len(products), 'elapsed_ms': round(elapsed * 1000)}
+                remaining.discard(platform)
+                complete = not remaining
+            with self._realtime_lock:
+                self._realtime_counters['in_flight'] -= 1
+            if complete and on_complete is not None:
+                try:
+                    on_complete(dict(results), dict(statuses))
+                except Exception as e:
+                    logger.error(f"Real-time fan-out completion callback failed: {e}")
+
+        executor = self._get_realtime_executor()
+        futures = {}
+        with self._realtime_lock:
+            self._realtime_counters['submitted'] += len(platforms)
+            self._realtime_counters['in_flight'] += len(platforms)
+        for platform in platforms:
+            future = executor.submit(self._timed_realtime, platform, query, max_results)
+            futures[future] = platform
+            future.add_done_callback(lambda f, platform=platform: finish(platform, f))
+
+        try:
+            for future in as_completed(futures, timeout=timeout):
+                platform = futures[future]
+                products, status, elapsed = future.result()
+                logger.info(f"Fetched {len(products)} products from {platform}")
+                yield platform, products, status, elapsed
+        except FuturesTimeoutError:
+            # Deadline reached: report stragglers and return; they finish (and fill caches) in the background
+            for future, platform in futures.items():
+                if not future.done():
+                    with self._realtime_lock:
+                        self._realtime_counters['timed_out'] += 1
+                    logger.warning(f"Platform {platform} timed out after {timeout}s")
+                    yield platform, [], 'timed_out', time.monotonic() - started
+
+    def _scrape_realtime(self, scraper, key, query, normalized, max_results):
+        started = time.monotonic()
+        scraper.clear_fetch_error()
+        throttled = False
         try:
             # Direct API/scraping call - no DB operations
             products = scraper.search_products(query, max_results)
-            # Ensure all products have required fields
-            for p in products:
-                if 'id' not in p:
-                    p['id'] = hash(p.get('product_url', '')) % 1000000  # Temporary ID
-                if 'recommendation_score' not in p:
-                    p['recommendation_score'] = 0.0
-            return products
+            error = None if products else scraper.last_fetch_error()
+        except RateLimitExceeded as e:
+            logger.warning(f"Real-time scraping skipped for {scraper.platform}: {e}")
+            products, error, throttled = [], None, True
         except Exception as e:
-            logger.error(f"Real-time scraping failed for {platform_name}: {e}")
-            return []
+            logger.error(f"Real-time scraping failed for {scraper.platform}: {e}")
+            products, error = [], e
+        throttled = throttled or (not products and scraper.was_throttled())
+
+        # Answers slower than the real-time timeout were already abandoned by the caller
+        if error is not None or time.monotonic() - started > Config.REALTIME_PLATFORM_TIMEOUT_SEC:
+            self.breakers[key].record_failure()
+        elif not throttled:
+            # when we throttled ourselves the platform was never asked, so there is nothing to record
+            self.breakers[key].record_success()
+        if not products:
+            # a throttled search is an error for this request but nothing to remember about the pair
+            status = 'error' if error is not None or throttled else 'empty'
+            if not throttled:
+                self.negative_cache.add(key, normalized, status)
+            return [], status
+
+        # Ensure all products have required fields
+        for p in products:
+            if p.id is None:
+                p.id = hash(p.product_url or '') % 1000000  # Temporary ID
+            if p.recommendation_score is None:
+                p.recommendation_score = 0.0
+        return products, 'ok'
 
 
 
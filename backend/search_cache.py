@@ -0,0 +1,140 @@
+"""
+In-memory cache of live search results
+
+Entries are keyed by the canonical query (case-folded, whitespace collapsed,
+tokens sorted) plus the set of platforms searched, and hold the raw per-platform
+results before filtering and ranking - so "Laptop  Dell", "dell laptop" and any
+price/rating filter combination share one entry. Entries are LRU-bounded and
+have a TTL; inside the stale window they are served immediately while one
+background refresh replaces them.
+"""
+import collections
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from config import Config
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def canonical_query(query):
+    """Case-folded query tokens in sorted order: 'Dell  LAPTOP' -> 'dell laptop'
+
+    The one canonical form of a query: also used for single-flight and negative-cache
+    keys (scraper.py) and for scrape demand and staleness (scrape_planner.py).
+    """
+    return ' '.join(sorted(str(query or '').casefold().split()))
+
+
+class SearchCacheEntry:
+    """Raw per-platform results for one (query, platform set)"""
+    __slots__ = ('results', 'per_platform', 'stored_at')
+
+    def __init__(self, results, per_platform, stored_at=None):
+        self.results = results  # platform -> list of ProductRecord (shared; rank copies)
+        self.per_platform = per_platform  # max results requested per platform when fetched
+        self.stored_at = stored_at or time.time()
+
+    @property
+    def age(self):
+        return time.time() - self.stored_at
+
+    @property
+    def products(self):
+        return [p for products in self.results.values() for p in products]
+
+
+class SearchCache:
+    """LRU + TTL cache with stale-while-revalidate"""
+
+    def __init__(self, max_entries=None, ttl=None, stale=None):
+        self.max_entries = max_entries or Config.SEARCH_CACHE_MAX_ENTRIES
+        self.ttl = Config.SEARCH_CACHE_TTL_SEC if ttl is None else ttl
+        self.stale = Config.SEARCH_CACHE_STALE_SEC if stale is None else stale
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self._refresher = ThreadPoolExecutor(max_workers=2, thread_name_prefix='search-cache-refresh')
+        self._counters = {'hits': 0, 'stale_hits': 0, 'misses': 0, 'refreshes': 0, 'evictions': 0}
+
+    @staticmethod
+    def make_key(query, platforms):
+        return canonical_query(query), frozenset(p.lower() for p in platforms)
+
+    def get(self, key, per_platform=0):
+        """(entry, 'hit' | 'stale') or (None, 'miss'); entries fetched with fewer results per platform don't count
+
+        A hit on an entry fetched with more results per platform is cut down to per_platform.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            status = None
+            if entry is not None and entry.per_platform >= per_platform:
+                age = entry.age
+                if age < self.ttl:
+                    status = 'hit'
+                    self._counters['hits'] += 1
+                elif age < self.ttl + self.stale:
+                    status = 'stale'
+                    self._counters['stale_hits'] += 1
+            if status is None:
+                self._counters['misses'] += 1
+                return None, 'miss'
+            self._entries.move_to_end(key)
+        if per_platform and entry.per_platform > per_platform:
+            entry = SearchCacheEntry({p: products[:per_platform] for p, products in entry.results.items()},
+                                     per_platform, entry.stored_at)
+        return entry, status
+
+    def set(self, key, results, per_platform):
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = SearchCacheEntry(results, per_platform)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters['evictions'] += 1
+
+    def refresh(self, key, fetch):
+        """Run fetch() in the background to re-populate key; one refresh per key at a time"""
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+            self._counters['refreshes'] += 1
+
+        def run():
+            try:
+                fetch()
+            except Exception as e:
+                logger.warning(f"Background search refresh failed for {key[0]!r}: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        self._refresher.submit(run)
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self._counters)
+            counters['entries'] = len(self._entries)
+        lookups = counters['hits'] + counters['stale_hits'] + counters['misses']
+        counters['hit_rate'] = round((counters['hits'] + counters['stale_hits']) / lookups, 4) if lookups else 0.0
+        return counters
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_search_cache():
+    """Process-wide search result cache"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = SearchCache()
+        return _cache
@@ -0,0 +1,133 @@
+"""
+Single-pass selector engine for scraping search result pages
+
+Scrapers used to call soup.find_all/find once per candidate class and once per
+field fallback, re-walking the same subtrees many times. SelectorEngine compiles
+the candidate and field selector lists once, finds candidates in a single walk
+of the document, and resolves every field of a candidate in a single walk of
+its subtree. Each candidate's text is computed once and shared by all checks.
+"""
+import re
+
+from bs4 import Tag
+
+_SELECTOR_RE = re.compile(r'^(?P<tag>[\w-]+)?(?:\.(?P<cls>[\w-]+))?(?:\[(?P<attr>[\w-]+)(?:=(?P<value>[^\]]+))?\])?$')
+
+
+class Selector:
+    """Compiled tag/class/attribute predicate for a BeautifulSoup Tag"""
+    __slots__ = ('tag', 'cls', 'attr', 'value', 'href')
+
+    def __init__(self, tag=None, cls=None, attr=None, value=True, href=None):
+        self.tag = tag
+        self.cls = cls
+        self.attr = attr
+        self.value = value  # True = attribute must be present
+        self.href = href  # compiled regex searched in the href attribute
+
+    @classmethod
+    def parse(cls, text):
+        """Compile 'tag', 'tag.class', 'tag[attr]' or 'tag[attr=value]'"""
+        m = _SELECTOR_RE.match(text.strip())
+        if not m:
+            raise ValueError(f"Unsupported selector: {text!r}")
+        return cls(tag=m.group('tag'), cls=m.group('cls'), attr=m.group('attr'),
+                   value=m.group('value') if m.group('value') is not None else True)
+
+    def matches(self, node):
+        if self.tag and node.name != self.tag:
+            return False
+        attrs = node.attrs
+        if self.cls and self.cls not in (attrs.get('class') or ()):
+            return False
+        if self.attr:
+            actual = attrs.get(self.attr)
+            if actual is None or (self.value is not True and actual != self.value):
+                return False
+        if self.href is not None:
+            href = attrs.get('href')
+            if not href or not self.href.search(href):
+                return False
+        return True
+
+
+def _compile(selector):
+    return selector if isinstance(selector, Selector) else Selector.parse(selector)
+
+
+class Match:
+    """A candidate node with its text computed once and fields resolved lazily"""
+    __slots__ = ('node', 'text', 'fingerprint', '_engine', '_fields')
+
+    def __init__(self, engine, node):
+        self._engine = engine
+        self.node = node
+        raw = list(node.strings)
+        self.text = ''.join(raw)
+        # same value as node.get_text(strip=True), without a second walk
+        self.fingerprint = ''.join(s for s in (r.strip() for r in raw) if s)
+        self._fields = None
+
+    @property
+    def fields(self):
+        if self._fields is None:
+            self._fields = self._engine.extract(self.node)
+        return self._fields
+
+
+class SelectorEngine:
+    """Compiled candidate + field selectors evaluated in single tree walks"""
+
+    def __init__(self, candidates, fields):
+        self.candidates = [_compile(s) for s in candidates]
+        self.fields = {name: [_compile(s) for s in selectors] for name, selectors in fields.items()}
+        # Dispatch table: tag name -> [(field, priority, selector)]; None = any tag
+        self._by_tag = {}
+        for name, selectors in self.fields.items():
+            for priority, selector in enumerate(selectors):
+                self._by_tag.setdefault(selector.tag, []).append((name, priority, selector))
+        self._any_tag = self._by_tag.pop(None, [])
+        for tag in self._by_tag:
+            self._by_tag[tag] += self._any_tag
+
+    def find_candidates(self, root):
+        """Candidate nodes in selector-priority order, then document order"""
+        buckets = [[] for _ in self.candidates]
+        for node in root.descendants:
+            if not isinstance(node, Tag):
+                continue
+            for idx, selector in enumerate(self.candidates):
+                if selector.matches(node):
+                    buckets[idx].append(node)
+                    break
+        return [node for bucket in buckets for node in bucket]
+
+    def extract(self, node):
+        """First match per field (by selector priority) among node's descendants"""
+        found = {}
+        best = {}
+        for child in node.descendants:
+            if not isinstance(child, Tag):
+                continue
+            for name, priority, selector in self._by_tag.get(child.name, self._any_tag):
+                if priority < best.get(name, len(self.fields[name])) and selector.matches(child):
+                    best[name] = priority
+                    found[name] = child
+        return found
+
+    def scan(self, root, accept=None, limit=None):
+        """Accepted candidates as Match records, de-duplicated by their first 80 text chars"""
+        matches = []
+        seen = set()
+        for node in self.find_candidates(root):
+            match = Match(self, node)
+            if accept is not None and not accept(match):
+                continue
+            fingerprint = match.fingerprint[:80]
+            if not fingerprint or fingerprint in seen:
+                continue
+            seen.add(fingerprint)
+            matches.append(match)
+            if limit and len(matches) >= limit:
+                break
+        return matches
@@ -0,0 +1,138 @@
+"""
+Response serialization for the API
+
+Responses are encoded with orjson, which handles datetimes natively (ISO 8601,
+same text as .isoformat()), so rows can be serialized straight from selected
+columns instead of building per-row to_dict() payloads. Clients that send
+`Accept: application/msgpack` get MessagePack instead of JSON (msgpack is in
+requirements.txt; without it they get JSON and a warning is logged once).
+"""
+import json
+import logging
+from datetime import date, datetime
+
+from flask import Response, request
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    msgpack = None
+    MSGPACK_AVAILABLE = False
+
+JSON_MIMETYPE = 'application/json'
+MSGPACK_MIMETYPE = 'application/msgpack'
+
+# Same keys, in the same order, as Product.to_dict()
+PRODUCT_FIELDS = ('id', 'name', 'description', 'price', 'original_price', 'rating', 'review_count',
+                  'platform', 'product_url', 'image_url', 'category', 'brand', 'availability',
+                  'recommendation_score', 'last_updated', 'created_at')
+# Same keys as ScrapingLog.to_dict() / WishlistItem.to_dict() (minus the nested product)
+SCRAPING_LOG_FIELDS = ('id', 'platform', 'status', 'products_scraped', 'errors', 'started_at',
+                       'completed_at', 'duration_seconds')
+WISHLIST_ITEM_FIELDS = ('id', 'user_id', 'product_id', 'created_at')
+
+if ORJSON_AVAILABLE:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _default(value):
+    """Fallback encoder for types the encoders don't know natively"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    if hasattr(value, 'item'):  # numpy scalars
+        return value.item()
+    if hasattr(value, 'to_dict'):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not serializable")
+
+
+def dumps_json(data):
+    """Encode data as JSON bytes"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, default=_default, option=_ORJSON_OPTIONS)
+    return json.dumps(data, default=_default, separators=(',', ':')).encode('utf-8')
+
+
+def dumps_msgpack(data):
+    return msgpack.packb(data, default=_default, use_bin_type=True)
+
+
+_msgpack_warned = False
+
+
+def wants_msgpack():
+    """True if the request prefers MessagePack over JSON (and msgpack is installed)"""
+    global _msgpack_warned
+    best = request.accept_mimetypes.best_match([JSON_MIMETYPE, MSGPACK_MIMETYPE])
+    if best != MSGPACK_MIMETYPE:
+        return False
+    if not MSGPACK_AVAILABLE:
+        if not _msgpack_warned:
+            _msgpack_warned = True
+            logger.warning("Client asked for application/msgpack but msgpack is not installed; answering with JSON")
+        return False
+    return True
+
+
+def api_response(data, status=200):
+    """JSON (or MessagePack, if the client asked for it) response for data"""
+    if wants_msgpack():
+        response = Response(dumps_msgpack(data), status=status, mimetype=MSGPACK_MIMETYPE)
+    else:
+        response = Response(dumps_json(data), status=status, mimetype=JSON_MIMETYPE)
+    response.vary.add('Accept')
+    return response
+
+
+def parse_fields(value, allowed, always=('id',)):
+    """Sparse fieldset from ?fields=name,price (or a list) -> tuple of fields in allowed order
+
+    No value means every allowed field; fields in always are included regardless.
+    Raises ValueError naming any unknown field.
+    """
+    if not value:
+        return tuple(allowed)
+    if isinstance(value, str):
+        value = [value]
+    requested = {f.strip() for item in value for f in str(item).split(',') if f.strip()}
+    unknown = requested - set(allowed)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    return tuple(f for f in allowed if f in requested or f in always)
+
+
+def columns(model, fields):
+    """Column attributes of model for fields, for select()/with_entities()"""
+    return [getattr(model, f) for f in fields]
+
+
+def rows_to_dicts(rows, fields):
+    """Column rows -> dicts keyed by fields (rows are in the same column order)"""
+    return [dict(zip(fields, row)) for row in rows]
+
+
+def rows_with_product(rows, fields, product_fields=PRODUCT_FIELDS):
+    """Rows of (fields..., product columns...) from an outer join -> dicts with a nested 'product'
+
+    product_fields must start with 'id'; a NULL id (no matching product) gives 'product': None.
+    """
+    n = len(fields)
+    items = []
+    for row in rows:
+        item = dict(zip(fields, row[:n]))
+        item['product'] = dict(zip(product_fields, row[n:])) if row[n] is not None else None
+        items.append(item)
+    return items
@@ -0,0 +1,71 @@
+"""
+SQLite performance profile for the application database
+
+The scheduler, the price-drop alert checker and request threads (search and
+click events, redirect tokens) all write to the same SQLite file. With the
+default rollback journal a writer locks readers out while it commits, and a
+busy connection fails after pysqlite's fixed 5s timeout. In WAL mode readers
+keep reading the last committed snapshot while a writer appends to the log,
+so a scheduler batch never stalls an API read; busy_timeout makes competing
+writers queue instead of raising "database is locked".
+
+The pragmas are run on every new DBAPI connection through a SQLAlchemy
+"connect" event. journal_mode=WAL is stored in the database file; the others
+are per connection.
+"""
+import logging
+
+from sqlalchemy import event
+
+from config import Config
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def sqlite_pragmas(config=Config):
+    """(pragma, value) pairs of the configured profile; empty when SQLITE_PROFILE is off
+
+    Settings configured as '' are left at SQLite's default.
+    """
+    if not config.SQLITE_PROFILE:
+        return []
+    pragmas = [
+        ('journal_mode', config.SQLITE_JOURNAL_MODE),
+        ('synchronous', config.SQLITE_SYNCHRONOUS),
+        ('busy_timeout', config.SQLITE_BUSY_TIMEOUT_MS),
+        # Negative cache_size is in KiB rather than pages
+        ('cache_size', -config.SQLITE_CACHE_SIZE_KB if config.SQLITE_CACHE_SIZE_KB else ''),
+        ('mmap_size', config.SQLITE_MMAP_SIZE_MB * 1024 * 1024 if config.SQLITE_MMAP_SIZE_MB else ''),
+    ]
+    return [(name, value) for name, value in pragmas if value != '']
+
+
+def apply_sqlite_profile(engine, pragmas=None):
+    """Run pragmas (default: the configured profile) on every new connection of engine
+
+    No-op for non-SQLite engines; returns True if the listener was installed.
+    Call before the engine hands out its first connection.
+    """
+    if engine.dialect.name != 'sqlite':
+        return False
+    pragmas = sqlite_pragmas() if pragmas is None else pragmas
+    if not pragmas:
+        return False
+
+    @event.listens_for(engine, 'connect')
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas:
+                cursor.execute(f'PRAGMA {name}={value}')
+        finally:
+            cursor.close()
+
+    logger.info(f"SQLite profile: {', '.join(f'{name}={value}' for name, value in pragmas)}")
+    return True
+
+
+def current_pragmas(connection, names=('journal_mode', 'synchronous', 'busy_timeout', 'cache_size', 'mmap_size')):
+    """{pragma: value} as seen by a live SQLAlchemy connection"""
+    return {name: connection.exec_driver_sql(f'PRAGMA {name}').scalar() for name in names}
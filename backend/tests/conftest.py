@@ -0,0 +1,17 @@
+import pytest
+from flask import Flask
+
+from models import db
+
+
+@pytest.fixture
+def app_db():
+    """App context on a fresh in-memory database with the models' tables"""
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        yield db
+        db.session.remove()
+        db.drop_all()
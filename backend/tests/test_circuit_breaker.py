@@ -0,0 +1,185 @@
+"""CircuitBreaker state machine (closed -> open -> half-open -> closed/open) and NegativeCache"""
+import threading
+import time
+
+import pytest
+
+from circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, NegativeCache
+
+RESET = 0.05
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, 'timed out waiting for condition'
+        time.sleep(0.005)
+
+
+class Probe:
+    """Probe whose outcome the test controls; blocks until answered"""
+
+    def __init__(self):
+        self.calls = 0
+        self.outcome = None
+        self.answer = threading.Event()
+
+    def __call__(self):
+        self.calls += 1
+        self.answer.wait(5)
+        if isinstance(self.outcome, Exception):
+            raise self.outcome
+        return self.outcome
+
+    def respond(self, outcome):
+        self.outcome = outcome
+        self.answer.set()
+
+
+def make_breaker(probe, threshold=3, max_reset=RESET * 4):
+    return CircuitBreaker('test', probe, failure_threshold=threshold, reset_timeout=RESET, max_reset_timeout=max_reset)
+
+
+def open_breaker(breaker):
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+    assert breaker.state == OPEN
+
+
+def start_probe(breaker, probe):
+    """Let the cool-down pass and trigger the half-open probe"""
+    time.sleep(breaker.reset_timeout + 0.01)
+    assert breaker.allow_request() is False  # the probe runs in the background, real traffic still waits
+    assert breaker.state == HALF_OPEN
+    wait_for(lambda: probe.calls == 1)
+
+
+def test_opens_after_threshold_consecutive_failures():
+    breaker = make_breaker(Probe())
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CLOSED and breaker.allow_request()
+
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert breaker.allow_request() is False
+    assert breaker.stats()['opened'] == 1
+    assert breaker.stats()['rejected'] == 1
+
+
+def test_success_resets_the_failure_count():
+    breaker = make_breaker(Probe())
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+
+
+def test_open_does_not_probe_before_the_cool_down():
+    probe = Probe()
+    breaker = make_breaker(probe, max_reset=10)
+    breaker.base_reset_timeout = breaker.reset_timeout = 10
+    open_breaker(breaker)
+    assert breaker.allow_request() is False
+    assert breaker.state == OPEN
+    assert probe.calls == 0
+
+
+def test_healthy_probe_closes_the_circuit():
+    probe = Probe()
+    breaker = make_breaker(probe)
+    open_breaker(breaker)
+    start_probe(breaker, probe)
+
+    probe.respond(True)
+    wait_for(lambda: breaker.state == CLOSED)
+    assert breaker.allow_request()
+    assert breaker.failures == 0
+    assert breaker.reset_timeout == RESET
+
+
+def test_failed_probe_reopens_with_a_longer_cool_down():
+    probe = Probe()
+    breaker = make_breaker(probe)
+    open_breaker(breaker)
+    start_probe(breaker, probe)
+
+    probe.respond(False)
+    wait_for(lambda: breaker.state == OPEN)
+    assert breaker.reset_timeout == RESET * 2
+    assert breaker.stats()['opened'] == 2
+
+
+def test_probe_exception_counts_as_unhealthy():
+    probe = Probe()
+    breaker = make_breaker(probe)
+    open_breaker(breaker)
+    start_probe(breaker, probe)
+
+    probe.respond(RuntimeError('still down'))
+    wait_for(lambda: breaker.state == OPEN)
+
+
+def test_cool_down_is_capped():
+    breaker = make_breaker(Probe(), max_reset=RESET * 3)
+    open_breaker(breaker)
+    for _ in range(4):
+        breaker.state = HALF_OPEN
+        breaker.record_failure()
+    assert breaker.reset_timeout == RESET * 3
+
+
+def test_half_open_runs_a_single_probe():
+    probe = Probe()
+    breaker = make_breaker(probe)
+    open_breaker(breaker)
+    start_probe(breaker, probe)
+
+    for _ in range(20):
+        assert breaker.allow_request() is False
+    probe.respond(True)
+    wait_for(lambda: breaker.state == CLOSED)
+    assert probe.calls == 1
+    assert breaker.stats()['probes'] == 1
+
+
+def test_full_cycle_closed_open_half_open_closed():
+    probe = Probe()
+    breaker = make_breaker(probe)
+    states = [breaker.state]
+    open_breaker(breaker)
+    states.append(breaker.state)
+    start_probe(breaker, probe)
+    states.append(breaker.state)
+    probe.respond(True)
+    wait_for(lambda: breaker.state == CLOSED)
+    states.append(breaker.state)
+    assert states == [CLOSED, OPEN, HALF_OPEN, CLOSED]
+
+
+def test_negative_cache_remembers_status_until_ttl():
+    cache = NegativeCache(ttl=0.05)
+    cache.add('amazon', 'laptop')
+    cache.add('amazon', 'phone', 'error')
+    cache.add('meesho', 'laptop', 'error')
+
+    assert cache.get('amazon', 'laptop') == 'empty'
+    assert cache.get('amazon', 'phone') == 'error'
+    assert cache.contains('meesho', 'laptop')
+    assert cache.get('myntra', 'laptop') is None
+
+    cache.discard_platform('amazon')
+    assert cache.get('amazon', 'laptop') is None
+    assert cache.contains('meesho', 'laptop')
+
+    time.sleep(0.06)
+    assert cache.get('meesho', 'laptop') is None
+    assert cache.stats()['entries'] == 0
+
+
+def test_negative_cache_disabled_with_zero_ttl():
+    cache = NegativeCache(ttl=0)
+    cache.add('amazon', 'laptop')
+    assert not cache.contains('amazon', 'laptop')
@@ -0,0 +1,108 @@
+"""Keyset pagination: walking every page returns every row exactly once, in order"""
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from models import Product, ScrapingLog
+from pagination import CursorError, SortKey, keyset_page
+
+SORT_KEYS = [
+    SortKey('recommendation_score', Product.recommendation_score, Product.id, descending=True),
+    SortKey('price', Product.price, Product.id, descending=False),
+    SortKey('rating', Product.rating, Product.id, descending=True),
+]
+PAGE_SIZES = [1, 4, 7, 50, 500]
+
+
+@pytest.fixture
+def products(app_db):
+    rng = random.Random(7)
+    # Few distinct values -> long runs of ties; None -> a NULL tail for score and rating.
+    # A Core insert, since the ORM bulk insert would turn None scores into the column default.
+    app_db.session.execute(Product.__table__.insert(), [
+        {'name': f'p{i}', 'product_url': f'https://example.com/{i}',
+         'platform': rng.choice(['Amazon', 'Meesho']),
+         'price': float(rng.choice([10, 20, 20, 30, 45])),
+         'rating': rng.choice([None, 3.0, 4.0, 4.0, 4.5]),
+         'recommendation_score': rng.choice([None, 0.1, 0.5, 0.5, 0.9])}
+        for i in range(150)
+    ])
+    app_db.session.commit()
+    return app_db
+
+
+def walk(query, sort_key, per_page):
+    """Ids of every page, following next_cursor until the last page"""
+    ids, cursor, pages = [], None, 0
+    while True:
+        rows, cursor = keyset_page(query, sort_key, per_page, cursor)
+        assert len(rows) <= per_page
+        ids += [row.id for row in rows]
+        pages += 1
+        assert pages <= 1000, 'pagination did not terminate'
+        if cursor is None:
+            return ids
+        assert len(rows) == per_page  # only the last page may be short
+
+
+def expected(query, sort_key):
+    return [row.id for row in query.order_by(*sort_key.order_by()).all()]
+
+
+def filtered_queries(sort_key):
+    """The /api/products query shapes: unfiltered, and platform filters with residual ranges"""
+    base = Product.query.with_entities(Product.id, Product.name)
+    ranged = sort_key.residual
+    return {
+        'all': base,
+        'platform': base.filter(Product.platform == 'Meesho'),
+        'platform+price': base.filter(Product.platform == 'Meesho', ranged(Product.price) >= 20,
+                                      ranged(Product.price) <= 30),
+        'platform+rating': base.filter(Product.platform == 'Amazon', ranged(Product.rating) >= 4.0),
+        'empty': base.filter(Product.platform == 'Nowhere'),
+    }
+
+
+@pytest.mark.parametrize('sort_key', SORT_KEYS, ids=lambda k: k.name)
+@pytest.mark.parametrize('per_page', PAGE_SIZES)
+def test_pages_cover_every_row_once_in_order(products, sort_key, per_page):
+    for name, query in filtered_queries(sort_key).items():
+        ids = walk(query, sort_key, per_page)
+        assert len(ids) == len(set(ids)), name
+        assert ids == expected(query, sort_key), name
+
+
+def test_dataset_has_ties_and_nulls(products):
+    # guards the test above against a dataset that stops exercising the edge cases
+    assert Product.query.filter(Product.rating.is_(None)).count() > 10
+    assert Product.query.filter(Product.recommendation_score.is_(None)).count() > 10
+    assert Product.query.filter(Product.price == 20.0).count() > 10
+
+
+def test_datetime_sort_key_with_null_tail(app_db):
+    now = datetime(2026, 1, 1)
+    app_db.session.execute(app_db.insert(ScrapingLog), [
+        {'platform': 'Amazon', 'status': 'success',
+         'started_at': None if i % 6 == 0 else now - timedelta(minutes=i % 9)}
+        for i in range(60)
+    ])
+    app_db.session.commit()
+    sort_key = SortKey('started_at', ScrapingLog.started_at, ScrapingLog.id, descending=True)
+    query = ScrapingLog.query.with_entities(ScrapingLog.id)
+
+    for per_page in (1, 5, 9, 100):
+        ids = walk(query, sort_key, per_page)
+        assert ids == expected(query, sort_key)
+        assert len(ids) == len(set(ids)) == 60
+
+
+def test_cursor_for_another_sort_is_rejected(products):
+    price, rating = SORT_KEYS[1], SORT_KEYS[2]
+    query = Product.query.with_entities(Product.id)
+    _, cursor = keyset_page(query, price, 5)
+
+    with pytest.raises(CursorError):
+        keyset_page(query, rating, 5, cursor)
+    with pytest.raises(CursorError):
+        keyset_page(query, price, 5, 'not-a-cursor')
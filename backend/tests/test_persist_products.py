@@ -0,0 +1,128 @@
+"""ScraperManager._persist_products: batched upsert, price history and heartbeat points"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from config import Config
+from models import PriceHistory, Product
+from product_record import ProductRecord
+from scraper import ScraperManager
+
+
+def record(url, price, **fields):
+    return ProductRecord(name=f'Product {url}', price=price, platform='Meesho',
+                         product_url=f'https://example.com/{url}', **fields)
+
+
+def history(url):
+    product = Product.query.filter_by(product_url=f'https://example.com/{url}').one()
+    return [h.price for h in PriceHistory.query.filter_by(product_id=product.id).order_by(PriceHistory.id)]
+
+
+@pytest.fixture
+def manager(app_db):
+    return ScraperManager()
+
+
+def test_new_products_are_inserted_with_a_price_point(manager):
+    assert manager._persist_products([record('a', 100.0, rating=4.5), record('b', 20.0)]) == 2
+
+    a = Product.query.filter_by(product_url='https://example.com/a').one()
+    assert (a.name, a.price, a.rating, a.platform) == ('Product a', 100.0, 4.5, 'Meesho')
+    assert Product.query.count() == 2
+    assert history('a') == [100.0]
+    assert history('b') == [20.0]
+
+
+def test_duplicate_urls_in_a_batch_keep_the_last_occurrence(manager):
+    assert manager._persist_products([record('a', 100.0), record('a', 90.0), None, {'name': 'no url'}]) == 1
+
+    assert Product.query.count() == 1
+    assert Product.query.one().price == 90.0
+    assert history('a') == [90.0]
+
+
+def test_price_change_updates_the_row_and_appends_history(manager):
+    manager._persist_products([record('a', 100.0, rating=4.0)])
+    manager._persist_products([record('a', 80.0, rating=4.2)])
+
+    a = Product.query.one()
+    assert (a.price, a.rating) == (80.0, 4.2)
+    assert history('a') == [100.0, 80.0]
+
+
+def test_unchanged_rows_are_skipped(manager, app_db):
+    manager._persist_products([record('a', 100.0, rating=4.0)])
+    stamp = datetime.utcnow() - timedelta(hours=1)
+    Product.query.update({'last_updated': stamp})
+    app_db.session.commit()
+
+    # float noise below PRICE_CHANGE_EPSILON is not a change either
+    manager._persist_products([record('a', 100.001, rating=4.0)])
+
+    a = Product.query.one()
+    assert a.last_updated == stamp
+    assert a.price == 100.0
+    assert history('a') == [100.0]
+
+
+def test_non_price_change_updates_without_a_price_point(manager):
+    manager._persist_products([record('a', 100.0, rating=4.0)])
+    manager._persist_products([record('a', 100.0, rating=3.5, image_url='https://example.com/a.jpg')])
+
+    a = Product.query.one()
+    assert (a.rating, a.image_url) == (3.5, 'https://example.com/a.jpg')
+    assert history('a') == [100.0]
+
+
+def test_missing_price_keeps_the_stored_price(manager):
+    manager._persist_products([record('a', 100.0)])
+    manager._persist_products([{'product_url': 'https://example.com/a', 'rating': 3.0}])
+
+    a = Product.query.one()
+    assert (a.price, a.rating) == (100.0, 3.0)
+    assert history('a') == [100.0]
+
+
+def test_heartbeat_point_when_the_last_one_is_old(manager, app_db, monkeypatch):
+    monkeypatch.setattr(Config, 'PRICE_HISTORY_HEARTBEAT_HOURS', 24)
+    manager._persist_products([record('a', 100.0), record('b', 50.0)])
+    # a's only point is two days old, b's is fresh
+    PriceHistory.query.filter(PriceHistory.price == 100.0).update(
+        {'recorded_at': datetime.utcnow() - timedelta(hours=48)})
+    app_db.session.commit()
+
+    manager._persist_products([record('a', 100.0), record('b', 50.0)])
+
+    assert history('a') == [100.0, 100.0]
+    assert history('b') == [50.0]
+
+
+def test_heartbeat_disabled(manager, app_db, monkeypatch):
+    monkeypatch.setattr(Config, 'PRICE_HISTORY_HEARTBEAT_HOURS', 0)
+    manager._persist_products([record('a', 100.0)])
+    PriceHistory.query.update({'recorded_at': datetime.utcnow() - timedelta(days=30)})
+    app_db.session.commit()
+
+    manager._persist_products([record('a', 100.0)])
+
+    assert history('a') == [100.0]
+
+
+def test_insert_without_returning_support(manager, app_db, monkeypatch):
+    monkeypatch.setattr(app_db.engine.dialect, 'insert_executemany_returning', False)
+
+    manager._persist_products([record('a', 100.0), record('b', 20.0)])
+
+    assert history('a') == [100.0]
+    assert history('b') == [20.0]
+
+
+def test_large_batch_spans_chunks(manager, monkeypatch):
+    monkeypatch.setattr('scraper.UPSERT_CHUNK_SIZE', 3)
+    manager._persist_products([record(i, float(i + 1)) for i in range(10)])
+    manager._persist_products([record(i, float(i + 1) if i % 2 else 999.0) for i in range(10)])
+
+    assert Product.query.count() == 10
+    assert PriceHistory.query.count() == 15  # 10 new + 5 price changes
+    assert Product.query.filter_by(price=999.0).count() == 5
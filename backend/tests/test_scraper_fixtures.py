@@ -0,0 +1,102 @@
+"""Parser regression tests: replay the committed Amazon/Flipkart search pages (no network, no browser)"""
+import os
+
+import pytest
+from bs4 import BeautifulSoup
+
+from config import BASE_DIR
+from fixtures import configure_fixtures
+from scraper import ScraperManager
+
+FIXTURE_DIR = os.path.join(BASE_DIR, 'fixtures')
+
+
+@pytest.fixture
+def manager():
+    configure_fixtures('replay', FIXTURE_DIR)
+    yield ScraperManager()
+    configure_fixtures('')
+
+
+def test_amazon_parses_recorded_page(manager):
+    products = manager.get_scraper('amazon').search_products('laptop', 10)
+
+    # the sponsored card without a price is skipped
+    assert [p.name for p in products] == [
+        'HP Laptop 15s, 12th Gen Intel Core i3-1215U, 15.6-inch (39.6 cm), 8GB DDR4, 512GB SSD',
+        'Lenovo IdeaPad Slim 3 Intel Core i5 12th Gen 15.6" FHD Thin & Light Laptop',
+        'ASUS Vivobook 15, Intel Core i3-1315U 13th Gen, 8GB/512GB SSD, Windows 11',
+    ]
+    hp, lenovo, asus = products
+    assert hp.price == 35990.0
+    assert hp.original_price == pytest.approx(35990.0 * 1.2)
+    assert hp.rating == 4.0
+    assert hp.review_count == 2317
+    assert hp.platform == 'Amazon'
+    assert hp.product_url == ('https://www.amazon.in/HP-Laptop-15s-fq5111TU-Micro-Edge/dp/B0C4TX9P3K/'
+                              'ref=sr_1_2?keywords=laptop&qid=1700000000&sr=8-2')
+    assert hp.image_url == 'https://m.media-amazon.com/images/I/71zFEWqRe5L._AC_UY218_.jpg'
+    # absolute links are kept as they are
+    assert lenovo.product_url == 'https://www.amazon.in/Lenovo-IdeaPad-Slim-3-Warranty/dp/B0CV7KHL2J/ref=sr_1_3'
+    assert (lenovo.price, lenovo.rating, lenovo.review_count) == (52490.0, 4.2, 589)
+    # no rating block
+    assert (asus.price, asus.rating, asus.review_count) == (33990.0, 0.0, 0)
+
+
+def test_amazon_stops_at_max_results(manager):
+    assert len(manager.get_scraper('amazon').search_products('laptop', 2)) == 2
+
+
+def test_flipkart_parses_recorded_page(manager):
+    products = manager.get_scraper('flipkart').search_products('laptop', 10)
+
+    assert [p.name for p in products] == [
+        'HP 15s Intel Core i5 12th Gen 1235U - (16 GB/512 GB SSD/Windows 11 Home) fq5330TU Thin and Light Laptop',
+        'Acer Aspire Lite AMD Ryzen 5 Hexa Core 5500U - (16 GB/512 GB SSD/Windows 11 Home) AL15-41 Thin and Light Laptop',
+        'Tukzer Laptop Stand Aluminium Alloy Adjustable',
+    ]
+    hp, acer, stand = products
+    assert (hp.price, hp.original_price, hp.rating) == (54990.0, 68998.0, 4.2)
+    assert hp.platform == 'Flipkart'
+    assert hp.product_url.startswith('https://www.flipkart.com/hp-15s-intel-core-i5-12th-gen-1235u')
+    assert hp.image_url == ('https://rukminim2.flixcart.com/image/312/312/xif0q/computer/h/q/z/'
+                            '-original-imagzhfmhsrzyzgr.jpeg?q=70')
+    # no strike-through price: falls back to price * 1.2
+    assert acer.price == 32990.0
+    assert acer.original_price == pytest.approx(32990.0 * 1.2)
+    # no rating block: default rating
+    assert (stand.price, stand.original_price, stand.rating) == (899.0, 2499.0, 4.0)
+    assert stand.product_url == 'https://www.flipkart.com/tukzer-laptop-stand/p/itm6e8fd4c7b7a52?pid=ACCGHY7ZJBZKQHZT'
+    assert all(50 <= p.review_count <= 5000 for p in products)
+
+
+def test_missing_fixture_is_a_fetch_error(manager):
+    scraper = manager.get_scraper('amazon')
+    scraper.clear_fetch_error()
+    assert scraper.search_products('no such recording', 5) == []
+    assert scraper.last_fetch_error() is not None
+
+
+def test_lean_mode_pages_keep_real_image_urls(manager):
+    # Recorded as lean mode renders them: images are blocked, so lazy cards
+    # still carry a placeholder src and the real URL only in data-src/srcset
+    sony = manager.get_scraper('amazon').search_products('headphones', 10)[1]
+    assert sony.image_url == 'https://m.media-amazon.com/images/I/51aXvjzcukL._AC_UY218_.jpg'
+
+    boult, = manager.get_scraper('flipkart').search_products('headphones', 10)
+    assert boult.image_url == ('https://rukminim2.flixcart.com/image/200/200/xif0q/headphone/q/7/m/'
+                               '-original-imagtbz2vzgrwvhz.jpeg?q=90')
+
+
+@pytest.mark.parametrize('attrs, expected', [
+    ({'src': 'https://cdn.example.com/a.jpg'}, 'https://cdn.example.com/a.jpg'),
+    ({'src': 'https://cdn.example.com/grey-pixel.gif', 'data-src': 'https://cdn.example.com/a.jpg'},
+     'https://cdn.example.com/a.jpg'),
+    ({'src': 'data:image/gif;base64,R0lGOD', 'srcset': 'https://cdn.example.com/a.jpg 1x, https://cdn.example.com/b.jpg 2x'},
+     'https://cdn.example.com/a.jpg'),
+    ({'src': 'data:image/gif;base64,R0lGOD'}, None),
+])
+def test_extract_image_url_skips_placeholders(manager, attrs, expected):
+    img = BeautifulSoup('<img>', 'html.parser').img
+    img.attrs = attrs
+    assert manager.get_scraper('amazon').extract_image_url(img) == expected
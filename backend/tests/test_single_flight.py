@@ -0,0 +1,117 @@
+"""SingleFlight: concurrent callers for a key share one execution and its outcome"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from single_flight import SingleFlight
+
+WAITERS = 8
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, 'timed out waiting for condition'
+        time.sleep(0.005)
+
+
+def run_blocked(flight, key, fn, callers=WAITERS):
+    """Start callers threads on flight.do(key, fn); returns (futures, release) once all are waiting
+
+    fn runs only after release.set(), so every caller joins the leader's flight first.
+    """
+    release = threading.Event()
+
+    def leader_fn():
+        release.wait(5)
+        return fn()
+
+    pool = ThreadPoolExecutor(max_workers=callers)
+    futures = [pool.submit(flight.do, key, leader_fn) for _ in range(callers)]
+    wait_for(lambda: flight.stats()['waiting'] == callers - 1)
+    pool.shutdown(wait=False)
+    return futures, release
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    executions = []
+    result = object()
+
+    futures, release = run_blocked(flight, 'k', lambda: executions.append(1) or result)
+    release.set()
+
+    assert all(f.result(timeout=5) is result for f in futures)
+    assert executions == [1]
+    stats = flight.stats()
+    assert (stats['executions'], stats['coalesced'], stats['max_waiters']) == (1, WAITERS - 1, WAITERS - 1)
+    assert (stats['in_flight'], stats['waiting']) == (0, 0)
+
+
+def test_exception_reaches_every_waiter():
+    flight = SingleFlight()
+    error = RuntimeError('upstream down')
+
+    def fail():
+        raise error
+
+    futures, release = run_blocked(flight, 'k', fail)
+    release.set()
+
+    for future in futures:
+        with pytest.raises(RuntimeError) as excinfo:
+            future.result(timeout=5)
+        assert excinfo.value is error
+    assert flight.stats()['in_flight'] == 0
+
+
+def test_nothing_is_cached_after_the_call():
+    flight = SingleFlight()
+    calls = []
+    assert flight.do('k', lambda: calls.append(1) or len(calls)) == 1
+    assert flight.do('k', lambda: calls.append(1) or len(calls)) == 2
+
+
+def test_a_failed_call_does_not_poison_the_key():
+    flight = SingleFlight()
+    with pytest.raises(ValueError):
+        flight.do('k', lambda: (_ for _ in ()).throw(ValueError('x')))
+    assert flight.do('k', lambda: 'ok') == 'ok'
+
+
+def test_different_keys_run_independently():
+    flight = SingleFlight()
+    futures, release = run_blocked(flight, 'a', lambda: 'a', callers=2)
+    # 'b' is not blocked behind the in-flight 'a'
+    assert flight.do('b', lambda: 'b') == 'b'
+    release.set()
+    assert [f.result(timeout=5) for f in futures] == ['a', 'a']
+
+
+def test_realtime_searches_coalesce_across_query_spellings():
+    from fetcher import FetchError
+    from scraper import ScraperManager
+
+    manager = ScraperManager()
+    scraper = manager.get_scraper('meesho')
+    release, calls = threading.Event(), []
+
+    def search_products(query, max_results):
+        calls.append(query)
+        release.wait(5)
+        scraper._fetch_state.error = FetchError('HTTP 503')
+        return []
+
+    scraper.search_products = search_products
+    queries = ['iphone 15', '15 iphone', 'iPhone  15', 'IPHONE 15']
+    with ThreadPoolExecutor(max_workers=len(queries)) as pool:
+        futures = [pool.submit(manager._search_realtime, 'meesho', q, 10) for q in queries]
+        wait_for(lambda: manager.single_flight.stats()['waiting'] == len(queries) - 1)
+        release.set()
+        outcomes = [f.result(timeout=5) for f in futures]
+
+    assert len(calls) == 1
+    # the leader's fetch error reaches every waiter as the status
+    assert outcomes == [([], 'error')] * len(queries)
@@ -0,0 +1,68 @@
+"""
+Shared, preloaded User-Agent pool
+
+fake_useragent.UserAgent keeps its whole browser dataset (~10 MB) per instance
+and filters it again on every .random call. The scrapers and the browser pool
+only need a rotating desktop UA string, so the dataset is read once per
+process, reduced to a list of strings, and dropped.
+"""
+import logging
+import random
+import threading
+
+from config import Config
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DESKTOP_BROWSERS = ('chrome', 'firefox', 'edge', 'safari', 'opera')
+
+
+def _is_desktop(entry):
+    """Dataset entry filter for both schemas: fake-useragent 2.x ('type', 'Chrome')
+    and 1.x (no 'type' key in some releases, lowercase 'chrome')"""
+    if str(entry.get('browser', '')).lower() not in DESKTOP_BROWSERS:
+        return False
+    if 'type' in entry:
+        return entry['type'] == 'desktop'
+    return 'Mobile' not in entry.get('useragent', '')
+
+
+class UserAgentPool:
+    """List of desktop User-Agent strings with a .random accessor"""
+
+    def __init__(self, agents):
+        self.agents = agents or [Config.USER_AGENT]
+
+    @classmethod
+    def load(cls):
+        try:
+            from fake_useragent import UserAgent
+            data = UserAgent().data_browsers
+            agents = sorted({b['useragent'] for b in data if b.get('useragent') and _is_desktop(b)})
+        except Exception as e:
+            logger.warning(f"Could not load User-Agent dataset, using USER_AGENT only: {e}")
+            return cls([])
+        if not agents:
+            logger.warning(f"No desktop User-Agents in the dataset ({len(data)} entries), using USER_AGENT only")
+        return cls(agents)
+
+    @property
+    def random(self):
+        return random.choice(self.agents)
+
+    def __len__(self):
+        return len(self.agents)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_user_agents():
+    """Process-wide User-Agent pool, loaded on first use"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = UserAgentPool.load()
+        return _pool
@@ -18,6 +18,12 @@ api.interceptors.request.use((config) => {
   return config;
 });
 
+// Fields the product cards/grid actually render (plus category, kept when a card is wishlisted)
+const PRODUCT_CARD_FIELDS = [
+  'id', 'name', 'price', 'original_price', 'rating', 'review_count',
+  'platform', 'product_url', 'image_url', 'category',
+];
+
 export const searchProducts = async (query, filters = {}) => {
   const requestData = {
     query: query,
@@ -30,6 +36,7 @@ export const searchProducts = async (query, filters = {}) => {
     top_n: 50,
     fast_mode: filters.fastMode !== false,
     include_live_scraping: !!filters.includeLiveScraping,
+    fields: PRODUCT_CARD_FIELDS,
   };
 
   // Remove undefined values
@@ -42,7 +49,7 @@ export const searchProducts = async (query, filters = {}) => {
 };
 
 export const getProducts = async (params = {}) => {
-  const response = await api.get('/products', { params });
+  const response = await api.get('/products', { params: { fields: PRODUCT_CARD_FIELDS.join(','), ...params } });
   return response.data;
 };
 
@@ -94,7 +101,7 @@ export const logoutUser = async () => {
 
 // Trending + redirect + wishlist + purchases
 export const getTrendingProducts = async (params = {}) => {
-  const response = await api.get('/trending/products', { params });
+  const response = await api.get('/trending/products', { params: { fields: PRODUCT_CARD_FIELDS.join(','), ...params } });
   return response.data;
 };
 